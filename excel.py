@@ -11,8 +11,10 @@ import os
 sys.path.append(os.path.join(os.path.dirname(__file__), 'src'))
 
 from models.electoral_model import ModeloPredictivoElectoral
-from utils.electoral_utils import verificar_segunda_vuelta, calcular_escanos, simular_segunda_vuelta
-from config.settings import DATOS_HISTORICOS_DEFAULT, ENCUESTAS_2025_DEFAULT
+from utils.electoral_utils import verificar_segunda_vuelta, simular_segunda_vuelta
+from utils.reparto_utils import divisores_metodo
+from utils.segunda_vuelta_utils import TransferenciaVotos
+from config.settings import DATOS_HISTORICOS_DEFAULT, ENCUESTAS_2025_DEFAULT, METODO_REPARTO_DEFAULT
 
 class ExcelElectoralModel:
     def __init__(self):
@@ -26,6 +28,8 @@ class ExcelElectoralModel:
         self.margen_error = 0.03
         self.tendencia_ajuste = "Conservar"
         self.umbral_minimo = 0.03
+        # Solo métodos de divisores: la hoja de escaños los expresa como tabla de cocientes
+        self.metodo_reparto = METODO_REPARTO_DEFAULT
         self.total_senadores = 36
         self.total_diputados = 130
         
@@ -38,7 +42,8 @@ class ExcelElectoralModel:
             self.peso_encuestas, 
             self.margen_error, 
             self.tendencia_ajuste, 
-            self.umbral_minimo
+            self.umbral_minimo,
+            metodo_reparto=self.metodo_reparto
         )
         
         # Ejecutar predicción
@@ -135,6 +140,7 @@ class ExcelElectoralModel:
             ("Margen de error", self.margen_error),
             ("Umbral mínimo para escaños", self.umbral_minimo),
             ("Tendencia de ajuste", self.tendencia_ajuste),
+            ("Método de reparto", self.metodo_reparto),
             ("Total Senadores", self.total_senadores),
             ("Total Diputados", self.total_diputados)
         ]
@@ -271,24 +277,70 @@ class ExcelElectoralModel:
             ws.column_dimensions[col_letter].width = 20
     
     def crear_hoja_escanos(self):
-        """Crea la hoja con la distribución de escaños usando método D'Hondt con columnas auxiliares, para Senadores y Diputados, máximo 20 divisores."""
+        """Crea la hoja con los senadores por departamento del modelo y la distribución de diputados usando el método de divisores configurado (D'Hondt por defecto) con columnas auxiliares."""
         ws = self.ws_escanos
-        self._crear_bloque_dhondt(ws, 'Senadores', self.total_senadores, start_row=1)
+        # Los senadores se reparten por departamento (4 por departamento, sin umbral) sobre los
+        # porcentajes departamentales del modelo, así que se escriben los del modelo
+        self._crear_bloque_senadores(ws, start_row=1)
         # Espacio entre bloques
-        self._crear_bloque_dhondt(ws, 'Diputados', self.total_diputados, start_row=60)
+        self._crear_bloque_dhondt(ws, 'Diputados', self.total_diputados, self._partidos_validos_prediccion(),
+                                  start_row=60)
 
-    def _crear_bloque_dhondt(self, ws, tipo, total_escanos, start_row=1):
-        # Generar tantos cocientes como escaños a repartir
-        max_div = total_escanos
-        ws.cell(row=start_row, column=1, value=f"Distribución de {tipo} (Total: {total_escanos})")
+    def _crear_bloque_senadores(self, ws, start_row=1):
+        """Escribe los senadores por departamento y partido calculados por el modelo."""
+        senadores_por_depto = self.resultados['detalle_escanos']['senadores_por_depto']
+        partidos = sorted(self.resultados['senadores'], key=self.resultados['senadores'].get, reverse=True)
+        
+        ws.cell(row=start_row, column=1,
+                value=f"Distribución de Senadores por Departamento (Total: {self.total_senadores}, "
+                      f"{self.metodo_reparto} por departamento)")
         ws.merge_cells(start_row=start_row, start_column=1, end_row=start_row, end_column=6)
         self.aplicar_estilo_celda(ws.cell(row=start_row, column=1), is_header=True)
         
-        # Ajustar filas para evitar celdas combinadas
         tabla_inicio = start_row + 2
-        coc_row_start = tabla_inicio + 1
-        coc_col_start = 4
+        encabezados = ["Departamento"] + partidos
+        for col, encabezado in enumerate(encabezados, start=1):
+            ws.cell(row=tabla_inicio, column=col, value=encabezado)
+            self.aplicar_estilo_celda(ws.cell(row=tabla_inicio, column=col), is_header=True)
+        
+        for i, (departamento, escanos) in enumerate(senadores_por_depto.items()):
+            row = tabla_inicio + 1 + i
+            ws.cell(row=row, column=1, value=departamento)
+            self.aplicar_estilo_celda(ws.cell(row=row, column=1), is_subheader=True)
+            for col, partido in enumerate(partidos, start=2):
+                ws.cell(row=row, column=col, value=escanos.get(partido, 0))
+                self.aplicar_estilo_celda(ws.cell(row=row, column=col))
+        
+        # Totales por partido: suma de los departamentos
+        fin_tabla = tabla_inicio + len(senadores_por_depto)
+        total_row = fin_tabla + 1
+        ws.cell(row=total_row, column=1, value="Total")
+        self.aplicar_estilo_celda(ws.cell(row=total_row, column=1), is_header=True)
+        for col in range(2, len(partidos) + 2):
+            letra = get_column_letter(col)
+            ws.cell(row=total_row, column=col, value=f"=SUM({letra}{tabla_inicio+1}:{letra}{fin_tabla})")
+            self.aplicar_estilo_celda(ws.cell(row=total_row, column=col), is_header=True)
+        
+        if partidos:
+            chart = BarChart()
+            chart.type = "col"
+            chart.title = "Distribución de Senadores"
+            chart.y_axis.title = "Número de Escaños"
+            chart.x_axis.title = "Partido Político"
+            data = Reference(ws, min_col=2, max_col=len(partidos) + 1, min_row=total_row, max_row=total_row)
+            categories = Reference(ws, min_col=2, max_col=len(partidos) + 1, min_row=tabla_inicio, max_row=tabla_inicio)
+            chart.add_data(data, from_rows=True, titles_from_data=False)
+            chart.set_categories(categories)
+            chart.height = 10
+            chart.width = 20
+            ws.add_chart(chart, f"A{total_row + 3}")
+        
+        ws.cell(row=total_row + 1, column=1,
+                value="* Cada departamento reparte 4 escaños sobre sus propios porcentajes, sin umbral mínimo.")
+        ws.merge_cells(start_row=total_row + 1, start_column=1, end_row=total_row + 1, end_column=6)
 
+    def _partidos_validos_prediccion(self):
+        """Partidos de la hoja de predicción que superan el umbral, con su voto (o referencia) y su fila."""
         # Obtener partidos y votos normalizados de la predicción
         pred_ws = self.ws_prediccion
         partidos = []
@@ -320,6 +372,22 @@ class ExcelElectoralModel:
                         filas_validas.append(i)
                 except:
                     pass
+        return partidos_validos, votos_validos, filas_validas
+
+    def _crear_bloque_dhondt(self, ws, tipo, total_escanos, validos, start_row=1):
+        # Generar tantos cocientes como escaños a repartir, con los divisores del método
+        max_div = total_escanos
+        divisores = [float(d) for d in divisores_metodo(self.metodo_reparto, max_div)]
+        ws.cell(row=start_row, column=1, value=f"Distribución de {tipo} (Total: {total_escanos})")
+        ws.merge_cells(start_row=start_row, start_column=1, end_row=start_row, end_column=6)
+        self.aplicar_estilo_celda(ws.cell(row=start_row, column=1), is_header=True)
+        
+        # Ajustar filas para evitar celdas combinadas
+        tabla_inicio = start_row + 2
+        coc_row_start = tabla_inicio + 1
+        coc_col_start = 4
+
+        partidos_validos, votos_validos, filas_validas = validos
         n = len(partidos_validos)
 
         # Tabla principal: partidos y votos válidos
@@ -348,7 +416,7 @@ class ExcelElectoralModel:
         filas_cocientes_por_partido = [[] for _ in range(n)]
         fila_coc = coc_row_start
         for idx in range(n):
-            for div in range(1, max_div+1):
+            for div in divisores:
                 # Buscar la siguiente fila libre (no combinada)
                 while ws.cell(row=fila_coc, column=coc_col_start).coordinate in ws.merged_cells:
                     fila_coc += 1
@@ -357,7 +425,7 @@ class ExcelElectoralModel:
                 # Si el voto es fórmula, usa fórmula; si es número, pon el valor calculado
                 if isinstance(votos_validos[idx], str) and votos_validos[idx].startswith("'"):
                     voto_ref = votos_validos[idx]
-                    ws.cell(row=fila_coc, column=coc_col_start+1, value=f"=IF({voto_ref}>0, {voto_ref}/{div}, 0)")
+                    ws.cell(row=fila_coc, column=coc_col_start+1, value=f"=IF({voto_ref}>0, {voto_ref}/{div:g}, 0)")
                 else:
                     voto_val = votos_validos[idx]
                     ws.cell(row=fila_coc, column=coc_col_start+1, value=float(voto_val) / div if float(voto_val) > 0 else 0)
@@ -414,6 +482,13 @@ class ExcelElectoralModel:
         ws.merge_cells(start_row=result_row+n+2, start_column=1, end_row=result_row+n+2, end_column=6)
         self.aplicar_estilo_celda(ws.cell(row=result_row+n+2, column=1), is_subheader=True)
     
+    def _finalistas_segunda_vuelta(self):
+        """Candidatos a segunda vuelta del modelo o, si no la hay, los dos primeros de la predicción."""
+        if self.resultados['candidatos_segunda_vuelta']:
+            return list(self.resultados['candidatos_segunda_vuelta'])
+        prediccion = self.resultados['prediccion_votos']
+        return sorted(prediccion, key=prediccion.get, reverse=True)[:2]
+
     def crear_hoja_segunda_vuelta(self):
         """Crea la hoja para simular segunda vuelta electoral simplificada"""
         ws = self.ws_segunda_vuelta
@@ -461,28 +536,67 @@ class ExcelElectoralModel:
             self.aplicar_estilo_celda(ws.cell(row=6, column=col), is_subheader=(col == 1 or col == 3))
             self.aplicar_estilo_celda(ws.cell(row=7, column=col), is_subheader=(col == 1 or col == 3))
         
-        # Simulación de redistribución de votos simplificada
+        # Matriz de transferencia: cada partido eliminado reparte sus votos entre los finalistas
+        # y la abstención; los partidos sin fila en la matriz del modelo usan el reparto
+        # proporcional a los finalistas con la abstención por defecto (editable)
+        fila_matriz = 21
+        fin_matriz = fila_matriz + len(partidos) - 1
+        ws['A18'] = "Matriz de Transferencia de Votos (% de los votantes de cada partido)"
+        ws.merge_cells('A18:E18')
+        self.aplicar_estilo_celda(ws['A18'], is_header=True)
+        ws['A19'] = "Abstención por defecto (%)"
+        ws['B19'] = self.modelo.abstencion_segunda_vuelta * 100
+        self.aplicar_estilo_celda(ws['A19'], is_subheader=True)
+        self.aplicar_estilo_celda(ws['B19'])
+        
+        encabezados = ["Partido", "Votos Primera Vuelta (%)", "Al primer lugar (%)", "Al segundo lugar (%)",
+                       "Abstención (%)"]
+        for col, encabezado in enumerate(encabezados, start=1):
+            ws.cell(row=20, column=col, value=encabezado)
+            self.aplicar_estilo_celda(ws.cell(row=20, column=col), is_header=True)
+        
+        finalistas = self._finalistas_segunda_vuelta()
+        transferencia = self.modelo.transferencia_votos or TransferenciaVotos([], [], np.zeros((0, 0)))
+        matriz, sin_datos = transferencia.matriz(partidos, finalistas)
+        proporcional = "(100-$B$19)*{}/($D$6+$D$7)"
+        for i, partido in enumerate(partidos):
+            row = fila_matriz + i
+            fila_pred = 3 + i
+            if sin_datos[i]:
+                al_primero, al_segundo = proporcional.format("$D$6"), proporcional.format("$D$7")
+            else:
+                al_primero, al_segundo = f"{matriz[i, 0] * 100:g}", f"{matriz[i, 1] * 100:g}"
+            ws.cell(row=row, column=1, value=f"='Predicción 2025'!A{fila_pred}")
+            ws.cell(row=row, column=2, value=f"='Predicción 2025'!{votos_col}{fila_pred}")
+            ws.cell(row=row, column=3, value=f"=IF(A{row}=$B$6, 100, IF(A{row}=$B$7, 0, {al_primero}))")
+            ws.cell(row=row, column=4, value=f"=IF(A{row}=$B$6, 0, IF(A{row}=$B$7, 100, {al_segundo}))")
+            ws.cell(row=row, column=5, value=f"=100-C{row}-D{row}")
+            for col in range(1, 6):
+                self.aplicar_estilo_celda(ws.cell(row=row, column=col))
+        
+        # Redistribución de votos: producto de los votos de primera vuelta por la matriz
         ws['A9'] = "Simulación de Redistribución de Votos"
         ws.merge_cells('A9:D9')
         self.aplicar_estilo_celda(ws['A9'], is_header=True)
         
         ws['A10'] = "Partido"
         ws['B10'] = "Votos Primera Vuelta (%)"
-        ws['C10'] = "Porcentaje redistribución"
+        ws['C10'] = "Votos recibidos (%)"
         ws['D10'] = "Votos Segunda Vuelta (%)"
         for col in range(1, 5):
             self.aplicar_estilo_celda(ws.cell(row=10, column=col), is_header=True)
         
+        votos_matriz = f"B{fila_matriz}:B{fin_matriz}"
         # Primer candidato
         ws['A11'] = '=B6'
         ws['B11'] = '=D6'
-        ws['C11'] = '70%'
-        ws['D11'] = '=B11 + (100-B11-B12)*0.7'
+        ws['C11'] = f'=SUMPRODUCT({votos_matriz}, C{fila_matriz}:C{fin_matriz})/100'
+        ws['D11'] = '=C11/(C11+C12)*100'
         # Segundo candidato
         ws['A12'] = '=B7'
         ws['B12'] = '=D7'
-        ws['C12'] = '30%'
-        ws['D12'] = '=B12 + (100-B11-B12)*0.3'
+        ws['C12'] = f'=SUMPRODUCT({votos_matriz}, D{fila_matriz}:D{fin_matriz})/100'
+        ws['D12'] = '=C12/(C11+C12)*100'
         for row in range(11, 13):
             for col in range(1, 5):
                 self.aplicar_estilo_celda(ws.cell(row=row, column=col))
@@ -495,8 +609,16 @@ class ExcelElectoralModel:
         ws['B15'] = '=IF(D11>D12, A11, A12)'
         ws['C15'] = "Porcentaje:"
         ws['D15'] = '=IF(D11>D12, D11, D12)'
-        for col in range(1, 5):
-            self.aplicar_estilo_celda(ws.cell(row=15, column=col), is_subheader=(col == 1 or col == 3))
+        
+        # Probabilidad de victoria del modelo (Monte Carlo con la incertidumbre de votos y transferencias)
+        distribucion = self.modelo.ejecutar_segunda_vuelta(20000, finalistas=finalistas)
+        ws['A16'] = f"P(victoria) {finalistas[0]}:"
+        ws['B16'] = round(distribucion['prob_victoria'][finalistas[0]], 3)
+        ws['C16'] = f"P(victoria) {finalistas[1]}:"
+        ws['D16'] = round(distribucion['prob_victoria'][finalistas[1]], 3)
+        for row in range(15, 17):
+            for col in range(1, 5):
+                self.aplicar_estilo_celda(ws.cell(row=row, column=col), is_subheader=(col == 1 or col == 3))
         
         # Gráfico de resultados
         chart = BarChart()
@@ -0,0 +1,122 @@
+"""
+Punto de entrada por línea de comandos (sin interfaz gráfica) del Predictor Electoral Bolivia 2025
+"""
+import argparse
+import sys
+import os
+
+# Agregar el directorio src al path para importaciones
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from utils.sweep_utils import generar_grilla_parametros, ejecutar_barrido, escribir_resultados
+from config.settings import (DATOS_HISTORICOS_DEFAULT, ENCUESTAS_2025_DEFAULT,
+                             PESO_HISTORICO_DEFAULT, PESO_ENCUESTAS_DEFAULT,
+                             MARGEN_ERROR_PREDICCION_DEFAULT, TENDENCIA_AJUSTE_DEFAULT,
+                             UMBRAL_MINIMO_DEFAULT, COMPONENTE_HISTORICO_DEFAULT,
+                             OPCIONES_COMPONENTE_HISTORICO, MODELO_RUIDO_DEFAULT,
+                             OPCIONES_MODELO_RUIDO, METODO_REPARTO_DEFAULT, OPCIONES_METODO_REPARTO)
+
+
+def crear_parser() -> argparse.ArgumentParser:
+    """Crea el parser de argumentos de la línea de comandos."""
+    parser = argparse.ArgumentParser(
+        description="Ejecuta el modelo predictivo sobre una grilla de parámetros sin interfaz gráfica."
+    )
+    parser.add_argument('--historicos', help="Archivo CSV/Excel con datos históricos (columna 'Año')")
+    parser.add_argument('--encuestas', help="Archivo CSV/Excel con encuestas (columna 'Encuesta')")
+    parser.add_argument('--peso-historico', type=float, nargs='+', default=[PESO_HISTORICO_DEFAULT])
+    parser.add_argument('--peso-encuestas', type=float, nargs='+', default=[PESO_ENCUESTAS_DEFAULT])
+    parser.add_argument('--margen-error', type=float, nargs='+', default=[MARGEN_ERROR_PREDICCION_DEFAULT])
+    parser.add_argument('--tendencia', nargs='+', default=[TENDENCIA_AJUSTE_DEFAULT],
+                        choices=["Conservar", "Suavizar", "Acentuar"])
+    parser.add_argument('--umbral-minimo', type=float, nargs='+', default=[UMBRAL_MINIMO_DEFAULT])
+    parser.add_argument('--componente-historico', nargs='+', default=[COMPONENTE_HISTORICO_DEFAULT],
+                        choices=OPCIONES_COMPONENTE_HISTORICO,
+                        help="Cómo se resume la serie histórica completa")
+    parser.add_argument('--modelo-ruido', nargs='+', default=[MODELO_RUIDO_DEFAULT],
+                        choices=OPCIONES_MODELO_RUIDO, help="Distribución del margen de error")
+    parser.add_argument('--metodo-reparto', nargs='+', default=[METODO_REPARTO_DEFAULT],
+                        choices=OPCIONES_METODO_REPARTO,
+                        help="Método de reparto de plurinominales y senadores")
+    parser.add_argument('--variacion-regional',
+                        help="Archivo CSV con factores departamento x partido (columna 'Departamento')")
+    parser.add_argument('--transferencia',
+                        help="Archivo CSV con la transferencia de votos a la segunda vuelta (columna 'Partido')")
+    parser.add_argument('--semilla', type=int,
+                        help="Semilla para resultados reproducibles (independientes de --procesos)")
+    parser.add_argument('--procesos', type=int, default=1,
+                        help="Número de procesos para evaluar la grilla (0 = todas las CPUs)")
+    parser.add_argument('--formato', choices=['jsonl', 'csv'], default='jsonl')
+    parser.add_argument('--salida', help="Archivo de salida (por defecto, salida estándar)")
+    return parser
+
+
+def _advertir(mensaje: str) -> None:
+    """Escribe una advertencia de carga (si la hay) en la salida de errores."""
+    if mensaje:
+        print(f"Advertencia: {mensaje}", file=sys.stderr)
+
+
+def main(argv=None) -> int:
+    """Función principal de la línea de comandos."""
+    args = crear_parser().parse_args(argv)
+
+    datos_historicos = DATOS_HISTORICOS_DEFAULT
+    encuestas_2025 = ENCUESTAS_2025_DEFAULT
+    metadatos_encuestas = None
+    if args.historicos or args.encuestas:
+        # pandas solo se importa cuando hay archivos que leer
+        from utils.file_utils import cargar_tabla_historicos, cargar_tabla_encuestas
+        if args.historicos:
+            tabla = cargar_tabla_historicos(args.historicos)
+            _advertir(tabla.reporte.resumen("años"))
+            datos_historicos = tabla.como_dict()
+        if args.encuestas:
+            tabla = cargar_tabla_encuestas(args.encuestas)
+            _advertir(tabla.reporte.resumen("encuestas"))
+            encuestas_2025 = tabla.como_dict()
+            metadatos_encuestas = tabla.metadatos
+
+    variacion_regional = None
+    if args.variacion_regional:
+        from utils.variacion_regional_utils import cargar_variacion_regional
+        try:
+            variacion_regional = cargar_variacion_regional(args.variacion_regional)
+        except ValueError as ve:
+            print(f"Error: {ve}", file=sys.stderr)
+            return 2
+
+    transferencia_votos = None
+    if args.transferencia:
+        from utils.segunda_vuelta_utils import cargar_transferencia_votos
+        try:
+            transferencia_votos = cargar_transferencia_votos(args.transferencia)
+        except ValueError as ve:
+            print(f"Error: {ve}", file=sys.stderr)
+            return 2
+
+    grilla = generar_grilla_parametros(args.peso_historico, args.peso_encuestas, args.margen_error,
+                                       args.tendencia, args.umbral_minimo, args.componente_historico,
+                                       args.modelo_ruido, args.metodo_reparto)
+    if not grilla:
+        print("Error: ninguna combinación de parámetros es válida.", file=sys.stderr)
+        return 2
+
+    filas, errores = ejecutar_barrido(datos_historicos, encuestas_2025, grilla,
+                                      num_procesos=args.procesos or None, semilla=args.semilla,
+                                      metadatos_encuestas=metadatos_encuestas,
+                                      variacion_regional=variacion_regional,
+                                      transferencia_votos=transferencia_votos)
+    for escenario, mensaje in errores:
+        print(f"Error en el escenario {escenario} ({grilla[escenario]}): {mensaje}", file=sys.stderr)
+
+    if args.salida:
+        with open(args.salida, 'w', encoding='utf-8', newline='') as salida:
+            escribir_resultados(filas, salida, args.formato)
+    else:
+        escribir_resultados(filas, sys.stdout, args.formato)
+    return 1 if errores else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
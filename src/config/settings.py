@@ -41,12 +41,65 @@ assert sum(CIRCUNSCRIPCIONES_UNINOMINALES.values()) == DIPUTADOS_UNINOMINALES, "
 assert len(DEPARTAMENTOS_BOLIVIA) * SENADORES_POR_DEPARTAMENTO == TOTAL_SENADORES, "Los senadores deben ser 36 (4 por departamento)"
 assert DIPUTADOS_UNINOMINALES + DIPUTADOS_PLURINOMINALES == TOTAL_DIPUTADOS, "Los diputados deben sumar 130"
 
+# Circunscripciones uninominales (ver src/data/circunscripciones.csv): las que no tienen
+# porcentajes propios en el archivo usan los de su departamento. Con una dispersión mayor
+# que 0 se les aplica además una desviación sintética del logaritmo de la fuerza local
+# de cada partido, generada con la semilla fija
+DISPERSION_CIRCUNSCRIPCIONES = 0.0
+SEMILLA_CIRCUNSCRIPCIONES = 2020
+
+# Sistema mixto compensatorio: los plurinominales completan la proporcionalidad
+# descontando los escaños uninominales ganados por cada partido
+ASIGNACION_COMPENSATORIA = True
+
+# Método de reparto proporcional de plurinominales y senadores (ver utils.reparto_utils)
+OPCIONES_METODO_REPARTO = ["D'Hondt", "Sainte-Laguë", "Sainte-Laguë modificado", "Hare-Niemeyer"]
+METODO_REPARTO_DEFAULT = "D'Hondt"
+
+# Segunda vuelta (ver utils.segunda_vuelta_utils): fracción de los votantes de un partido
+# eliminado sin fila en la matriz de transferencia que se abstiene (o vota blanco/nulo); el
+# resto se reparte en proporción a la votación de los finalistas. La concentración fija la
+# incertidumbre Dirichlet de cada fila de la matriz en las simulaciones (mayor = menos ruido)
+ABSTENCION_SEGUNDA_VUELTA_DEFAULT = 0.2
+CONCENTRACION_TRANSFERENCIA_DEFAULT = 50.0
+
+# Alias y linaje de partidos entre elecciones: nombre alternativo -> nombre canónico.
+# Las claves se comparan sin distinguir mayúsculas/minúsculas ni espacios repetidos.
+ALIAS_PARTIDOS = {
+    'MAS IPSP': 'MAS',
+    'MAS-IPSP': 'MAS',
+    'CC': 'ALIANZA UNIDAD',
+    'COMUNIDAD CIUDADANA': 'ALIANZA UNIDAD',
+    'UNIDAD': 'ALIANZA UNIDAD',
+    'SÚMATE': 'APB-SÚMATE',
+    'APB SÚMATE': 'APB-SÚMATE',
+}
+
 # Variables del modelo predictivo por defecto
 PESO_HISTORICO_DEFAULT = 0.4
 PESO_ENCUESTAS_DEFAULT = 0.6
 MARGEN_ERROR_PREDICCION_DEFAULT = 0.03
 TENDENCIA_AJUSTE_DEFAULT = "Conservar"
 
+# Componente histórico: cómo se resumen todos los años de datos históricos
+AÑO_ELECCION = 2025
+OPCIONES_COMPONENTE_HISTORICO = ["Último año", "Decaimiento exponencial", "Tendencia lineal"]
+COMPONENTE_HISTORICO_DEFAULT = "Último año"
+VIDA_MEDIA_HISTORICA_DEFAULT = 10.0  # años en que el peso de una elección se reduce a la mitad
+
+# Modelo de ruido de la simulación (ver utils.ruido_utils)
+OPCIONES_MODELO_RUIDO = ["Uniforme", "Dirichlet", "Logístico-normal"]
+MODELO_RUIDO_DEFAULT = "Uniforme"
+
+# Agregación de encuestas: antigüedad (días en que el peso se reduce a la mitad),
+# muestra que recibe peso 1 y contracción del efecto de cada encuestadora
+VIDA_MEDIA_ENCUESTAS_DIAS = 30.0
+MUESTRA_REFERENCIA_ENCUESTAS = 1000
+CONTRACCION_EFECTO_CASA = 2.0
+
+# Predicciones con semilla que la interfaz conserva en caché (sin semilla no se guardan)
+MAX_PREDICCIONES_EN_CACHE = 64
+
 # Configuración de estilos visuales - Temática Boliviana
 from .bolivian_theme import (
     BOLIVIA_RED, BOLIVIA_GREEN, BOLIVIA_YELLOW, BOLIVIA_BG_WARM,
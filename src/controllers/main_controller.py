@@ -6,6 +6,8 @@ from tkinter import messagebox
 from typing import Dict
 
 from models.electoral_model import ModeloPredictivoElectoral
+from models.cache_predicciones import CachePredicciones
+from controllers.prediccion_worker import EjecutorPrediccion
 from views.introduccion_view import IntroduccionView
 from views.datos_view import DatosView
 from views.modelo_view import ModeloView
@@ -15,7 +17,8 @@ from views.detalle_escanos_view import DetalleEscanosView
 from views.partidos_view import PartidosView
 from views.reportes_view import ReportesView
 from config.settings import (WINDOW_TITLE, WINDOW_SIZE, DATOS_HISTORICOS_DEFAULT, 
-                              ENCUESTAS_2025_DEFAULT, TOTAL_SENADORES, TOTAL_DIPUTADOS)
+                              ENCUESTAS_2025_DEFAULT, TOTAL_SENADORES, TOTAL_DIPUTADOS,
+                              MAX_PREDICCIONES_EN_CACHE)
 from config.bolivian_theme import (
     BOLIVIA_RED, BOLIVIA_GREEN, BOLIVIA_YELLOW, BOLIVIA_BG_WARM,
     BOLIVIA_TEXT_DARK, BOLIVIA_DARK_GREEN, BOLIVIA_GOLD,
@@ -42,6 +45,14 @@ class MainController:
         self.modelo.cargar_datos_historicos(DATOS_HISTORICOS_DEFAULT)
         self.modelo.cargar_encuestas(ENCUESTAS_2025_DEFAULT)
         
+        # Ejecutores en segundo plano para la predicción y la segunda vuelta (independientes,
+        # para que simular la segunda vuelta no cancele una predicción en curso)
+        self.ejecutor_prediccion = EjecutorPrediccion(self.root)
+        self.ejecutor_segunda_vuelta = EjecutorPrediccion(self.root)
+        
+        # Caché compartida por los modelos de cada solicitud: repetir un escenario no recalcula
+        self.cache_predicciones = CachePredicciones(MAX_PREDICCIONES_EN_CACHE)
+        
         # Variables de estado
         self.tabview = None
         self.intro_view = None
@@ -140,75 +151,142 @@ class MainController:
     
     def on_datos_actualizados(self):
         """Callback cuando se actualizan los datos."""
+        # Una predicción en curso con los datos anteriores ya no es válida
+        self.ejecutor_prediccion.cancelar()
+        
         # Actualizar modelo con nuevos datos
         self.modelo.cargar_datos_historicos(self.datos_view.datos_historicos)
-        self.modelo.cargar_encuestas(self.datos_view.encuestas_2025)
+        self.modelo.cargar_encuestas(self.datos_view.encuestas_2025, self.datos_view.metadatos_encuestas)
+        self.modelo.cargar_transferencia_votos(self.datos_view.transferencia_votos)
     
     def ejecutar_prediccion(self):
-        """Ejecuta la predicción electoral."""
+        """Ejecuta la predicción electoral en segundo plano."""
+        # Obtener parámetros de la vista
         try:
-            # Obtener parámetros de la vista
             parametros = self.modelo_view.obtener_parametros()
-            
-            # Validar parámetros
-            if (parametros['peso_historico'] + parametros['peso_encuestas']) == 0:
-                messagebox.showerror("Error de Parámetros", 
-                                   "La suma de los pesos de datos históricos y encuestas no puede ser cero.")
-                return
-            
-            # Configurar modelo
-            self.modelo.configurar_parametros(
+        except ValueError as ve:
+            messagebox.showerror("Error de Parámetros", str(ve))
+            return
+        
+        # Validar parámetros
+        if (parametros['peso_historico'] + parametros['peso_encuestas']) == 0:
+            messagebox.showerror("Error de Parámetros", 
+                               "La suma de los pesos de datos históricos y encuestas no puede ser cero.")
+            return
+        
+        datos_historicos = self.modelo.datos_historicos
+        encuestas_2025 = self.modelo.encuestas_2025
+        metadatos_encuestas = self.modelo.metadatos_encuestas
+        transferencia_votos = self.modelo.transferencia_votos
+        abstencion_segunda_vuelta = self.modelo.abstencion_segunda_vuelta
+        cache = self.cache_predicciones
+        
+        def tarea(callback_progreso):
+            # Se usa un modelo independiente para no modificar el que consulta la interfaz
+            modelo = ModeloPredictivoElectoral(cache)
+            modelo.cargar_datos_historicos(datos_historicos)
+            modelo.cargar_encuestas(encuestas_2025, metadatos_encuestas)
+            modelo.cargar_transferencia_votos(transferencia_votos, abstencion_segunda_vuelta)
+            modelo.configurar_parametros(
                 parametros['peso_historico'],
                 parametros['peso_encuestas'],
                 parametros['margen_error'],
                 parametros['tendencia'],
-                parametros['umbral_minimo']
+                parametros['umbral_minimo'],
+                parametros.get('componente_historico'),
+                semilla=parametros.get('semilla'),
+                modelo_ruido=parametros.get('modelo_ruido'),
+                metodo_reparto=parametros.get('metodo_reparto')
             )
-            
-            # Ejecutar predicción
-            self.modelo.ejecutar_prediccion()
-            
-            # Obtener resultados
-            resultados = self.modelo.obtener_resultados()
-            
-            # Actualizar vistas
-            self.actualizar_vistas_con_resultados(resultados)
-            
-            # Cambiar a pestaña de resultados
-            self.tabview.set("Resultados de Predicción")
-            
-            messagebox.showinfo("Predicción Completa", 
-                              "El modelo predictivo ha sido ejecutado exitosamente. ¡Consulte la pestaña de Resultados!")
-            
-        except ValueError as ve:
-            messagebox.showerror("Error de Datos", f"Verifique la exactitud de sus datos: {str(ve)}")
-        except Exception as e:
-            messagebox.showerror("Error en Predicción", f"Ocurrió un error inesperado durante la predicción: {str(e)}")
+            modelo.ejecutar_prediccion(callback_progreso)
+            return modelo
+        
+        # Una nueva solicitud reemplaza (y cancela) a la anterior
+        self.ejecutor_prediccion.enviar(
+            tarea,
+            self._on_prediccion_completa,
+            self._on_prediccion_error,
+            self.modelo_view.mostrar_progreso
+        )
+    
+    def _on_prediccion_completa(self, modelo: ModeloPredictivoElectoral):
+        """Recibe en el hilo de la interfaz el modelo de la última predicción solicitada."""
+        self.modelo = modelo
+        
+        # Obtener resultados
+        resultados = self.modelo.obtener_resultados()
+        
+        # Actualizar vistas
+        self.actualizar_vistas_con_resultados(resultados)
+        
+        # Cambiar a pestaña de resultados
+        self.tabview.set("Resultados de Predicción")
+        
+        messagebox.showinfo("Predicción Completa", 
+                          "El modelo predictivo ha sido ejecutado exitosamente. ¡Consulte la pestaña de Resultados!")
+    
+    def _on_prediccion_error(self, error: Exception):
+        """Muestra el error de la última predicción solicitada."""
+        self.modelo_view.mostrar_progreso(0.0, "")
+        if isinstance(error, ValueError):
+            messagebox.showerror("Error de Datos", f"Verifique la exactitud de sus datos: {str(error)}")
+        else:
+            messagebox.showerror("Error en Predicción", f"Ocurrió un error inesperado durante la predicción: {str(error)}")
     
     def simular_segunda_vuelta(self):
-        """Simula la segunda vuelta electoral."""
-        try:
-            prediccion_segunda_vuelta = self.modelo.simular_segunda_vuelta()
-            
-            if prediccion_segunda_vuelta:
-                # Determinar ganador
-                candidatos = list(prediccion_segunda_vuelta.keys())
-                votos = list(prediccion_segunda_vuelta.values())
-                
-                if votos[0] > votos[1]:
-                    ganador = candidatos[0]
-                else:
-                    ganador = candidatos[1]
-                
-                messagebox.showinfo("Resultado Segunda Vuelta", 
-                                  f"Ganador de la segunda vuelta: {ganador}\n\n"
-                                  f"{candidatos[0]}: {votos[0]:.1f}%\n"
-                                  f"{candidatos[1]}: {votos[1]:.1f}%")
-            else:
-                messagebox.showwarning("Segunda Vuelta", "No se puede simular la segunda vuelta con los datos actuales.")
-                
-        except Exception as e:
-            messagebox.showerror("Error", f"Error al simular segunda vuelta: {str(e)}")
+        """Simula la segunda vuelta electoral en segundo plano."""
+        # La tarea trabaja sobre una copia tomada en el hilo de la interfaz; el resultado
+        # se asigna al modelo original en _on_segunda_vuelta_completa
+        origen = self.modelo
+        modelo = origen.copiar()
+        
+        def tarea(callback_progreso):
+            prediccion_segunda_vuelta = modelo.simular_segunda_vuelta()
+            if not prediccion_segunda_vuelta:
+                return {}, None
+            # Probabilidad de victoria con la incertidumbre de votos y transferencias
+            callback_progreso(0.5, "Simulando segunda vuelta")
+            distribucion = modelo.ejecutar_segunda_vuelta(20000, finalistas=list(prediccion_segunda_vuelta))
+            return prediccion_segunda_vuelta, distribucion
+        
+        self.ejecutor_segunda_vuelta.enviar(tarea, lambda resultado: self._on_segunda_vuelta_completa(origen, resultado),
+                                            self._on_segunda_vuelta_error)
+    
+    def _on_segunda_vuelta_completa(self, origen: ModeloPredictivoElectoral, resultado):
+        """Guarda y muestra en el hilo de la interfaz el resultado de la segunda vuelta."""
+        prediccion_segunda_vuelta, distribucion = resultado
+        if not prediccion_segunda_vuelta:
+            messagebox.showwarning("Segunda Vuelta", "No se puede simular la segunda vuelta con los datos actuales.")
+            return
+        
+        # Si entretanto una nueva predicción reemplazó al modelo, el resultado ya no le corresponde
+        if origen is self.modelo:
+            self.modelo.prediccion_segunda_vuelta = prediccion_segunda_vuelta
+        
+        # Determinar ganador
+        candidatos = list(prediccion_segunda_vuelta.keys())
+        votos = list(prediccion_segunda_vuelta.values())
+        
+        if votos[0] > votos[1]:
+            ganador = candidatos[0]
+        else:
+            ganador = candidatos[1]
+        
+        prob_victoria = distribucion['prob_victoria']
+        bandas = distribucion['percentiles']
+        
+        messagebox.showinfo("Resultado Segunda Vuelta", 
+                          f"Ganador de la segunda vuelta: {ganador}\n\n"
+                          f"{candidatos[0]}: {votos[0]:.1f}% "
+                          f"({bandas[candidatos[0]][5]:.1f}-{bandas[candidatos[0]][95]:.1f}%), "
+                          f"P(victoria) {prob_victoria[candidatos[0]]:.0%}\n"
+                          f"{candidatos[1]}: {votos[1]:.1f}% "
+                          f"({bandas[candidatos[1]][5]:.1f}-{bandas[candidatos[1]][95]:.1f}%), "
+                          f"P(victoria) {prob_victoria[candidatos[1]]:.0%}")
+    
+    def _on_segunda_vuelta_error(self, error: Exception):
+        """Muestra el error de la simulación de segunda vuelta."""
+        messagebox.showerror("Error", f"Error al simular segunda vuelta: {str(error)}")
     
     def actualizar_vistas_con_resultados(self, resultados: Dict):
         """Actualiza las vistas con los resultados de la predicción."""
@@ -236,12 +314,17 @@ class MainController:
             resultados.get('diputados_plurinominales'),
             resultados.get('diputados_uninominales'),
             resultados.get('diputados_uninominales_por_depto'),
-            resultados.get('detalle_escanos')
+            resultados.get('detalle_escanos'),
+            resultados.get('resultado_escanos')
         )
     
     def ejecutar(self):
         """Ejecuta la aplicación."""
-        self.root.mainloop() 
+        try:
+            self.root.mainloop()
+        finally:
+            self.ejecutor_prediccion.cerrar()
+            self.ejecutor_segunda_vuelta.cerrar()
     
     def get_lista_partidos(self):
         # Solo partidos presentes en las encuestas actuales
@@ -256,15 +339,19 @@ class MainController:
     def get_datos_filtrados_por_partido(self, partido):
         # Devuelve los datos relevantes del partido seleccionado
         datos = {}
-        if self.modelo.prediccion_2025 and partido in self.modelo.prediccion_2025:
-            datos['Predicción de votos (%)'] = round(self.modelo.prediccion_2025[partido], 2)
-        if self.modelo.senadores_2025 and partido in self.modelo.senadores_2025:
-            datos['Senadores'] = self.modelo.senadores_2025[partido]
-        if self.modelo.diputados_2025 and partido in self.modelo.diputados_2025:
-            datos['Diputados'] = self.modelo.diputados_2025[partido]
+        resultado = self.modelo.resultado_escanos_2025
+        if resultado is None:
+            return datos
+        resumen = resultado.resumen_partido(partido)
+        if not resumen:
+            return datos
+        if partido in self.modelo.prediccion_2025:
+            datos['Predicción de votos (%)'] = round(resumen['votos'], 2)
+        if resumen['senadores']:
+            datos['Senadores'] = resumen['senadores']
+        if resumen['diputados']:
+            datos['Diputados'] = resumen['diputados']
         # Agregar escaños por departamento
-        if self.modelo.diputados_uninominales_por_depto_2025:
-            for depto, partidos in self.modelo.diputados_uninominales_por_depto_2025.items():
-                if partido in partidos:
-                    datos[f"Diputados uninominales en {depto}"] = partidos[partido]
+        for depto, escanos in resumen['uninominales_por_depto'].items():
+            datos[f"Diputados uninominales en {depto}"] = escanos
         return datos
\ No newline at end of file
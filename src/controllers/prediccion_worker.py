@@ -0,0 +1,119 @@
+"""
+Ejecución de la predicción en segundo plano para no bloquear la interfaz
+"""
+import threading
+from concurrent.futures import ThreadPoolExecutor, Future
+from typing import Any, Callable, Optional, Tuple
+
+
+class PrediccionCancelada(Exception):
+    """Se lanza dentro del hilo de trabajo cuando la ejecución fue reemplazada o cancelada."""
+
+
+class EjecutorPrediccion:
+    """
+    Ejecuta tareas de predicción en un hilo secundario y entrega los resultados
+    en el hilo de Tk mediante sondeo con root.after.
+
+    Solo la última solicitud enviada entrega resultados: al enviar una nueva tarea,
+    la anterior se cancela y cualquier resultado que produzca se descarta.
+    """
+
+    def __init__(self, root, intervalo_sondeo_ms: int = 100):
+        self.root = root
+        self.intervalo_sondeo_ms = intervalo_sondeo_ms
+
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="prediccion")
+        self._lock = threading.Lock()
+        self._id_actual = 0
+        self._futuro: Optional[Future] = None
+        self._evento_cancelar: Optional[threading.Event] = None
+        self._progreso: Tuple[float, str] = (0.0, "")
+
+    def enviar(self, tarea: Callable[[Callable[[float, str], None]], Any],
+               on_resultado: Callable[[Any], None],
+               on_error: Callable[[Exception], None],
+               on_progreso: Optional[Callable[[float, str], None]] = None) -> int:
+        """
+        Envía una tarea al hilo de trabajo, cancelando la ejecución anterior.
+
+        Args:
+            tarea: Función que recibe un callback de progreso(fraccion, mensaje) y retorna el resultado
+            on_resultado: Se invoca en el hilo de Tk con el resultado de la última solicitud
+            on_error: Se invoca en el hilo de Tk si la última solicitud falla
+            on_progreso: Se invoca en el hilo de Tk con el progreso reportado
+
+        Returns:
+            int: Identificador de la solicitud
+        """
+        self.cancelar()
+
+        evento_cancelar = threading.Event()
+        with self._lock:
+            self._id_actual += 1
+            id_solicitud = self._id_actual
+            self._evento_cancelar = evento_cancelar
+            self._progreso = (0.0, "")
+
+        def reportar_progreso(fraccion: float, mensaje: str) -> None:
+            if evento_cancelar.is_set():
+                raise PrediccionCancelada()
+            with self._lock:
+                if id_solicitud == self._id_actual:
+                    self._progreso = (fraccion, mensaje)
+
+        self._futuro = self._executor.submit(tarea, reportar_progreso)
+        self.root.after(self.intervalo_sondeo_ms, self._sondear, id_solicitud, self._futuro,
+                        on_resultado, on_error, on_progreso)
+        return id_solicitud
+
+    def cancelar(self) -> None:
+        """Cancela la solicitud en curso, si existe."""
+        with self._lock:
+            if self._evento_cancelar is not None:
+                self._evento_cancelar.set()
+            # Invalida la solicitud en curso para que su resultado se descarte
+            self._id_actual += 1
+        if self._futuro is not None:
+            self._futuro.cancel()
+
+    def en_ejecucion(self) -> bool:
+        """Indica si hay una solicitud pendiente."""
+        return self._futuro is not None and not self._futuro.done()
+
+    def cerrar(self) -> None:
+        """Cancela lo pendiente y libera el hilo de trabajo."""
+        self.cancelar()
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+    def _sondear(self, id_solicitud: int, futuro: Future,
+                 on_resultado: Callable[[Any], None],
+                 on_error: Callable[[Exception], None],
+                 on_progreso: Optional[Callable[[float, str], None]]) -> None:
+        """Revisa el estado de la solicitud desde el hilo de Tk."""
+        with self._lock:
+            vigente = id_solicitud == self._id_actual
+            progreso = self._progreso
+
+        # Las solicitudes reemplazadas no entregan progreso ni resultados
+        if not vigente:
+            return
+
+        if on_progreso:
+            on_progreso(*progreso)
+
+        if not futuro.done():
+            self.root.after(self.intervalo_sondeo_ms, self._sondear, id_solicitud, futuro,
+                            on_resultado, on_error, on_progreso)
+            return
+
+        if futuro.cancelled():
+            return
+
+        error = futuro.exception()
+        if isinstance(error, PrediccionCancelada):
+            return
+        if error is not None:
+            on_error(error)
+        else:
+            on_resultado(futuro.result())
@@ -0,0 +1,138 @@
+"""
+Caché de predicciones direccionada por contenido (datos, parámetros y semilla)
+"""
+import copy
+import hashlib
+import json
+import os
+import pickle
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, Optional
+
+
+def calcular_clave(*partes: Any) -> str:
+    """
+    Calcula una clave hexadecimal estable a partir de valores serializables en JSON.
+
+    El orden de los diccionarios se conserva (no se ordenan las claves) porque el orden
+    de los partidos forma parte del resultado.
+
+    Args:
+        *partes: Datos, parámetros y semilla que identifican la predicción
+
+    Returns:
+        str: Clave SHA-1 de las partes
+    """
+    contenido = json.dumps(partes, ensure_ascii=False, default=str, separators=(',', ':'))
+    return hashlib.sha1(contenido.encode('utf-8')).hexdigest()
+
+
+class CachePredicciones:
+    """
+    Caché LRU en memoria de resultados de predicción, con un nivel opcional en disco.
+
+    Las entradas se guardan y se devuelven como copias profundas, de modo que modificar
+    un resultado obtenido no altera la caché. El nivel en disco (un archivo pickle por
+    clave en directorio) no tiene límite de tamaño y sobrevive entre sesiones.
+    """
+
+    def __init__(self, max_entradas: int = 64, directorio: Optional[str] = None):
+        if max_entradas < 1:
+            raise ValueError("La caché debe admitir al menos una entrada.")
+        self.max_entradas = max_entradas
+        self.directorio = directorio
+        if directorio:
+            os.makedirs(directorio, exist_ok=True)
+
+        self._entradas: "OrderedDict[str, Any]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.aciertos = 0
+        self.fallos = 0
+
+    def __len__(self) -> int:
+        return len(self._entradas)
+
+    def _ruta(self, clave: str) -> str:
+        return os.path.join(self.directorio, f"{clave}.pkl")
+
+    def obtener(self, clave: str) -> Optional[Any]:
+        """
+        Obtiene un resultado de la caché (primero en memoria y luego en disco).
+
+        Args:
+            clave: Clave de la predicción (ver calcular_clave)
+
+        Returns:
+            Copia del resultado guardado, o None si no existe
+        """
+        with self._lock:
+            if clave in self._entradas:
+                self._entradas.move_to_end(clave)
+                self.aciertos += 1
+                return copy.deepcopy(self._entradas[clave])
+
+        valor = None
+        if self.directorio and os.path.exists(self._ruta(clave)):
+            try:
+                with open(self._ruta(clave), 'rb') as archivo:
+                    valor = pickle.load(archivo)
+            except (OSError, pickle.UnpicklingError, EOFError):
+                valor = None
+
+        with self._lock:
+            if valor is None:
+                self.fallos += 1
+                return None
+            self.aciertos += 1
+            self._guardar_en_memoria(clave, valor)
+        return copy.deepcopy(valor)
+
+    def guardar(self, clave: str, valor: Any) -> None:
+        """
+        Guarda un resultado en la caché (y en disco si hay directorio).
+
+        Args:
+            clave: Clave de la predicción (ver calcular_clave)
+            valor: Resultado a guardar
+        """
+        valor = copy.deepcopy(valor)
+        with self._lock:
+            self._guardar_en_memoria(clave, valor)
+
+        if self.directorio:
+            # Escritura atómica para no dejar archivos truncados
+            temporal = self._ruta(clave) + ".tmp"
+            with open(temporal, 'wb') as archivo:
+                pickle.dump(valor, archivo, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(temporal, self._ruta(clave))
+
+    def _guardar_en_memoria(self, clave: str, valor: Any) -> None:
+        self._entradas[clave] = valor
+        self._entradas.move_to_end(clave)
+        while len(self._entradas) > self.max_entradas:
+            self._entradas.popitem(last=False)
+
+    def limpiar(self) -> None:
+        """Vacía el nivel en memoria y reinicia los contadores (el nivel en disco se conserva)."""
+        with self._lock:
+            self._entradas.clear()
+            self.aciertos = 0
+            self.fallos = 0
+
+    def estadisticas(self) -> Dict[str, Any]:
+        """
+        Obtiene los contadores de uso de la caché.
+
+        Returns:
+            Dict con aciertos, fallos, tasa de aciertos y entradas en memoria
+        """
+        with self._lock:
+            consultas = self.aciertos + self.fallos
+            return {
+                'aciertos': self.aciertos,
+                'fallos': self.fallos,
+                'tasa_aciertos': self.aciertos / consultas if consultas else 0.0,
+                'entradas': len(self._entradas),
+                'max_entradas': self.max_entradas
+            }
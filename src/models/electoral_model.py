@@ -1,24 +1,127 @@
 """
 Modelo principal para la predicción electoral
 """
+import copy
 import numpy as np
-from typing import Dict, List, Tuple
+from typing import Dict, List, Tuple, Any, Callable, Optional
 from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor
 
+from models.resultado_escanos import ResultadoEscanos
+from models.cache_predicciones import CachePredicciones, calcular_clave
+from utils.partidos_utils import RegistroPartidos
+from utils.encuestas_utils import (
+    AgregadorEncuestas, metadatos_como_arreglos, pesos_encuestas, remuestrear_encuestas
+)
+from utils.historico_utils import huella_historicos, obtener_componente_historico
+from utils.variacion_regional_utils import VariacionRegional
+from utils.segunda_vuelta_utils import TransferenciaVotos, simular_segunda_vuelta_lote
+from config.settings import (AÑO_ELECCION, COMPONENTE_HISTORICO_DEFAULT, VIDA_MEDIA_HISTORICA_DEFAULT,
+                             MODELO_RUIDO_DEFAULT, METODO_REPARTO_DEFAULT,
+                             ABSTENCION_SEGUNDA_VUELTA_DEFAULT, CONCENTRACION_TRANSFERENCIA_DEFAULT)
 from utils.electoral_utils import (
-    verificar_segunda_vuelta, calcular_escanos, simular_segunda_vuelta,
-    obtener_detalle_escanos
+    verificar_segunda_vuelta, probabilidades_segunda_vuelta, calcular_escanos, simular_segunda_vuelta,
+    acumular_distribucion_escanos, PipelineEscanos
+)
+from utils.ruido_utils import ruido_uniforme, ruido_dirichlet, ruido_logistico_normal
+from utils.aleatorio_utils import (
+    Semilla, SIMULACIONES_POR_UNIDAD, INDICE_FLUJO_AUXILIAR, secuencia_semilla, secuencia_hija,
+    generador_desde, generadores_por_unidad
 )
 
 
+def aplicar_margen_error(prediccion_base: np.ndarray, margen_error: float, num_simulaciones: int,
+                         generador: np.random.Generator, modelo_ruido: str = "Uniforme",
+                         covarianza: Optional[np.ndarray] = None) -> np.ndarray:
+    """
+    Aplica el margen de error y normaliza cada simulación a 100%.
+    
+    Args:
+        prediccion_base: Predicción base por partido
+        margen_error: Variación relativa máxima (uniforme en ±margen_error); en los demás
+            modelos fija una dispersión equivalente (ver utils.ruido_utils)
+        num_simulaciones: Número de simulaciones (filas) a generar
+        generador: Generador aleatorio
+        modelo_ruido: Uno de OPCIONES_MODELO_RUIDO
+        covarianza: Covarianza del ruido logístico-normal (partidos x partidos)
+        
+    Returns:
+        np.ndarray: Matriz simulaciones x partidos con porcentajes normalizados
+    """
+    prediccion_base = np.maximum(prediccion_base, 0)
+    total_base = prediccion_base.sum()
+    if modelo_ruido == "Uniforme" or total_base <= 0:
+        prediccion = ruido_uniforme(prediccion_base, margen_error, num_simulaciones, generador)
+    elif modelo_ruido == "Dirichlet":
+        prediccion = ruido_dirichlet(prediccion_base / total_base, margen_error, num_simulaciones, generador)
+    elif modelo_ruido == "Logístico-normal":
+        prediccion = ruido_logistico_normal(prediccion_base / total_base, margen_error, num_simulaciones,
+                                            generador, covarianza)
+    else:
+        raise ValueError(f"Modelo de ruido no soportado: '{modelo_ruido}'.")
+    
+    totales = prediccion.sum(axis=1, keepdims=True)
+    if np.any(totales <= 0):
+        raise ValueError("La predicción de votos resultó en 0 para todos los partidos.")
+    
+    return prediccion / totales * 100
+
+
+def generar_simulaciones(prediccion_base: np.ndarray, margen_error: float,
+                         secuencia: np.random.SeedSequence, num_simulaciones: int,
+                         tamano_bloque: int, unidad_inicio: int = 0, unidad_fin: Optional[int] = None,
+                         modelo_ruido: str = "Uniforme", covarianza: Optional[np.ndarray] = None):
+    """
+    Genera bloques de simulaciones a partir de flujos aleatorios independientes por unidad
+    (ver utils.aleatorio_utils), de modo que la simulación i es siempre la misma sin
+    importar el tamaño de bloque ni cómo se repartan las unidades entre procesos.
+    
+    Returns:
+        Iterator[np.ndarray]: Bloques simulaciones x partidos (de unas tamano_bloque filas)
+    """
+    unidades_por_bloque = max(1, tamano_bloque // SIMULACIONES_POR_UNIDAD)
+    bloque = []
+    for generador, tamano in generadores_por_unidad(secuencia, num_simulaciones, unidad_inicio, unidad_fin):
+        bloque.append(aplicar_margen_error(prediccion_base, margen_error, tamano, generador,
+                                           modelo_ruido, covarianza))
+        if len(bloque) == unidades_por_bloque:
+            yield np.concatenate(bloque)
+            bloque = []
+    if bloque:
+        yield np.concatenate(bloque)
+
+
+def _distribucion_por_unidades(prediccion_base, margen_error, modelo_ruido, covarianza, secuencia,
+                               num_simulaciones, tamano_bloque, unidad_inicio, unidad_fin,
+                               partidos, umbral_minimo, porcentajes_por_depto, variacion_regional=None,
+                               metodo_reparto=METODO_REPARTO_DEFAULT):
+    """Histograma de escaños de un rango de unidades (se ejecuta en un proceso de trabajo)."""
+    bloques = generar_simulaciones(prediccion_base, margen_error, secuencia, num_simulaciones,
+                                   tamano_bloque, unidad_inicio, unidad_fin, modelo_ruido, covarianza)
+    return acumular_distribucion_escanos(bloques, partidos, umbral_minimo, porcentajes_por_depto,
+                                         variacion_regional=variacion_regional, metodo_reparto=metodo_reparto)
+
+
 class ModeloPredictivoElectoral:
     """
     Modelo predictivo para las elecciones en Bolivia 2025.
     """
     
-    def __init__(self):
+    def __init__(self, cache: Optional[CachePredicciones] = None):
         self.datos_historicos = {}
         self.encuestas_2025 = {}
+        
+        # Registro de partidos (ids densos y alias) y datos densos resueltos al cargar
+        self.registro_partidos = RegistroPartidos()
+        self._años_historicos = np.zeros(0, dtype=np.int64)
+        self._matriz_historicos = np.zeros((0, 0))
+        self._huella_historicos = ""
+        self._ids_encuestas = np.zeros(0, dtype=np.int64)
+        
+        # Metadatos de encuestas (fecha, muestra, encuestadora) y su promedio ponderado
+        self.metadatos_encuestas: Dict[str, Dict[str, Any]] = {}
+        self.corregir_efecto_casa = True
+        self._agregador_encuestas = AgregadorEncuestas(0)
         self.prediccion_2025 = {}
         self.senadores_2025 = {}
         self.diputados_2025 = {}
@@ -29,6 +132,19 @@ class ModeloPredictivoElectoral:
         self.diputados_uninominales_2025 = {}
         self.diputados_uninominales_por_depto_2025 = {}
         self.detalle_escanos_2025 = {}
+        self.resultado_escanos_2025 = None
+        # Tiempo propio de cada etapa del último cálculo de escaños (ver PipelineEscanos)
+        self.tiempos_escanos_2025 = {}
+        
+        # Porcentajes observados por departamento (cómputo de actas), si se cargaron
+        self.porcentajes_por_depto_2025 = {}
+        
+        # Variación regional departamentos x partidos (None: la de src/data/variacion_regional.csv)
+        self.variacion_regional: Optional[VariacionRegional] = None
+        
+        # Transferencia de votos en segunda vuelta (None: reparto proporcional con abstención)
+        self.transferencia_votos: Optional[TransferenciaVotos] = None
+        self.abstencion_segunda_vuelta = ABSTENCION_SEGUNDA_VUELTA_DEFAULT
         
         # Variables del modelo
         self.peso_historico = 0.4
@@ -36,6 +152,19 @@ class ModeloPredictivoElectoral:
         self.margen_error_prediccion = 0.03
         self.tendencia_ajuste = "Conservar"
         self.umbral_minimo = 0.03
+        self.componente_historico = COMPONENTE_HISTORICO_DEFAULT
+        self.vida_media_historica = VIDA_MEDIA_HISTORICA_DEFAULT
+        self.modelo_ruido = MODELO_RUIDO_DEFAULT
+        self.metodo_reparto = METODO_REPARTO_DEFAULT
+        # Covarianza opcional del ruido logístico-normal, en el orden de partidos de las encuestas
+        self.covarianza_ruido: Optional[np.ndarray] = None
+        
+        # Semilla del margen de error: entero, SeedSequence o Generator
+        # (None: resultados no reproducibles y sin caché)
+        self.semilla: Semilla = None
+        
+        # Caché de predicciones compartible entre modelos (ver models.cache_predicciones)
+        self.cache = cache
         
         # Variables para segunda vuelta
         self.segunda_vuelta = False
@@ -48,79 +177,294 @@ class ModeloPredictivoElectoral:
         self.prediccion_ejecutada = False
     
     def cargar_datos_historicos(self, datos: Dict[str, Dict[str, float]]) -> None:
-        """Carga los datos históricos de elecciones."""
-        self.datos_historicos = datos
+        """Carga los datos históricos de elecciones, resolviendo los alias de partidos."""
+        self.datos_historicos = self.registro_partidos.resolver(datos)
+        
+        # Años en orden ascendente y matriz años x ids de partido
+        años = [int(float(y)) for y in self.datos_historicos.keys()]
+        orden = np.argsort(años, kind='stable')
+        self._años_historicos = np.array(años, dtype=np.int64)[orden]
+        self._matriz_historicos = self.registro_partidos.matriz(self.datos_historicos)[orden]
+        self._huella_historicos = huella_historicos(self._años_historicos, self._matriz_historicos)
+    
+    def cargar_encuestas(self, encuestas: Dict[str, Dict[str, float]],
+                         metadatos: Optional[Dict[str, Dict[str, Any]]] = None) -> None:
+        """
+        Carga los datos de encuestas 2025, resolviendo los alias de partidos.
+        
+        Args:
+            encuestas: Porcentajes por encuesta y partido
+            metadatos: Fecha, muestra y encuestadora por encuesta (ver utils.encuestas_utils);
+                sin metadatos todas las encuestas pesan lo mismo
+        """
+        self.encuestas_2025 = self.registro_partidos.resolver(encuestas)
+        self.metadatos_encuestas = dict(metadatos or {})
+        
+        # Partidos de las encuestas (en orden de aparición) y matriz encuestas x ids
+        matriz = self.registro_partidos.matriz(self.encuestas_2025)
+        self._ids_encuestas = self.registro_partidos.ids(
+            dict.fromkeys(p for e in self.encuestas_2025.values() for p in e.keys())
+        )
+        arreglos = metadatos_como_arreglos(list(self.encuestas_2025.keys()), self.metadatos_encuestas)
+        self._agregador_encuestas = AgregadorEncuestas(len(self.registro_partidos))
+        self._agregador_encuestas.agregar_lote(matriz, arreglos['dias'], arreglos['muestras'],
+                                               arreglos['encuestadoras'])
+    
+    def agregar_encuesta(self, nombre: str, valores: Dict[str, float], fecha: Optional[str] = None,
+                         muestra: Optional[int] = None, encuestadora: Optional[str] = None) -> None:
+        """
+        Agrega una encuesta actualizando el promedio ponderado de forma incremental,
+        sin volver a procesar las encuestas ya cargadas.
+        
+        Args:
+            nombre: Nombre de la encuesta (si ya existe, se recargan todas las encuestas)
+            valores: Porcentajes por partido
+            fecha: Fecha de la encuesta (AAAA-MM-DD)
+            muestra: Tamaño de muestra
+            encuestadora: Nombre de la encuestadora
+        """
+        metadatos = {'fecha': fecha, 'muestra': muestra, 'encuestadora': encuestadora}
+        if nombre in self.encuestas_2025:
+            encuestas = dict(self.encuestas_2025)
+            encuestas[nombre] = valores
+            self.cargar_encuestas(encuestas, {**self.metadatos_encuestas, nombre: metadatos})
+            return
+        
+        valores = self.registro_partidos.resolver({nombre: valores})[nombre]
+        self.encuestas_2025[nombre] = valores
+        self.metadatos_encuestas[nombre] = metadatos
+        
+        ids = self.registro_partidos.ids(valores.keys())
+        existentes = set(self._ids_encuestas.tolist())
+        nuevos = [i for i in dict.fromkeys(ids.tolist()) if i not in existentes]
+        self._ids_encuestas = np.concatenate([self._ids_encuestas, np.array(nuevos, dtype=np.int64)])
+        
+        fila = np.zeros(len(self.registro_partidos))
+        np.add.at(fila, ids, np.fromiter(valores.values(), dtype=float, count=len(valores)))
+        arreglos = metadatos_como_arreglos([nombre], {nombre: metadatos})
+        self._agregador_encuestas.agregar(fila, arreglos['dias'][0], arreglos['muestras'][0],
+                                          arreglos['encuestadoras'][0])
     
-    def cargar_encuestas(self, encuestas: Dict[str, Dict[str, float]]) -> None:
-        """Carga los datos de encuestas 2025."""
-        self.encuestas_2025 = encuestas
+    def cargar_resultados_actas(self, resultados, nombre: str = "Cómputo de actas") -> None:
+        """
+        Carga resultados agregados de actas (ver utils.actas_utils.ResultadosActas).
+        
+        Los porcentajes nacionales reemplazan a las encuestas y los porcentajes por
+        departamento se usan en la asignación territorial de escaños.
+        
+        Args:
+            resultados: Resultados acumulados por departamento y partido
+            nombre: Nombre con el que se registra el cómputo entre las encuestas
+        """
+        self.cargar_encuestas({nombre: resultados.porcentajes_nacionales()})
+        self.porcentajes_por_depto_2025 = self.registro_partidos.resolver(resultados.porcentajes_por_departamento())
+    
+    def cargar_variacion_regional(self, variacion_regional: Optional[VariacionRegional]) -> None:
+        """
+        Establece la matriz de variación regional con la que se estiman los porcentajes
+        departamentales (ver utils.variacion_regional_utils); None vuelve a la del archivo
+        por defecto. Los nombres de partidos se resuelven con los alias del registro.
+        """
+        if variacion_regional is not None:
+            variacion_regional = VariacionRegional(
+                departamentos=list(variacion_regional.departamentos),
+                partidos=[self.registro_partidos.canonico(p) for p in variacion_regional.partidos],
+                factores=np.asarray(variacion_regional.factores, dtype=float)
+            )
+        self.variacion_regional = variacion_regional
+    
+    def cargar_transferencia_votos(self, transferencia: Optional[TransferenciaVotos],
+                                   abstencion: Optional[float] = None) -> None:
+        """
+        Establece la matriz de transferencia de votos de la segunda vuelta (ver
+        utils.segunda_vuelta_utils) y, si se indica, la abstención de los partidos sin
+        fila en ella. Los nombres de partidos se resuelven con los alias del registro.
+        """
+        if transferencia is not None:
+            transferencia = TransferenciaVotos(
+                origenes=[self.registro_partidos.canonico(p) for p in transferencia.origenes],
+                destinos=[self.registro_partidos.canonico(p) for p in transferencia.destinos],
+                fracciones=np.asarray(transferencia.fracciones, dtype=float)
+            )
+        if abstencion is not None:
+            if not 0 <= abstencion <= 1:
+                raise ValueError("La abstención de segunda vuelta debe estar entre 0 y 1.")
+            self.abstencion_segunda_vuelta = abstencion
+        self.transferencia_votos = transferencia
     
     def configurar_parametros(self, peso_historico: float, peso_encuestas: float,
-                            margen_error: float, tendencia: str, umbral: float) -> None:
-        """Configura los parámetros del modelo predictivo."""
+                            margen_error: float, tendencia: str, umbral: float,
+                            componente_historico: Optional[str] = None,
+                            vida_media_historica: Optional[float] = None,
+                            semilla: Semilla = None, modelo_ruido: Optional[str] = None,
+                            metodo_reparto: Optional[str] = None) -> None:
+        """
+        Configura los parámetros del modelo predictivo.
+        
+        componente_historico, vida_media_historica, semilla, modelo_ruido y metodo_reparto
+        son opcionales; si se omiten se conservan los valores actuales (ver
+        utils.historico_utils, utils.ruido_utils y utils.reparto_utils).
+        """
         self.peso_historico = peso_historico
         self.peso_encuestas = peso_encuestas
         self.margen_error_prediccion = margen_error
         self.tendencia_ajuste = tendencia
         self.umbral_minimo = umbral
+        if componente_historico is not None:
+            self.componente_historico = componente_historico
+        if vida_media_historica is not None:
+            self.vida_media_historica = vida_media_historica
+        if semilla is not None:
+            self.semilla = semilla
+        if modelo_ruido is not None:
+            self.modelo_ruido = modelo_ruido
+        if metodo_reparto is not None:
+            self.metodo_reparto = metodo_reparto
     
-    def ejecutar_prediccion(self) -> None:
+    def _calcular_componentes(self) -> Tuple[List[str], np.ndarray, np.ndarray]:
         """
-        Ejecuta el modelo predictivo completo.
+        Obtiene los partidos y los vectores histórico y de encuestas alineados.
+        
+        Returns:
+            Tuple[List[str], np.ndarray, np.ndarray]: (partidos, valores_historicos, promedios_encuestas)
         """
         if not self.datos_historicos or not self.encuestas_2025:
             raise ValueError("Se requieren tanto datos históricos como encuestas para ejecutar la predicción.")
         
-        # Obtener datos históricos más recientes
-        ultimos_años_historicos_keys = sorted([int(float(y)) for y in self.datos_historicos.keys()], reverse=True)
-        if not ultimos_años_historicos_keys:
+        if len(self._años_historicos) == 0:
             raise ValueError("No hay datos históricos disponibles.")
-            
-        datos_historicos_recientes = self.datos_historicos[str(ultimos_años_historicos_keys[0])]
         
-        # Obtener todos los partidos únicos SOLO de las encuestas
-        all_parties = set().union(*[e.keys() for e in self.encuestas_2025.values()])
+        # Componente histórico de toda la serie (en caché por conjunto de datos),
+        # alineado a los partidos de las encuestas por id
+        componente = obtener_componente_historico(
+            self._huella_historicos, self._años_historicos, self._matriz_historicos,
+            self.componente_historico, AÑO_ELECCION, self.vida_media_historica
+        )
+        ids = self._ids_encuestas
+        valores_historicos = np.zeros(len(ids))
+        conocidos = ids < componente.shape[0]
+        valores_historicos[conocidos] = componente[ids[conocidos]]
         
-        # Calcular promedios de encuestas
-        promedios_encuestas_2025 = {}
-        for p in all_parties:
-            valores = [e.get(p, 0) for e in self.encuestas_2025.values()]
-            promedios_encuestas_2025[p] = np.mean(valores) if valores else 0
+        promedios_encuestas = self._agregador_encuestas.promedio(self.corregir_efecto_casa)[ids]
+        partidos = [self.registro_partidos.nombre(i) for i in ids]
         
-        # Ejecutar predicción
-        self.prediccion_2025 = {}
-        for p in all_parties:
-            hist_val = datos_historicos_recientes.get(p, 0)
-            enc_val = promedios_encuestas_2025.get(p, 0)
-            
-            prediccion_base = (hist_val * self.peso_historico) + (enc_val * self.peso_encuestas)
+        return partidos, valores_historicos, promedios_encuestas
+    
+    def _calcular_prediccion_base(self, valores_historicos: np.ndarray,
+                                  promedios_encuestas: np.ndarray) -> np.ndarray:
+        """
+        Aplica la ponderación y el ajuste de tendencia a los vectores de entrada.
+        
+        Args:
+            valores_historicos: Porcentajes históricos por partido
+            promedios_encuestas: Promedio de encuestas por partido
             
-            # Aplicar ajuste de tendencia
-            if self.tendencia_ajuste == "Acentuar":
-                if enc_val > hist_val:
-                    prediccion_base *= 1.05
-                elif enc_val < hist_val:
-                    prediccion_base *= 0.95
-            elif self.tendencia_ajuste == "Suavizar":
-                prediccion_base = (hist_val + enc_val) / 2
+        Returns:
+            np.ndarray: Predicción base (sin margen de error) por partido
+        """
+        prediccion_base = (valores_historicos * self.peso_historico) + (promedios_encuestas * self.peso_encuestas)
+        
+        # Aplicar ajuste de tendencia
+        if self.tendencia_ajuste == "Acentuar":
+            factor = np.where(promedios_encuestas > valores_historicos, 1.05,
+                              np.where(promedios_encuestas < valores_historicos, 0.95, 1.0))
+            prediccion_base = prediccion_base * factor
+        elif self.tendencia_ajuste == "Suavizar":
+            prediccion_base = (valores_historicos + promedios_encuestas) / 2
+        
+        return prediccion_base
+    
+    def _aplicar_margen_error(self, prediccion_base: np.ndarray, num_simulaciones: int,
+                              generador: Optional[np.random.Generator] = None) -> np.ndarray:
+        """
+        Aplica el margen de error del modelo (ver aplicar_margen_error).
+        
+        Args:
+            prediccion_base: Predicción base por partido
+            num_simulaciones: Número de simulaciones (filas) a generar
+            generador: Generador aleatorio (por defecto, el derivado de self.semilla)
             
-            # Aplicar margen de error
-            variacion = np.random.uniform(-self.margen_error_prediccion, self.margen_error_prediccion)
-            prediccion = max(0, prediccion_base * (1 + variacion))
-            self.prediccion_2025[p] = prediccion
-        
-        # Normalizar predicción
-        total_prediccion = sum(self.prediccion_2025.values())
-        if total_prediccion > 0:
-            self.prediccion_2025 = {p: (v / total_prediccion) * 100 for p, v in self.prediccion_2025.items()}
-        else:
-            raise ValueError("La predicción de votos resultó en 0 para todos los partidos.")
+        Returns:
+            np.ndarray: Matriz simulaciones x partidos con porcentajes normalizados
+        """
+        if generador is None:
+            generador = generador_desde(self.semilla)
+        return aplicar_margen_error(prediccion_base, self.margen_error_prediccion, num_simulaciones, generador,
+                                    self.modelo_ruido, self.covarianza_ruido)
+    
+    def ejecutar_prediccion(self, callback_progreso: Optional[Callable[[float, str], None]] = None) -> None:
+        """
+        Ejecuta el modelo predictivo completo.
+        
+        Args:
+            callback_progreso: Función opcional que recibe (fracción completada, mensaje)
+                al inicio de cada etapa
+        """
+        if callback_progreso is None:
+            callback_progreso = lambda fraccion, mensaje: None
+        
+        # Con semilla entera el resultado es determinista y puede reutilizarse desde la caché
+        cacheable = self.cache is not None and isinstance(self.semilla, (int, np.integer))
+        clave = self._clave_prediccion() if cacheable else None
+        if clave is not None:
+            guardado = self.cache.obtener(clave)
+            if guardado is not None:
+                self.prediccion_2025 = guardado['prediccion_votos']
+                self.segunda_vuelta = guardado['segunda_vuelta']
+                self.candidatos_segunda_vuelta = guardado['candidatos_segunda_vuelta']
+                self._asignar_detalle_escanos(guardado['detalle_escanos'])
+                self.tiempos_escanos_2025 = {}
+                callback_progreso(1.0, "Predicción completa (en caché)")
+                return
+        
+        callback_progreso(0.0, "Preparando datos")
+        partidos, valores_historicos, promedios_encuestas = self._calcular_componentes()
+        prediccion_base = self._calcular_prediccion_base(valores_historicos, promedios_encuestas)
+        
+        # Ejecutar predicción con margen de error y normalizar
+        prediccion = self._aplicar_margen_error(prediccion_base, 1)[0]
+        self.prediccion_2025 = {p: float(v) for p, v in zip(partidos, prediccion)}
         
         # Verificar segunda vuelta
+        callback_progreso(0.4, "Verificando segunda vuelta")
         self.segunda_vuelta, self.candidatos_segunda_vuelta = verificar_segunda_vuelta(self.prediccion_2025)
         
         # Calcular escaños con detalle
-        self.detalle_escanos_2025 = obtener_detalle_escanos(self.prediccion_2025, self.umbral_minimo)
+        callback_progreso(0.5, "Calculando escaños")
+        pipeline = PipelineEscanos.desde_prediccion(self.prediccion_2025, self.umbral_minimo,
+                                                    self.porcentajes_por_depto_2025,
+                                                    variacion_regional=self.variacion_regional,
+                                                    metodo_reparto=self.metodo_reparto)
+        self._asignar_detalle_escanos(pipeline.detalle())
+        self.tiempos_escanos_2025 = pipeline.tiempos
+        
+        if clave is not None:
+            self.cache.guardar(clave, {
+                'prediccion_votos': self.prediccion_2025,
+                'segunda_vuelta': self.segunda_vuelta,
+                'candidatos_segunda_vuelta': self.candidatos_segunda_vuelta,
+                'detalle_escanos': self.detalle_escanos_2025
+            })
+        
+        callback_progreso(1.0, "Predicción completa")
+    
+    def _clave_prediccion(self) -> str:
+        """Clave de caché de la predicción: datos cargados, parámetros y semilla."""
+        # La huella histórica solo cubre los números por id de partido; los nombres del
+        # registro dicen a qué partido corresponde cada columna
+        return calcular_clave(
+            'prediccion', self._huella_historicos, list(self.registro_partidos.nombres), self.encuestas_2025, self.metadatos_encuestas,
+            self.corregir_efecto_casa, self.porcentajes_por_depto_2025,
+            None if self.variacion_regional is None else self.variacion_regional.como_clave(),
+            self.peso_historico, self.peso_encuestas, self.margen_error_prediccion, self.tendencia_ajuste,
+            self.umbral_minimo, self.componente_historico, self.vida_media_historica, self.modelo_ruido,
+            self.metodo_reparto,
+            None if self.covarianza_ruido is None else np.asarray(self.covarianza_ruido).tolist(), int(self.semilla)
+        )
+    
+    def _asignar_detalle_escanos(self, detalle: Dict[str, Any]) -> None:
+        """Asigna el detalle de escaños y los resultados que se derivan de él."""
+        self.detalle_escanos_2025 = detalle
         
         # Extraer resultados específicos
         self.senadores_2025 = self.detalle_escanos_2025['senadores']
@@ -128,26 +472,251 @@ class ModeloPredictivoElectoral:
         self.diputados_uninominales_2025 = self.detalle_escanos_2025['diputados_uninominales']
         self.diputados_uninominales_por_depto_2025 = self.detalle_escanos_2025['diputados_uninominales_por_depto']
         self.diputados_2025 = self.detalle_escanos_2025['total_diputados']
+        self.resultado_escanos_2025 = ResultadoEscanos.desde_detalle(self.prediccion_2025, self.detalle_escanos_2025)
         
         self.prediccion_ejecutada = True
     
+    def ejecutar_simulaciones(self, num_simulaciones: int = 100000,
+                              percentiles: Tuple[float, ...] = (5, 50, 95)) -> Dict[str, Any]:
+        """
+        Ejecuta el modelo en modo Monte Carlo sobre una matriz simulaciones x partidos.
+        Con la misma semilla, las simulaciones coinciden con las de ejecutar_distribucion_escanos.
+        
+        Args:
+            num_simulaciones: Número de simulaciones a ejecutar
+            percentiles: Percentiles a calcular para cada partido
+            
+        Returns:
+            Dict con los partidos, la media y las bandas de percentiles por partido, y las
+            probabilidades de segunda vuelta y de cada pareja de finalistas
+            (ver probabilidades_segunda_vuelta)
+        """
+        if num_simulaciones < 1:
+            raise ValueError("El número de simulaciones debe ser al menos 1.")
+        
+        partidos, valores_historicos, promedios_encuestas = self._calcular_componentes()
+        prediccion_base = self._calcular_prediccion_base(valores_historicos, promedios_encuestas)
+        simulaciones = np.concatenate(list(generar_simulaciones(
+            prediccion_base, self.margen_error_prediccion, secuencia_semilla(self.semilla),
+            num_simulaciones, num_simulaciones, modelo_ruido=self.modelo_ruido, covarianza=self.covarianza_ruido
+        )))
+        
+        medias = simulaciones.mean(axis=0)
+        bandas = np.percentile(simulaciones, percentiles, axis=0)
+        
+        return {
+            'partidos': partidos,
+            'num_simulaciones': num_simulaciones,
+            'media': {p: float(m) for p, m in zip(partidos, medias)},
+            'percentiles': {
+                p: {pc: float(bandas[i, j]) for i, pc in enumerate(percentiles)}
+                for j, p in enumerate(partidos)
+            },
+            'segunda_vuelta': probabilidades_segunda_vuelta(simulaciones, partidos)
+        }
+    
+    def ejecutar_distribucion_escanos(self, num_simulaciones: int = 100000,
+                                      tamano_bloque: int = 10000,
+                                      num_procesos: int = 1) -> Dict[str, Any]:
+        """
+        Calcula la distribución de escaños por partido y cámara a lo largo de
+        num_simulaciones simulaciones, generadas y procesadas por bloques.
+        
+        Cada unidad de simulaciones usa un flujo aleatorio propio derivado de la semilla,
+        por lo que, con la misma semilla, el resultado es idéntico bit a bit para cualquier
+        tamaño de bloque y número de procesos.
+        
+        Args:
+            num_simulaciones: Número total de simulaciones
+            tamano_bloque: Número de simulaciones generadas por bloque
+            num_procesos: Procesos entre los que se reparten las unidades (1 = proceso actual)
+            
+        Returns:
+            Dict con escaños esperados, P(mayoría), P(2/3) e histogramas por cámara
+        """
+        if num_simulaciones < 1:
+            raise ValueError("El número de simulaciones debe ser al menos 1.")
+        
+        partidos, valores_historicos, promedios_encuestas = self._calcular_componentes()
+        prediccion_base = self._calcular_prediccion_base(valores_historicos, promedios_encuestas)
+        secuencia = secuencia_semilla(self.semilla)
+        argumentos = (prediccion_base, self.margen_error_prediccion, self.modelo_ruido, self.covarianza_ruido,
+                      secuencia, num_simulaciones, tamano_bloque)
+        contexto = (partidos, self.umbral_minimo, self.porcentajes_por_depto_2025, self.variacion_regional,
+                    self.metodo_reparto)
+        
+        total_unidades = -(-num_simulaciones // SIMULACIONES_POR_UNIDAD)
+        num_procesos = max(1, min(num_procesos, total_unidades))
+        if num_procesos == 1:
+            return _distribucion_por_unidades(*argumentos, 0, total_unidades, *contexto).resumen()
+        
+        limites = np.linspace(0, total_unidades, num_procesos + 1).astype(int)
+        with ProcessPoolExecutor(max_workers=num_procesos) as executor:
+            futuros = [executor.submit(_distribucion_por_unidades, *argumentos, int(inicio), int(fin), *contexto)
+                       for inicio, fin in zip(limites[:-1], limites[1:])]
+            histograma = futuros[0].result()
+            for futuro in futuros[1:]:
+                histograma.combinar(futuro.result())
+        return histograma.resumen()
+    
+    def ejecutar_bootstrap(self, num_remuestreos: int = 2000, nivel_confianza: float = 0.9,
+                           tamano_bloque: int = 10000) -> Dict[str, Any]:
+        """
+        Estima intervalos de confianza de votos y escaños remuestreando las encuestas
+        (encuestas con reposición y encuestados con un multinomial según su muestra).
+        
+        Cada remuestreo reemplaza el promedio de encuestas en la predicción base (con el
+        mismo componente histórico, pesos y tendencia) y sus escaños se asignan con los
+        mismos cálculos en lote de la distribución de escaños. Los remuestreos usan los
+        flujos aleatorios por unidad de la semilla, así que son reproducibles.
+        
+        Args:
+            num_remuestreos: Número de remuestreos bootstrap
+            nivel_confianza: Nivel de los intervalos (por ejemplo 0.9 para el 5%-95%)
+            tamano_bloque: Remuestreos generados por bloque
+            
+        Returns:
+            Dict con la media y el intervalo de votos por partido, y los escaños esperados
+            e intervalo por partido y cámara
+        """
+        if num_remuestreos < 1:
+            raise ValueError("El número de remuestreos debe ser al menos 1.")
+        if not 0 < nivel_confianza < 1:
+            raise ValueError("El nivel de confianza debe estar entre 0 y 1.")
+        
+        partidos, valores_historicos, promedios_encuestas = self._calcular_componentes()
+        ids = self._ids_encuestas
+        
+        # Encuestas y pesos individuales (el agregador solo guarda sumas por encuestadora)
+        etiquetas = list(self.encuestas_2025.keys())
+        matriz = self.registro_partidos.matriz(self.encuestas_2025)[:, ids]
+        arreglos = metadatos_como_arreglos(etiquetas, self.metadatos_encuestas)
+        dias = arreglos['dias']
+        antiguedad = (np.nanmax(dias) - dias) if not np.all(np.isnan(dias)) else np.zeros(len(etiquetas))
+        pesos = pesos_encuestas(antiguedad, arreglos['muestras'], self._agregador_encuestas.vida_media_dias)
+        
+        # La corrección por encuestadora se aplica como desplazamiento fijo del promedio
+        desplazamiento = np.zeros(len(ids))
+        if self.corregir_efecto_casa:
+            desplazamiento = (self._agregador_encuestas.promedio(True) - self._agregador_encuestas.promedio(False))[ids]
+        
+        secuencia = secuencia_semilla(self.semilla)
+        # Los porcentajes de cada remuestreo se escriben en su lugar y cada bloque de
+        # escaños es una vista de este arreglo, sin listas ni copias intermedias
+        votos = np.empty((num_remuestreos, len(partidos)))
+        
+        def generar_bloques():
+            unidades_por_bloque = max(1, tamano_bloque // SIMULACIONES_POR_UNIDAD)
+            inicio_bloque = fin = 0
+            for unidad, (generador, tamano) in enumerate(generadores_por_unidad(secuencia, num_remuestreos), 1):
+                encuestas = remuestrear_encuestas(matriz, arreglos['muestras'], pesos, tamano, generador)
+                base = np.maximum(self._calcular_prediccion_base(valores_historicos, encuestas + desplazamiento), 0)
+                totales = base.sum(axis=1, keepdims=True)
+                if np.any(totales <= 0):
+                    raise ValueError("La predicción de votos resultó en 0 para todos los partidos.")
+                votos[fin:fin + tamano] = base / totales * 100
+                fin += tamano
+                if unidad % unidades_por_bloque == 0:
+                    yield votos[inicio_bloque:fin]
+                    inicio_bloque = fin
+            if fin > inicio_bloque:
+                yield votos[inicio_bloque:fin]
+        
+        histograma = acumular_distribucion_escanos(generar_bloques(), partidos, self.umbral_minimo,
+                                                   self.porcentajes_por_depto_2025,
+                                                   variacion_regional=self.variacion_regional,
+                                                   metodo_reparto=self.metodo_reparto)
+        
+        cola = (1 - nivel_confianza) / 2
+        limites_votos = np.percentile(votos, [cola * 100, (1 - cola) * 100], axis=0)
+        resumen = histograma.resumen()
+        
+        resultado = {
+            'num_remuestreos': num_remuestreos,
+            'nivel_confianza': nivel_confianza,
+            'partidos': partidos,
+            'votos': {
+                p: {'media': float(votos[:, j].mean()), 'inferior': float(limites_votos[0, j]),
+                    'superior': float(limites_votos[1, j])}
+                for j, p in enumerate(partidos)
+            },
+            'escanos': {}
+        }
+        for camara in histograma.conteos:
+            limites = histograma.percentiles(camara, [cola, 1 - cola])
+            resultado['escanos'][camara] = {
+                p: {'esperados': resumen[camara]['escanos_esperados'][p], 'inferior': int(limites[j, 0]),
+                    'superior': int(limites[j, 1])}
+                for j, p in enumerate(partidos)
+            }
+        return resultado
+    
     def simular_segunda_vuelta(self) -> Dict[str, float]:
         """
-        Simula los resultados de la segunda vuelta electoral.
+        Simula los resultados de la segunda vuelta electoral con la matriz de transferencia.
         
         Returns:
-            Dict[str, float]: Predicción de votos para la segunda vuelta
+            Dict[str, float]: Porcentaje de votos válidos de cada candidato en la segunda vuelta
         """
         if not self.segunda_vuelta or len(self.candidatos_segunda_vuelta) < 2:
             return {}
         
         self.prediccion_segunda_vuelta = simular_segunda_vuelta(
             self.prediccion_2025, 
-            self.candidatos_segunda_vuelta
+            self.candidatos_segunda_vuelta,
+            self.transferencia_votos,
+            self.abstencion_segunda_vuelta
         )
         
         return self.prediccion_segunda_vuelta
     
+    def ejecutar_segunda_vuelta(self, num_simulaciones: int = 100000,
+                                percentiles: Tuple[float, ...] = (5, 50, 95),
+                                finalistas: Optional[List[str]] = None,
+                                concentracion: Optional[float] = CONCENTRACION_TRANSFERENCIA_DEFAULT
+                                ) -> Dict[str, Any]:
+        """
+        Simula la segunda vuelta en modo Monte Carlo: las simulaciones de primera vuelta
+        (las mismas que ejecutar_simulaciones con la misma semilla) se transfieren a los
+        finalistas con una matriz de transferencia muestreada por simulación, en un único
+        producto por lotes.
+        
+        Args:
+            num_simulaciones: Número de simulaciones
+            percentiles: Percentiles de las bandas de votos
+            finalistas: Los dos finalistas (por defecto, los candidatos de la predicción o,
+                si no hay segunda vuelta, los dos primeros de la predicción base)
+            concentracion: Incertidumbre de la matriz de transferencia (None: matriz fija)
+            
+        Returns:
+            Dict con P(victoria), media y percentiles por finalista y bandas de abstención
+        """
+        if num_simulaciones < 1:
+            raise ValueError("El número de simulaciones debe ser al menos 1.")
+        
+        partidos, valores_historicos, promedios_encuestas = self._calcular_componentes()
+        prediccion_base = self._calcular_prediccion_base(valores_historicos, promedios_encuestas)
+        if finalistas is None:
+            finalistas = self.candidatos_segunda_vuelta or [partidos[j] for j in np.argsort(-prediccion_base)[:2]]
+        
+        secuencia = secuencia_semilla(self.semilla)
+        votos = np.concatenate(list(generar_simulaciones(
+            prediccion_base, self.margen_error_prediccion, secuencia, num_simulaciones, num_simulaciones,
+            modelo_ruido=self.modelo_ruido, covarianza=self.covarianza_ruido
+        )))
+        
+        # Las matrices muestreadas usan flujos por unidad propios de la semilla
+        generadores = generadores_por_unidad(secuencia_hija(secuencia, INDICE_FLUJO_AUXILIAR), num_simulaciones)
+        return simular_segunda_vuelta_lote(votos, partidos, finalistas, self.transferencia_votos,
+                                           self.abstencion_segunda_vuelta, concentracion, generadores, percentiles)
+    
+    def copiar(self) -> 'ModeloPredictivoElectoral':
+        """
+        Crea una copia independiente del modelo (datos, parámetros y resultados) para
+        calcular en otro hilo sin modificar este. La caché de predicciones se comparte.
+        """
+        return copy.deepcopy(self, {id(self.cache): self.cache})
+    
     def obtener_resultados(self) -> Dict[str, any]:
         """
         Obtiene todos los resultados de la predicción.
@@ -163,6 +732,7 @@ class ModeloPredictivoElectoral:
             'diputados_uninominales': self.diputados_uninominales_2025,
             'diputados_uninominales_por_depto': self.diputados_uninominales_por_depto_2025,
             'detalle_escanos': self.detalle_escanos_2025,
+            'resultado_escanos': self.resultado_escanos_2025,
             'segunda_vuelta': self.segunda_vuelta,
             'candidatos_segunda_vuelta': self.candidatos_segunda_vuelta,
             'prediccion_segunda_vuelta': self.prediccion_segunda_vuelta,
@@ -0,0 +1,178 @@
+"""
+Recuento incremental de resultados a medida que llegan nuevas actas
+"""
+import numpy as np
+from typing import Dict, List, Any
+
+from utils.actas_utils import ResultadosActas, normalizar_departamento
+from utils.electoral_utils import (
+    calcular_escanos_plurinominales, simular_escanos_uninominales,
+    simular_senadores_por_departamento, sumar_por_partido, verificar_segunda_vuelta
+)
+from config.settings import (
+    DEPARTAMENTOS_BOLIVIA, CIRCUNSCRIPCIONES_UNINOMINALES,
+    DIPUTADOS_PLURINOMINALES, UMBRAL_MINIMO_DEFAULT,
+    ASIGNACION_COMPENSATORIA
+)
+
+
+class RecuentoIncremental:
+    """
+    Mantiene las sumas de votos por departamento y partido y actualiza la asignación
+    de escaños solo en los departamentos afectados por cada lote de actas.
+
+    La asignación territorial (diputados uninominales y senadores por departamento) se
+    recalcula únicamente en los departamentos del lote; la lista nacional depende solo
+    del vector de totales por partido, cuyo costo no crece con el número de actas.
+    Los departamentos sin actas computadas todavía no reciben escaños territoriales.
+    """
+
+    def __init__(self, umbral_minimo: float = UMBRAL_MINIMO_DEFAULT):
+        self.umbral_minimo = umbral_minimo
+
+        self.departamentos: List[str] = list(DEPARTAMENTOS_BOLIVIA)
+        self.partidos: List[str] = []
+        self.votos = np.zeros((len(self.departamentos), 0), dtype=np.int64)
+        self.mesas = np.zeros(len(self.departamentos), dtype=np.int64)
+
+        # Asignaciones territoriales vigentes por departamento
+        self.diputados_uninominales_por_depto: Dict[str, Dict[str, int]] = {}
+        self.senadores_por_depto: Dict[str, Dict[str, int]] = {}
+
+        # Asignación nacional (la lista de diputados se recalcula con cada lote; los
+        # senadores son la suma de los departamentales)
+        self.prediccion_votos: Dict[str, float] = {}
+        self.diputados_plurinominales: Dict[str, int] = {}
+        self.senadores: Dict[str, int] = {}
+
+        self.departamentos_actualizados: List[str] = []
+
+    def _alinear(self, lote: ResultadosActas) -> np.ndarray:
+        """
+        Agrega a los acumuladores los partidos nuevos del lote y resuelve sus
+        departamentos contra DEPARTAMENTOS_BOLIVIA (ver normalizar_departamento).
+
+        Returns:
+            np.ndarray: Votos del lote reindexados a departamentos x partidos del recuento
+
+        Raises:
+            ValueError: Si el lote tiene departamentos desconocidos
+        """
+        departamentos = [normalizar_departamento(d) for d in lote.departamentos]
+        desconocidos = [str(d) for d, resuelto in zip(lote.departamentos, departamentos) if resuelto is None]
+        if desconocidos:
+            raise ValueError(f"El lote de actas tiene departamentos desconocidos: {', '.join(desconocidos)}.")
+
+        nuevos_partidos = [p for p in lote.partidos if p not in self.partidos]
+        if nuevos_partidos:
+            self.partidos.extend(nuevos_partidos)
+            self.votos = np.hstack([self.votos, np.zeros((self.votos.shape[0], len(nuevos_partidos)), dtype=np.int64)])
+
+        indice_depto = {d: i for i, d in enumerate(self.departamentos)}
+        indice_partido = {p: i for i, p in enumerate(self.partidos)}
+
+        delta = np.zeros(self.votos.shape, dtype=np.int64)
+        filas = [indice_depto[d] for d in departamentos]
+        columnas = [indice_partido[p] for p in lote.partidos]
+        np.add.at(delta, np.ix_(filas, columnas), lote.votos)
+        return delta
+
+    def aplicar_lote(self, lote: ResultadosActas) -> List[str]:
+        """
+        Suma un lote de actas y actualiza la asignación de escaños.
+
+        Args:
+            lote: Votos del lote por departamento y partido (ver cargar_actas_desde_csv)
+
+        Returns:
+            List[str]: Departamentos cuya asignación territorial se recalculó
+
+        Raises:
+            ValueError: Si el lote tiene departamentos desconocidos
+        """
+        delta = self._alinear(lote)
+        self.votos += delta
+
+        indice_depto = {d: i for i, d in enumerate(self.departamentos)}
+        for depto, mesas in zip(lote.departamentos, lote.mesas):
+            self.mesas[indice_depto[normalizar_departamento(depto)]] += mesas
+
+        afectados = [self.departamentos[i] for i in np.flatnonzero(delta.any(axis=1))]
+
+        # Porcentajes nacionales a partir de los totales por partido
+        totales = self.votos.sum(axis=0)
+        total = totales.sum()
+        self.prediccion_votos = ({p: float(v) for p, v in zip(self.partidos, totales / total * 100)}
+                                 if total > 0 else {})
+
+        # Asignación territorial: solo en los departamentos del lote
+        if afectados:
+            porcentajes = self._porcentajes_departamentos(afectados)
+            circunscripciones = {d: CIRCUNSCRIPCIONES_UNINOMINALES[d] for d in afectados
+                                 if d in CIRCUNSCRIPCIONES_UNINOMINALES}
+            self.diputados_uninominales_por_depto.update(
+                simular_escanos_uninominales(self.prediccion_votos, circunscripciones, porcentajes)
+            )
+            self.senadores_por_depto.update(
+                simular_senadores_por_departamento(
+                    self.prediccion_votos, porcentajes,
+                    [d for d in afectados if d in DEPARTAMENTOS_BOLIVIA]
+                )
+            )
+
+        # Lista nacional: solo depende de los totales por partido (y, en el sistema
+        # compensatorio, de los uninominales ya asignados)
+        self.diputados_plurinominales = calcular_escanos_plurinominales(
+            self.prediccion_votos, self.umbral_minimo, DIPUTADOS_PLURINOMINALES,
+            self._uninominales_por_partido() if ASIGNACION_COMPENSATORIA else None
+        )
+        self.senadores = sumar_por_partido(self.senadores_por_depto)
+
+        self.departamentos_actualizados = afectados
+        return afectados
+
+    def _uninominales_por_partido(self) -> Dict[str, int]:
+        """Suma los diputados uninominales vigentes de todos los departamentos."""
+        return sumar_por_partido(self.diputados_uninominales_por_depto)
+
+    def _porcentajes_departamentos(self, departamentos: List[str]) -> Dict[str, Dict[str, float]]:
+        """Calcula los porcentajes de votos de los departamentos indicados."""
+        porcentajes = {}
+        for depto in departamentos:
+            fila = self.votos[self.departamentos.index(depto)]
+            total = fila.sum()
+            if total > 0:
+                porcentajes[depto] = {p: float(v) for p, v in zip(self.partidos, fila / total * 100)}
+        return porcentajes
+
+    def obtener_detalle(self) -> Dict[str, Any]:
+        """
+        Obtiene el detalle de escaños con la misma estructura que obtener_detalle_escanos.
+
+        Returns:
+            Dict con el detalle completo de escaños del recuento actual
+        """
+        diputados_uninominales = self._uninominales_por_partido()
+
+        return {
+            'diputados_plurinominales': dict(self.diputados_plurinominales),
+            'diputados_uninominales': dict(diputados_uninominales),
+            'diputados_uninominales_por_depto': dict(self.diputados_uninominales_por_depto),
+            'senadores': dict(self.senadores),
+            'senadores_por_depto': dict(self.senadores_por_depto),
+            'total_diputados': {
+                partido: self.diputados_plurinominales.get(partido, 0) + diputados_uninominales.get(partido, 0)
+                for partido in set(self.diputados_plurinominales.keys()) | set(diputados_uninominales.keys())
+            }
+        }
+
+    def obtener_estado_segunda_vuelta(self):
+        """
+        Verifica la segunda vuelta con el recuento actual.
+
+        Returns:
+            Tuple[bool, List[str]]: (requiere_segunda_vuelta, candidatos)
+        """
+        if len(self.prediccion_votos) < 2:
+            return False, []
+        return verificar_segunda_vuelta(self.prediccion_votos)
@@ -0,0 +1,186 @@
+"""
+Representación matricial (partido x departamento) de los resultados de escaños
+"""
+import numpy as np
+from typing import Dict, List, Any, Optional, Sequence
+
+from config.settings import DEPARTAMENTOS_BOLIVIA
+
+
+class ResultadoEscanos:
+    """
+    Resultado de una asignación de escaños respaldado por arreglos enteros.
+
+    Los partidos y departamentos se identifican por su posición (id) en las listas
+    partidos y departamentos; las matrices territoriales tienen forma partidos x departamentos.
+    Las vistas en diccionario se generan a demanda para la interfaz.
+    """
+
+    def __init__(self, partidos: Sequence[str], departamentos: Sequence[str],
+                 votos: np.ndarray, plurinominales: np.ndarray, senadores: np.ndarray,
+                 uninominales: np.ndarray, senadores_por_depto: np.ndarray):
+        self.partidos = list(partidos)
+        self.departamentos = list(departamentos)
+        self.indice_partido = {p: i for i, p in enumerate(self.partidos)}
+        self.indice_departamento = {d: i for i, d in enumerate(self.departamentos)}
+
+        self.votos = np.asarray(votos, dtype=float)
+        self.plurinominales = np.asarray(plurinominales, dtype=np.int64)
+        self.senadores = np.asarray(senadores, dtype=np.int64)
+        self.uninominales = np.asarray(uninominales, dtype=np.int64)
+        self.senadores_por_depto = np.asarray(senadores_por_depto, dtype=np.int64)
+
+    @classmethod
+    def desde_detalle(cls, prediccion_votos: Dict[str, float], detalle: Dict[str, Any],
+                      departamentos: Optional[Sequence[str]] = None) -> 'ResultadoEscanos':
+        """
+        Construye el resultado a partir del detalle de obtener_detalle_escanos.
+
+        Args:
+            prediccion_votos: Predicción de votos por partido
+            detalle: Detalle de escaños en diccionarios
+            departamentos: Orden de los departamentos (por defecto, DEPARTAMENTOS_BOLIVIA)
+
+        Returns:
+            ResultadoEscanos: Resultado con los arreglos de escaños
+        """
+        departamentos = list(departamentos or DEPARTAMENTOS_BOLIVIA)
+
+        # Partidos de la predicción primero y luego cualquier otro presente en el detalle
+        partidos = list(prediccion_votos.keys())
+        for clave in ('diputados_plurinominales', 'diputados_uninominales', 'senadores'):
+            partidos.extend(p for p in detalle.get(clave, {}) if p not in partidos)
+        indice_partido = {p: i for i, p in enumerate(partidos)}
+        indice_departamento = {d: i for i, d in enumerate(departamentos)}
+
+        def vector(valores: Dict[str, float], dtype) -> np.ndarray:
+            arreglo = np.zeros(len(partidos), dtype=dtype)
+            for partido, valor in valores.items():
+                arreglo[indice_partido[partido]] = valor
+            return arreglo
+
+        def matriz(por_depto: Dict[str, Dict[str, int]]) -> np.ndarray:
+            arreglo = np.zeros((len(partidos), len(departamentos)), dtype=np.int64)
+            for depto, escanos in por_depto.items():
+                for partido, valor in escanos.items():
+                    arreglo[indice_partido[partido], indice_departamento[depto]] = valor
+            return arreglo
+
+        return cls(
+            partidos=partidos,
+            departamentos=departamentos,
+            votos=vector(prediccion_votos, float),
+            plurinominales=vector(detalle.get('diputados_plurinominales', {}), np.int64),
+            senadores=vector(detalle.get('senadores', {}), np.int64),
+            uninominales=matriz(detalle.get('diputados_uninominales_por_depto', {})),
+            senadores_por_depto=matriz(detalle.get('senadores_por_depto', {}))
+        )
+
+    @property
+    def uninominales_totales(self) -> np.ndarray:
+        """Diputados uninominales por partido."""
+        return self.uninominales.sum(axis=1)
+
+    @property
+    def total_diputados(self) -> np.ndarray:
+        """Diputados (plurinominales + uninominales) por partido."""
+        return self.plurinominales + self.uninominales_totales
+
+    @property
+    def total_escanos(self) -> np.ndarray:
+        """Escaños totales (senadores + diputados) por partido."""
+        return self.senadores + self.total_diputados
+
+    def alinear(self, partidos: Sequence[str]) -> 'ResultadoEscanos':
+        """
+        Reindexa el resultado a otro orden de partidos (los ausentes quedan en cero).
+
+        Args:
+            partidos: Orden de partidos de destino
+
+        Returns:
+            ResultadoEscanos: Resultado con las filas en el orden indicado
+        """
+        partidos = list(partidos)
+        origen = np.array([self.indice_partido.get(p, -1) for p in partidos], dtype=np.int64)
+        presentes = origen >= 0
+
+        def reindexar(arreglo: np.ndarray) -> np.ndarray:
+            nuevo = np.zeros((len(partidos),) + arreglo.shape[1:], dtype=arreglo.dtype)
+            nuevo[presentes] = arreglo[origen[presentes]]
+            return nuevo
+
+        return ResultadoEscanos(partidos, self.departamentos, reindexar(self.votos),
+                                reindexar(self.plurinominales), reindexar(self.senadores),
+                                reindexar(self.uninominales), reindexar(self.senadores_por_depto))
+
+    @staticmethod
+    def apilar(resultados: Sequence['ResultadoEscanos']) -> Dict[str, Any]:
+        """
+        Apila varios escenarios sobre un mismo orden de partidos para compararlos.
+
+        Args:
+            resultados: Resultados de distintos escenarios (con los mismos departamentos)
+
+        Returns:
+            Dict con 'partidos', 'departamentos' y arreglos con el escenario como primer eje
+        """
+        partidos = list(dict.fromkeys(p for r in resultados for p in r.partidos))
+        alineados = [r.alinear(partidos) for r in resultados]
+        return {
+            'partidos': partidos,
+            'departamentos': alineados[0].departamentos if alineados else [],
+            'votos': np.stack([r.votos for r in alineados]),
+            'plurinominales': np.stack([r.plurinominales for r in alineados]),
+            'senadores': np.stack([r.senadores for r in alineados]),
+            'uninominales': np.stack([r.uninominales for r in alineados]),
+            'senadores_por_depto': np.stack([r.senadores_por_depto for r in alineados])
+        }
+
+    def _vista(self, valores: np.ndarray) -> Dict[str, int]:
+        """Vista en diccionario de un vector por partido, omitiendo los ceros."""
+        return {self.partidos[i]: int(valores[i]) for i in np.flatnonzero(valores)}
+
+    def _vista_por_depto(self, matriz: np.ndarray) -> Dict[str, Dict[str, int]]:
+        """Vista en diccionario {departamento: {partido: escaños}} de una matriz."""
+        return {depto: self._vista(matriz[:, j]) for j, depto in enumerate(self.departamentos)}
+
+    def como_detalle(self) -> Dict[str, Any]:
+        """
+        Obtiene la vista en diccionarios con la estructura de obtener_detalle_escanos.
+
+        Returns:
+            Dict con el detalle completo de escaños
+        """
+        return {
+            'diputados_plurinominales': self._vista(self.plurinominales),
+            'diputados_uninominales': self._vista(self.uninominales_totales),
+            'diputados_uninominales_por_depto': self._vista_por_depto(self.uninominales),
+            'senadores': self._vista(self.senadores),
+            'senadores_por_depto': self._vista_por_depto(self.senadores_por_depto),
+            'total_diputados': self._vista(self.total_diputados)
+        }
+
+    def resumen_partido(self, partido: str) -> Dict[str, Any]:
+        """
+        Obtiene los votos y escaños de un partido, incluidos los uninominales por departamento.
+
+        Args:
+            partido: Nombre del partido
+
+        Returns:
+            Dict con los datos del partido (vacío si no existe)
+        """
+        i = self.indice_partido.get(partido)
+        if i is None:
+            return {}
+        return {
+            'votos': float(self.votos[i]),
+            'senadores': int(self.senadores[i]),
+            'diputados': int(self.total_diputados[i]),
+            'diputados_plurinominales': int(self.plurinominales[i]),
+            'diputados_uninominales': int(self.uninominales_totales[i]),
+            'uninominales_por_depto': {
+                self.departamentos[j]: int(self.uninominales[i, j]) for j in np.flatnonzero(self.uninominales[i])
+            }
+        }
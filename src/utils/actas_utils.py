@@ -0,0 +1,154 @@
+"""
+Utilidades para la carga por bloques de resultados a nivel de mesa (actas de escrutinio)
+"""
+import unicodedata
+import numpy as np
+import pandas as pd
+from dataclasses import dataclass
+from typing import Dict, List, Optional
+
+from config.settings import DEPARTAMENTOS_BOLIVIA
+
+# Columnas del acta que no corresponden a votos de partidos
+COLUMNAS_METADATOS_ACTA = {
+    'Departamento', 'Provincia', 'Municipio', 'Localidad', 'Recinto', 'Mesa', 'Codigo Mesa',
+    'Circunscripcion', 'Inscritos', 'Blancos', 'Nulos', 'Emitidos'
+}
+
+
+def _clave_departamento(nombre: str) -> str:
+    """Clave de comparación de un departamento: sin tildes, mayúsculas ni espacios extra."""
+    descompuesto = unicodedata.normalize('NFD', nombre)
+    sin_tildes = "".join(c for c in descompuesto if not unicodedata.combining(c))
+    return " ".join(sin_tildes.casefold().split())
+
+
+_DEPARTAMENTOS_POR_CLAVE = {_clave_departamento(d): d for d in DEPARTAMENTOS_BOLIVIA}
+
+
+def normalizar_departamento(nombre) -> Optional[str]:
+    """
+    Resuelve un nombre de departamento del acta contra DEPARTAMENTOS_BOLIVIA, sin
+    distinguir mayúsculas, tildes ni espacios (por ejemplo, 'POTOSI ' -> 'Potosí').
+
+    Args:
+        nombre: Nombre escrito en el acta
+
+    Returns:
+        Optional[str]: Nombre oficial del departamento, o None si no se reconoce o está vacío
+    """
+    if pd.isna(nombre):
+        return None
+    return _DEPARTAMENTOS_POR_CLAVE.get(_clave_departamento(str(nombre)))
+
+
+@dataclass
+class ResultadosActas:
+    """
+    Votos acumulados por departamento y partido a partir de las actas de mesa.
+    """
+    departamentos: List[str]
+    partidos: List[str]
+    votos: np.ndarray
+    mesas: np.ndarray
+
+    def votos_nacionales(self) -> np.ndarray:
+        """Obtiene el total nacional de votos por partido."""
+        return self.votos.sum(axis=0)
+
+    def porcentajes_nacionales(self) -> Dict[str, float]:
+        """
+        Obtiene los porcentajes nacionales de votos válidos por partido.
+
+        Returns:
+            Dict[str, float]: Porcentaje de votos por partido
+        """
+        totales = self.votos_nacionales()
+        total = totales.sum()
+        if total == 0:
+            return {p: 0.0 for p in self.partidos}
+        return {p: float(v) for p, v in zip(self.partidos, totales / total * 100)}
+
+    def porcentajes_por_departamento(self) -> Dict[str, Dict[str, float]]:
+        """
+        Obtiene los porcentajes de votos válidos por departamento y partido.
+        Los departamentos sin actas computadas se omiten.
+
+        Returns:
+            Dict[str, Dict[str, float]]: Porcentajes por departamento y partido
+        """
+        totales = self.votos.sum(axis=1, keepdims=True)
+        porcentajes = np.divide(self.votos * 100.0, totales, out=np.zeros(self.votos.shape), where=totales > 0)
+        return {
+            depto: dict(zip(self.partidos, fila))
+            for depto, fila, total in zip(self.departamentos, porcentajes.tolist(), totales[:, 0])
+            if total > 0
+        }
+
+
+def cargar_actas_desde_csv(file_path: str, tamano_bloque: int = 100000) -> ResultadosActas:
+    """
+    Carga un archivo CSV de actas por mesa acumulando los votos por departamento.
+
+    El archivo se lee por bloques de tamano_bloque filas y solo se conservan los
+    acumuladores departamento x partido, por lo que la memoria no depende del número de mesas.
+    Cada columna que no sea de metadatos (ver COLUMNAS_METADATOS_ACTA) se considera un partido.
+    Los departamentos se resuelven con normalizar_departamento.
+
+    Args:
+        file_path: Ruta del archivo CSV
+        tamano_bloque: Número de filas (mesas) leídas por bloque
+
+    Returns:
+        ResultadosActas: Votos acumulados por departamento y partido
+
+    Raises:
+        ValueError: Si el formato del archivo es incorrecto o alguna mesa tiene un
+            departamento vacío o desconocido
+        Exception: Si hay error al cargar el archivo
+    """
+    try:
+        columnas = pd.read_csv(file_path, nrows=0).columns
+        if 'Departamento' not in columnas:
+            raise ValueError("El archivo de actas debe contener una columna llamada 'Departamento'.")
+
+        partidos = [col for col in columnas if col not in COLUMNAS_METADATOS_ACTA]
+        if not partidos:
+            raise ValueError("El archivo de actas no contiene columnas de votos por partido.")
+
+        departamentos = list(DEPARTAMENTOS_BOLIVIA)
+        votos = np.zeros((len(departamentos), len(partidos)), dtype=np.int64)
+        mesas = np.zeros(len(departamentos), dtype=np.int64)
+
+        for bloque in pd.read_csv(file_path, usecols=['Departamento'] + partidos, chunksize=tamano_bloque):
+            # Cada nombre distinto del bloque se resuelve una sola vez
+            originales = bloque['Departamento']
+            resueltos = {nombre: normalizar_departamento(nombre) for nombre in originales.dropna().unique()}
+            nombres = originales.map(resueltos)
+
+            invalidos = nombres.isna()
+            if invalidos.any():
+                desconocidos = sorted({f"'{n}'" for n in originales[invalidos].dropna()})
+                vacios = int(originales.isna().sum())
+                # El índice del bloque cuenta las filas de datos desde el inicio del archivo
+                fila = int(invalidos.idxmax()) + 2
+                detalle = []
+                if desconocidos:
+                    detalle.append(f"desconocidos: {', '.join(desconocidos)}")
+                if vacios:
+                    detalle.append(f"mesas sin departamento: {vacios}")
+                raise ValueError(f"El archivo de actas tiene departamentos no válidos ({'; '.join(detalle)}), "
+                                 f"a partir de la línea {fila}. Se esperaban: {', '.join(DEPARTAMENTOS_BOLIVIA)}.")
+
+            codigos = pd.Categorical(nombres, categories=departamentos).codes
+            suma_bloque = bloque[partidos].fillna(0).astype(np.int64).groupby(codigos).sum()
+            votos[suma_bloque.index.to_numpy()] += suma_bloque.to_numpy()
+            mesas += np.bincount(codigos, minlength=len(departamentos))
+
+        return ResultadosActas(departamentos=departamentos, partidos=[str(p) for p in partidos],
+                               votos=votos, mesas=mesas)
+
+    except ValueError as ve:
+        raise ve
+    except Exception as e:
+        raise Exception(f"No se pudo cargar el archivo de actas: {e}")
@@ -0,0 +1,89 @@
+"""
+Utilidades para generar números aleatorios reproducibles y divisibles en flujos independientes
+"""
+import numpy as np
+from typing import Iterator, Optional, Union
+
+# Las simulaciones se agrupan en unidades de tamaño fijo, cada una con su propio flujo
+# aleatorio; así el resultado no depende del tamaño de bloque ni del número de procesos.
+SIMULACIONES_POR_UNIDAD = 1000
+
+# Hijo de la secuencia raíz reservado para los flujos auxiliares (por ejemplo, las matrices de
+# transferencia de segunda vuelta); las unidades de simulación nunca llegan a este índice
+INDICE_FLUJO_AUXILIAR = 2 ** 32
+
+Semilla = Union[None, int, np.random.SeedSequence, np.random.Generator]
+
+
+def secuencia_semilla(semilla: Semilla) -> np.random.SeedSequence:
+    """
+    Obtiene la SeedSequence de la que se derivan los flujos independientes.
+
+    Args:
+        semilla: Entero, SeedSequence, Generator (se deriva un hijo con spawn) o None
+            (entropía nueva del sistema operativo)
+
+    Returns:
+        np.random.SeedSequence: Secuencia raíz
+    """
+    if isinstance(semilla, np.random.SeedSequence):
+        return semilla
+    if isinstance(semilla, np.random.Generator):
+        return semilla.bit_generator.seed_seq.spawn(1)[0]
+    return np.random.SeedSequence(semilla)
+
+
+def secuencia_hija(secuencia: np.random.SeedSequence, indice: int) -> np.random.SeedSequence:
+    """
+    Obtiene el hijo número indice de una SeedSequence sin modificar su estado.
+
+    Es la misma secuencia que devolvería secuencia.spawn(indice + 1)[indice] sobre una
+    secuencia recién creada, pero no depende de cuántos hijos se hayan generado antes,
+    por lo que cada proceso puede derivar sus flujos por su cuenta.
+
+    Args:
+        secuencia: Secuencia raíz
+        indice: Índice del hijo
+
+    Returns:
+        np.random.SeedSequence: Secuencia hija
+    """
+    return np.random.SeedSequence(secuencia.entropy, spawn_key=secuencia.spawn_key + (indice,),
+                                  pool_size=secuencia.pool_size)
+
+
+def generador_desde(semilla: Semilla) -> np.random.Generator:
+    """
+    Obtiene un Generator a partir de una semilla (un Generator se devuelve tal cual).
+
+    Args:
+        semilla: Entero, SeedSequence, Generator o None
+
+    Returns:
+        np.random.Generator: Generador aleatorio
+    """
+    if isinstance(semilla, np.random.Generator):
+        return semilla
+    return np.random.default_rng(semilla)
+
+
+def generadores_por_unidad(secuencia: np.random.SeedSequence, num_simulaciones: int,
+                           unidad_inicio: int = 0,
+                           unidad_fin: Optional[int] = None) -> Iterator[tuple]:
+    """
+    Recorre las unidades de simulación con su generador independiente.
+
+    Args:
+        secuencia: Secuencia raíz
+        num_simulaciones: Número total de simulaciones
+        unidad_inicio: Primera unidad a recorrer
+        unidad_fin: Unidad final (excluida); por defecto, la última
+
+    Returns:
+        Iterator[tuple]: (generador, número de simulaciones de la unidad)
+    """
+    total_unidades = -(-num_simulaciones // SIMULACIONES_POR_UNIDAD)
+    unidad_fin = total_unidades if unidad_fin is None else min(unidad_fin, total_unidades)
+    for unidad in range(unidad_inicio, unidad_fin):
+        tamano = min(SIMULACIONES_POR_UNIDAD, num_simulaciones - unidad * SIMULACIONES_POR_UNIDAD)
+        yield np.random.default_rng(secuencia_hija(secuencia, unidad)), tamano
@@ -6,6 +6,7 @@ import numpy as np
 from typing import Dict, List, Tuple
 from collections import defaultdict
 from config.settings import FIGURE_SIZE, DPI
+from utils.partidos_utils import normalizar_nombre
 import random
 import hashlib
 
@@ -23,13 +24,16 @@ EXTRA_COLORS = [
     '#455a64', '#d4e157', '#6d4c41', '#0288d1', '#cddc39',
 ]
 
+# Colores indexados por nombre normalizado ('APB-SÚMATE' y 'APB-Súmate' comparten color)
+_PARTY_COLORS_NORMALIZADOS = {normalizar_nombre(p): c for p, c in PARTY_COLORS.items()}
+
 def get_party_colors(parties):
     colors = []
     used = set(PARTY_COLORS.keys())
     extra_idx = 0
     for p in parties:
-        if p in PARTY_COLORS:
-            colors.append(PARTY_COLORS[p])
+        if normalizar_nombre(p) in _PARTY_COLORS_NORMALIZADOS:
+            colors.append(_PARTY_COLORS_NORMALIZADOS[normalizar_nombre(p)])
         else:
             hash_idx = int(hashlib.md5(p.encode()).hexdigest(), 16) % len(EXTRA_COLORS)
             colors.append(EXTRA_COLORS[hash_idx])
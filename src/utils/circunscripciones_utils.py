@@ -0,0 +1,254 @@
+"""
+Circunscripciones uninominales: datos por circunscripción y elección por mayoría simple
+"""
+import os
+import numpy as np
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import List, Optional, Sequence, Tuple
+
+from config.settings import (CIRCUNSCRIPCIONES_UNINOMINALES, DIPUTADOS_UNINOMINALES,
+                             DISPERSION_CIRCUNSCRIPCIONES, SEMILLA_CIRCUNSCRIPCIONES)
+from utils.partidos_utils import RegistroPartidos
+
+ARCHIVO_CIRCUNSCRIPCIONES = os.path.join(os.path.dirname(__file__), '..', 'data', 'circunscripciones.csv')
+
+# Columnas del archivo de circunscripciones que no corresponden a partidos
+COLUMNAS_ID_CIRCUNSCRIPCION = ['Circunscripcion', 'Departamento']
+
+
+@dataclass
+class Circunscripciones:
+    """
+    Circunscripciones uninominales con su departamento y, si se conocen, los porcentajes
+    de votos por partido en cada una (NaN en las filas sin datos propios).
+    """
+    numeros: np.ndarray
+    departamentos: List[str]
+    partidos: List[str]
+    porcentajes: np.ndarray
+
+    @property
+    def num_circunscripciones(self) -> int:
+        return len(self.departamentos)
+
+    def de_departamentos(self, departamentos: Sequence[str]) -> 'Circunscripciones':
+        """
+        Obtiene las circunscripciones que pertenecen a los departamentos indicados.
+
+        Args:
+            departamentos: Departamentos a conservar
+
+        Returns:
+            Circunscripciones: Subconjunto de las filas, en el mismo orden
+        """
+        incluidos = set(departamentos)
+        filas = np.array([d in incluidos for d in self.departamentos], dtype=bool)
+        return Circunscripciones(
+            numeros=self.numeros[filas],
+            departamentos=[d for d, incluida in zip(self.departamentos, filas) if incluida],
+            partidos=self.partidos,
+            porcentajes=self.porcentajes[filas]
+        )
+
+    def indices_departamento(self, departamentos: Sequence[str]) -> np.ndarray:
+        """
+        Obtiene, para cada circunscripción, la posición de su departamento en departamentos.
+
+        Args:
+            departamentos: Departamentos en el orden de la matriz departamental
+
+        Returns:
+            np.ndarray: Índice de departamento por circunscripción (-1 si no está)
+        """
+        indice = {d: i for i, d in enumerate(departamentos)}
+        return np.array([indice.get(d, -1) for d in self.departamentos], dtype=np.int64)
+
+    def porcentajes_alineados(self, partidos: Sequence[str]) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Reordena los porcentajes propios de cada circunscripción según partidos.
+
+        Args:
+            partidos: Partidos en el orden de las columnas de la simulación
+
+        Returns:
+            Tuple[np.ndarray, np.ndarray]: (máscara de circunscripciones con datos propios,
+                matriz circunscripciones x partidos con sus porcentajes)
+        """
+        alineados = np.zeros((self.num_circunscripciones, len(partidos)))
+        indice = {p: i for i, p in enumerate(self.partidos)}
+        for j, partido in enumerate(partidos):
+            if partido in indice:
+                alineados[:, j] = self.porcentajes[:, indice[partido]]
+        con_datos = ~np.isnan(self.porcentajes).all(axis=1) if self.partidos else \
+            np.zeros(self.num_circunscripciones, dtype=bool)
+        return con_datos, np.nan_to_num(alineados, nan=0.0)
+
+
+def cargar_circunscripciones(file_path: str = ARCHIVO_CIRCUNSCRIPCIONES) -> Circunscripciones:
+    """
+    Carga las circunscripciones uninominales desde un archivo CSV con las columnas
+    'Circunscripcion' y 'Departamento'. Las demás columnas son los porcentajes de cada
+    partido en la circunscripción (por ejemplo, del cómputo por circunscripción); sus
+    nombres se resuelven con los alias de partidos y las celdas vacías quedan como NaN.
+
+    Args:
+        file_path: Ruta del archivo CSV
+
+    Returns:
+        Circunscripciones: Circunscripciones del archivo
+
+    Raises:
+        ValueError: Si faltan columnas, las circunscripciones no están numeradas de 1 a
+            DIPUTADOS_UNINOMINALES, su número por departamento no coincide con
+            CIRCUNSCRIPCIONES_UNINOMINALES, hay partidos repetidos o algún porcentaje es
+            negativo
+    """
+    import pandas as pd
+
+    df = pd.read_csv(file_path)
+    faltantes = [col for col in COLUMNAS_ID_CIRCUNSCRIPCION if col not in df.columns]
+    if faltantes:
+        raise ValueError(f"El archivo de circunscripciones debe contener las columnas: {', '.join(faltantes)}.")
+
+    numeros = pd.to_numeric(df['Circunscripcion'], errors='coerce').to_numpy(dtype=float)
+    if sorted(numeros.tolist()) != list(range(1, DIPUTADOS_UNINOMINALES + 1)):
+        raise ValueError(f"Las circunscripciones deben estar numeradas de 1 a {DIPUTADOS_UNINOMINALES} sin repetirse.")
+
+    departamentos = df['Departamento'].astype(str).str.strip().tolist()
+    conteo = pd.Series(departamentos).value_counts().to_dict()
+    if conteo != CIRCUNSCRIPCIONES_UNINOMINALES:
+        raise ValueError("El número de circunscripciones por departamento del archivo no coincide "
+                         "con CIRCUNSCRIPCIONES_UNINOMINALES.")
+
+    columnas = [col for col in df.columns if col not in COLUMNAS_ID_CIRCUNSCRIPCION]
+    registro = RegistroPartidos()
+    partidos = [registro.canonico(str(col).strip()) for col in columnas]
+    if len(set(partidos)) != len(partidos):
+        raise ValueError("El archivo de circunscripciones tiene partidos repetidos.")
+
+    porcentajes = df[columnas].apply(pd.to_numeric, errors='coerce').to_numpy(dtype=float)
+    porcentajes = porcentajes.reshape(len(df), len(columnas))
+    if np.any(porcentajes < 0):
+        raise ValueError("Los porcentajes por circunscripción no pueden ser negativos.")
+
+    return Circunscripciones(
+        numeros=numeros.astype(np.int64),
+        departamentos=departamentos,
+        partidos=partidos,
+        porcentajes=porcentajes
+    )
+
+
+@lru_cache(maxsize=1)
+def obtener_circunscripciones() -> Circunscripciones:
+    """Obtiene las circunscripciones del archivo por defecto (se lee una sola vez)."""
+    return cargar_circunscripciones()
+
+
+@lru_cache(maxsize=32)
+def desviaciones_locales(num_partidos: int, dispersion: float,
+                         semilla: int = SEMILLA_CIRCUNSCRIPCIONES) -> np.ndarray:
+    """
+    Factores sintéticos de variación local de cada partido en cada circunscripción
+    respecto de su departamento: exp(dispersion * z), con z normal estándar.
+
+    Solo se usan si se activa DISPERSION_CIRCUNSCRIPCIONES y la circunscripción no tiene
+    porcentajes propios. Los factores se generan en una sola extracción con la semilla
+    para todas las circunscripciones (la fila i es la circunscripción i + 1), así que
+    dependen únicamente del número y del orden de las columnas.
+
+    Args:
+        num_partidos: Número de partidos (columnas)
+        dispersion: Desviación estándar del logaritmo del factor (0: sin variación local)
+        semilla: Semilla de la extracción
+
+    Returns:
+        np.ndarray: Matriz circunscripciones x partidos con los factores (solo lectura)
+    """
+    if dispersion > 0:
+        normales = np.random.default_rng(semilla).standard_normal((DIPUTADOS_UNINOMINALES, num_partidos))
+        desviaciones = np.exp(dispersion * normales)
+    else:
+        desviaciones = np.ones((DIPUTADOS_UNINOMINALES, num_partidos))
+    desviaciones.setflags(write=False)
+    return desviaciones
+
+
+def porcentajes_circunscripciones_lote(porcentajes_depto: np.ndarray, partidos: Sequence[str],
+                                       departamentos: Sequence[str],
+                                       circunscripciones: Optional[Circunscripciones] = None,
+                                       dispersion: float = DISPERSION_CIRCUNSCRIPCIONES) -> np.ndarray:
+    """
+    Obtiene los porcentajes por circunscripción a partir de los porcentajes departamentales.
+
+    Las circunscripciones con porcentajes propios en el archivo los usan tal cual en
+    todas las simulaciones. Las demás toman el vector de su departamento, multiplicado
+    por las desviaciones locales sintéticas solo si dispersion es mayor que 0.
+
+    Args:
+        porcentajes_depto: Tensor simulaciones x departamentos x partidos
+        partidos: Partidos en el orden de la última dimensión
+        departamentos: Departamentos en el orden de la segunda dimensión
+        circunscripciones: Circunscripciones (por defecto, las del archivo de datos)
+        dispersion: Ver desviaciones_locales
+
+    Returns:
+        np.ndarray: Tensor simulaciones x circunscripciones x partidos (en %)
+    """
+    circunscripciones = circunscripciones or obtener_circunscripciones()
+    porcentajes_depto = np.asarray(porcentajes_depto, dtype=float)
+    if porcentajes_depto.ndim == 2:
+        porcentajes_depto = porcentajes_depto[None]
+
+    indices = circunscripciones.indices_departamento(departamentos)
+    if np.any(indices < 0):
+        faltantes = sorted({d for d, i in zip(circunscripciones.departamentos, indices) if i < 0})
+        raise ValueError(f"No hay porcentajes para los departamentos: {', '.join(faltantes)}.")
+
+    porcentajes = porcentajes_depto[:, indices, :]
+    if dispersion > 0:
+        desviaciones = desviaciones_locales(len(partidos), float(dispersion))
+        porcentajes = porcentajes * desviaciones[circunscripciones.numeros - 1]
+    totales = porcentajes.sum(axis=2, keepdims=True)
+    porcentajes = np.divide(porcentajes * 100, totales, out=np.zeros_like(porcentajes), where=totales > 0)
+
+    con_datos, propios = circunscripciones.porcentajes_alineados(partidos)
+    if con_datos.any():
+        porcentajes[:, con_datos, :] = propios[con_datos]
+    return porcentajes
+
+
+def ganadores_circunscripciones(porcentajes: np.ndarray) -> np.ndarray:
+    """
+    Elige por mayoría simple al ganador de cada circunscripción (argmax sobre partidos;
+    los empates se resuelven a favor del partido de menor índice).
+
+    Args:
+        porcentajes: Tensor simulaciones x circunscripciones x partidos
+
+    Returns:
+        np.ndarray: Matriz simulaciones x circunscripciones con el índice del partido ganador
+    """
+    return np.argmax(porcentajes, axis=-1)
+
+
+def contar_ganadores(ganadores: np.ndarray, grupos: np.ndarray, num_grupos: int,
+                     num_partidos: int) -> np.ndarray:
+    """
+    Cuenta las circunscripciones ganadas por partido dentro de cada grupo (departamento).
+
+    Args:
+        ganadores: Matriz simulaciones x circunscripciones con el partido ganador
+        grupos: Grupo de cada circunscripción
+        num_grupos: Número de grupos
+        num_partidos: Número de partidos
+
+    Returns:
+        np.ndarray: Tensor simulaciones x grupos x partidos con las circunscripciones ganadas
+    """
+    ganadores = np.atleast_2d(ganadores)
+    num_simulaciones = ganadores.shape[0]
+    indices = (np.arange(num_simulaciones)[:, None] * num_grupos + grupos[None, :]) * num_partidos + ganadores
+    conteo = np.bincount(indices.ravel(), minlength=num_simulaciones * num_grupos * num_partidos)
+    return conteo.reshape(num_simulaciones, num_grupos, num_partidos)
@@ -1,13 +1,26 @@
 """
 Utilidades para cálculos electorales
 """
+import time
 from collections import defaultdict
-from typing import Dict, List, Tuple, Any
+from typing import Dict, List, Tuple, Any, Iterable, Optional, Sequence
+
+import numpy as np
+
 from config.settings import (
     DIPUTADOS_UNINOMINALES, DIPUTADOS_PLURINOMINALES,
     CIRCUNSCRIPCIONES_UNINOMINALES, DEPARTAMENTOS_BOLIVIA,
-    SENADORES_POR_DEPARTAMENTO
+    SENADORES_POR_DEPARTAMENTO, TOTAL_SENADORES, TOTAL_DIPUTADOS,
+    ASIGNACION_COMPENSATORIA, METODO_REPARTO_DEFAULT, OPCIONES_METODO_REPARTO, UMBRAL_MINIMO_DEFAULT,
+    ABSTENCION_SEGUNDA_VUELTA_DEFAULT
+)
+from utils.circunscripciones_utils import (
+    Circunscripciones, obtener_circunscripciones, porcentajes_circunscripciones_lote,
+    ganadores_circunscripciones, contar_ganadores
 )
+from utils.reparto_utils import repartir, repartir_lote, repartir_divisores_lote
+from utils.segunda_vuelta_utils import TransferenciaVotos, transferir_votos_lote
+from utils.variacion_regional_utils import VariacionRegional, obtener_variacion_regional
 
 
 def verificar_segunda_vuelta(votos: Dict[str, float]) -> Tuple[bool, List[str]]:
@@ -35,46 +48,119 @@ def verificar_segunda_vuelta(votos: Dict[str, float]) -> Tuple[bool, List[str]]:
     return True, [votos_ordenados[0][0], votos_ordenados[1][0]]
 
 
-def calcular_dhondt(votos_partidos: Dict[str, float], total_escanos: int) -> Dict[str, int]:
+def verificar_segunda_vuelta_lote(votos: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Verifica las reglas de segunda vuelta de verificar_segunda_vuelta para una matriz de
+    simulaciones: los dos primeros de cada fila se obtienen con np.argpartition (sin
+    ordenar todos los partidos). Los empates entre los dos primeros pueden resolverse
+    en otro orden que en verificar_segunda_vuelta.
+    
+    Args:
+        votos: Matriz simulaciones x partidos con los porcentajes de votos
+        
+    Returns:
+        Tuple[np.ndarray, np.ndarray]: (vector booleano con True si la simulación requiere
+            segunda vuelta, matriz simulaciones x 2 con las columnas del primer y segundo lugar)
+        
+    Raises:
+        ValueError: Si hay menos de dos partidos
+    """
+    votos = np.atleast_2d(np.asarray(votos, dtype=float))
+    if votos.shape[1] < 2:
+        raise ValueError("La verificación de segunda vuelta requiere al menos dos partidos.")
+    
+    # Con kth = p - 2 la última columna queda con el mayor y la penúltima con el segundo
+    num_partidos = votos.shape[1]
+    finalistas = np.argpartition(votos, num_partidos - 2, axis=1)[:, [num_partidos - 1, num_partidos - 2]]
+    primero, segundo = np.take_along_axis(votos, finalistas, axis=1).T
+    gana_primera_vuelta = (primero > 50.0) | ((primero >= 40.0) & (primero - segundo >= 10.0))
+    return ~gana_primera_vuelta, finalistas
+
+
+def probabilidades_segunda_vuelta(votos: np.ndarray, partidos: Sequence[str]) -> Dict[str, Any]:
+    """
+    Resume verificar_segunda_vuelta_lote sobre muchas simulaciones.
+    
+    Args:
+        votos: Matriz simulaciones x partidos con los porcentajes de votos
+        partidos: Partidos en el orden de las columnas
+        
+    Returns:
+        Dict con la probabilidad de segunda vuelta, la de ganar en primera vuelta por
+        partido y la de cada pareja de finalistas (clave (partido, partido) en el orden
+        de las columnas; solo parejas con probabilidad positiva)
+    """
+    requiere, finalistas = verificar_segunda_vuelta_lote(votos)
+    num_simulaciones = len(requiere)
+    num_partidos = len(partidos)
+    
+    ganadores = np.bincount(finalistas[~requiere, 0], minlength=num_partidos) / num_simulaciones
+    parejas = np.sort(finalistas[requiere], axis=1)
+    conteo_parejas = np.bincount(parejas[:, 0] * num_partidos + parejas[:, 1],
+                                 minlength=num_partidos * num_partidos) / num_simulaciones
+    
+    return {
+        'num_simulaciones': num_simulaciones,
+        'prob_segunda_vuelta': float(requiere.mean()),
+        'prob_primera_vuelta': {p: float(ganadores[j]) for j, p in enumerate(partidos)},
+        'prob_parejas': {
+            (partidos[codigo // num_partidos], partidos[codigo % num_partidos]): float(conteo_parejas[codigo])
+            for codigo in np.flatnonzero(conteo_parejas)
+        }
+    }
+
+
+def calcular_dhondt(votos_partidos: Dict[str, float], total_escanos: int,
+                    escanos_previos: Optional[Dict[str, int]] = None) -> Dict[str, int]:
     """
-    Implementa el método D'Hondt para la asignación de escaños.
+    Implementa el método D'Hondt para la asignación de escaños usando una cola de prioridad
+    (ver utils.reparto_utils.repartir).
     
     Args:
         votos_partidos: Diccionario con los votos normalizados por partido
         total_escanos: Número total de escaños a distribuir
+        escanos_previos: Escaños que cada partido ya tiene (por ejemplo, uninominales en el
+            sistema compensatorio); sus divisores empiezan en escanos_previos + 1
         
     Returns:
         Dict[str, int]: Diccionario con los escaños asignados por partido
     """
-    escanos = defaultdict(int)
-    cocientes = {}
+    return repartir(votos_partidos, total_escanos, "D'Hondt", escanos_previos)
 
-    for partido, votos in votos_partidos.items():
-        cocientes[partido] = votos / 1
 
-    for _ in range(total_escanos):
-        if not cocientes:
-            break
-
-        ganador_escanio = max(cocientes, key=lambda k: cocientes[k])
-        escanos[ganador_escanio] += 1
-
-        escanos_actuales = escanos[ganador_escanio]
-        votos_originales = votos_partidos[ganador_escanio]
-        cocientes[ganador_escanio] = votos_originales / (escanos_actuales + 1)
+def calcular_dhondt_lote(votos: np.ndarray, total_escanos: int,
+                         max_elementos_bloque: int = 4000000,
+                         escanos_previos: Optional[np.ndarray] = None) -> np.ndarray:
+    """
+    Implementa el método D'Hondt sobre una matriz de simulaciones en una sola llamada
+    (ver utils.reparto_utils.repartir_divisores_lote).
     
-    return dict(escanos)
+    Args:
+        votos: Matriz simulaciones x partidos con los votos de cada partido
+        total_escanos: Número total de escaños a distribuir en cada simulación
+        max_elementos_bloque: Tamaño máximo del tensor de cocientes por bloque
+        escanos_previos: Matriz simulaciones x partidos con los escaños que cada partido ya
+            tiene; sus divisores empiezan en escanos_previos + 1 (ver calcular_dhondt)
+        
+    Returns:
+        np.ndarray: Matriz simulaciones x partidos con los escaños asignados
+    """
+    return repartir_divisores_lote(votos, total_escanos, "D'Hondt", max_elementos_bloque, escanos_previos)
 
 
 def calcular_escanos_plurinominales(prediccion_votos: Dict[str, float], umbral_minimo: float, 
-                                   total_escanos: int) -> Dict[str, int]:
+                                   total_escanos: int,
+                                   escanos_previos: Optional[Dict[str, int]] = None,
+                                   metodo: str = METODO_REPARTO_DEFAULT) -> Dict[str, int]:
     """
-    Calcula la distribución de escaños plurinominales usando el método D'Hondt.
+    Calcula la distribución de escaños plurinominales (por defecto, con el método D'Hondt).
     
     Args:
         prediccion_votos: Diccionario con la predicción de votos por partido
         umbral_minimo: Umbral mínimo de votos para obtener escaños
         total_escanos: Número total de escaños a distribuir
+        escanos_previos: Escaños uninominales por partido a compensar (ver calcular_dhondt)
+        metodo: Método de reparto, uno de OPCIONES_METODO_REPARTO (ver utils.reparto_utils)
         
     Returns:
         Dict[str, int]: Diccionario con los escaños plurinominales asignados por partido
@@ -91,263 +177,663 @@ def calcular_escanos_plurinominales(prediccion_votos: Dict[str, float], umbral_m
 
     votos_normalizados = {p: v / total_votos_validos for p, v in partidos_validos_votos.items()}
     
-    return calcular_dhondt(votos_normalizados, total_escanos)
+    return repartir(votos_normalizados, total_escanos, metodo, escanos_previos)
 
 
-def simular_escanos_uninominales(prediccion_votos: Dict[str, float], 
-                                circunscripciones: Dict[str, int]) -> Dict[str, Dict[str, int]]:
+def calcular_escanos_plurinominales_lote(votos: np.ndarray, umbral_minimo: float,
+                                         total_escanos: int,
+                                         escanos_previos: Optional[np.ndarray] = None,
+                                         metodo: str = METODO_REPARTO_DEFAULT) -> np.ndarray:
     """
-    Simula la distribución de escaños uninominales por departamento.
-    Esta simulación considera la fuerza electoral de cada partido y las características territoriales.
+    Calcula los escaños plurinominales para una matriz de simulaciones.
     
     Args:
-        prediccion_votos: Diccionario con la predicción de votos por partido
-        circunscripciones: Diccionario con el número de escaños por departamento
+        votos: Matriz simulaciones x partidos con los porcentajes de votos
+        umbral_minimo: Umbral mínimo de votos para obtener escaños
+        total_escanos: Número total de escaños a distribuir
+        escanos_previos: Matriz simulaciones x partidos con los escaños uninominales a
+            compensar (ver calcular_dhondt_lote)
+        metodo: Método de reparto, uno de OPCIONES_METODO_REPARTO
         
     Returns:
-        Dict[str, Dict[str, int]]: Diccionario con escaños uninominales por departamento y partido
+        np.ndarray: Matriz simulaciones x partidos con los escaños asignados
     """
-    escanos_uninominales = {}
+    votos = np.atleast_2d(np.asarray(votos, dtype=float))
+    votos_validos = np.where(votos >= (umbral_minimo * 100), votos, 0.0)
     
-    # Ordenar partidos por fuerza electoral
-    partidos_ordenados = sorted(prediccion_votos.items(), key=lambda x: x[1], reverse=True)
+    escanos = repartir_lote(votos_validos, total_escanos, metodo, escanos_previos)
     
-    for departamento, num_escanos in circunscripciones.items():
-        escanos_departamento = {}
+    # Las simulaciones sin partidos que superen el umbral no reciben escaños
+    escanos[votos_validos.sum(axis=1) <= 0] = 0
+    return escanos
+
+
+def comparar_metodos_reparto_lote(votos: np.ndarray, umbral_minimo: float, total_escanos: int,
+                                  metodos: Sequence[str] = OPCIONES_METODO_REPARTO,
+                                  escanos_previos: Optional[np.ndarray] = None) -> Dict[str, np.ndarray]:
+    """
+    Reparte los mismos escaños con varios métodos sobre una matriz de simulaciones; el
+    filtro por umbral se calcula una sola vez para todos los métodos.
+    
+    Args:
+        votos: Matriz simulaciones x partidos con los porcentajes de votos
+        umbral_minimo: Umbral mínimo de votos para obtener escaños
+        total_escanos: Número total de escaños a distribuir
+        metodos: Métodos a comparar (por defecto, todos)
+        escanos_previos: Ver calcular_escanos_plurinominales_lote
         
-        # Distribuir escaños basándose en la fuerza electoral nacional
-        # pero con variaciones regionales simuladas
-        for i, (partido, porcentaje_nacional) in enumerate(partidos_ordenados):
-            if i >= num_escanos:
-                break
-                
-            # Simular variación regional (partidos pueden tener diferente fuerza por departamento)
-            # Por ejemplo, algunos partidos pueden ser más fuertes en ciertas regiones
-            variacion_regional = 1.0
-            
-            # Simular patrones regionales conocidos
-            if departamento in ['La Paz', 'Cochabamba'] and partido in ['MAS', 'ALIANZA UNIDAD']:
-                variacion_regional = 1.2  # Más fuertes en el occidente
-            elif departamento in ['Santa Cruz', 'Tarija'] and partido in ['LIBRE', 'APB-SÚMATE']:
-                variacion_regional = 1.3  # Más fuertes en el oriente
-            elif departamento in ['Oruro', 'Potosí'] and partido in ['MAS', 'ALIANZA POPULAR']:
-                variacion_regional = 1.1  # Más fuertes en el altiplano
-            
-            # Calcular escaños asignados considerando la variación regional
-            escanos_asignados = max(1, int((porcentaje_nacional / 100) * num_escanos * variacion_regional))
+    Returns:
+        Dict[str, np.ndarray]: Matriz simulaciones x partidos de escaños por método
+    """
+    votos = np.atleast_2d(np.asarray(votos, dtype=float))
+    votos_validos = np.where(votos >= (umbral_minimo * 100), votos, 0.0)
+    sin_validos = votos_validos.sum(axis=1) <= 0
+    
+    resultados = {}
+    for metodo in metodos:
+        escanos = repartir_lote(votos_validos, total_escanos, metodo, escanos_previos)
+        escanos[sin_validos] = 0
+        resultados[metodo] = escanos
+    return resultados
+
+
+def porcentajes_departamentales_lote(votos: np.ndarray, partidos: Sequence[str],
+                                     departamentos: Sequence[str],
+                                     porcentajes_por_depto: Optional[Dict[str, Dict[str, float]]] = None,
+                                     variacion_regional: Optional[VariacionRegional] = None
+                                     ) -> np.ndarray:
+    """
+    Estima los porcentajes por departamento a partir de los votos nacionales: un único
+    producto con la matriz departamentos x partidos de variación regional, normalizado
+    en cada departamento.
+    
+    Args:
+        votos: Matriz simulaciones x partidos con los porcentajes nacionales
+        partidos: Partidos en el orden de las columnas
+        departamentos: Departamentos a estimar
+        porcentajes_por_depto: Porcentajes observados por departamento (por ejemplo, del
+            cómputo de actas); esos departamentos los usan en lugar de la estimación
+        variacion_regional: Factores regionales (por defecto, los de src/data/variacion_regional.csv)
+        
+    Returns:
+        np.ndarray: Tensor simulaciones x departamentos x partidos (en %)
+    """
+    votos = np.atleast_2d(np.asarray(votos, dtype=float))
+    variacion_regional = variacion_regional or obtener_variacion_regional()
+    porcentajes = votos[:, None, :] * variacion_regional.matriz(partidos, departamentos)
+    totales = porcentajes.sum(axis=2, keepdims=True)
+    porcentajes = np.divide(porcentajes * 100, totales, out=np.zeros_like(porcentajes), where=totales > 0)
+    
+    for i, departamento in enumerate(departamentos):
+        observados = porcentajes_por_depto.get(departamento) if porcentajes_por_depto else None
+        if observados:
+            porcentajes[:, i, :] = [observados.get(p, 0.0) for p in partidos]
+    return porcentajes
+
+
+def _partidos_y_votos(prediccion_votos: Dict[str, float],
+                      porcentajes_por_depto: Optional[Dict[str, Dict[str, float]]] = None
+                      ) -> Tuple[List[str], np.ndarray]:
+    """Partidos de la predicción (más los que solo aparecen en los observados) y su vector de votos."""
+    partidos = list(prediccion_votos.keys())
+    for observados in (porcentajes_por_depto or {}).values():
+        partidos.extend(p for p in observados if p not in partidos)
+    return partidos, np.array([prediccion_votos.get(p, 0.0) for p in partidos], dtype=float)
+
+
+def _como_dict(escanos: np.ndarray, partidos: Sequence[str]) -> Dict[str, int]:
+    """Convierte un vector de escaños por partido en diccionario (solo partidos con escaños)."""
+    return {partidos[j]: int(escanos[j]) for j in np.flatnonzero(escanos)}
+
+
+def _como_dict_por_depto(escanos: np.ndarray, partidos: Sequence[str], departamentos: Sequence[str],
+                         incluidos: Optional[Iterable[str]] = None) -> Dict[str, Dict[str, int]]:
+    """Convierte una matriz departamentos x partidos en diccionarios por departamento."""
+    incluidos = set(departamentos if incluidos is None else incluidos)
+    return {
+        departamento: _como_dict(escanos[i], partidos)
+        for i, departamento in enumerate(departamentos)
+        if departamento in incluidos
+    }
+
+
+class PipelineEscanos:
+    """
+    Cálculo por etapas de todos los escaños de una matriz de simulaciones.
+    
+    Cada etapa (máscara de partidos válidos, votos normalizados, porcentajes por
+    departamento y por circunscripción, uninominales, plurinominales y senadores) se
+    calcula la primera vez que se pide y se reutiliza en las siguientes, de modo que
+    diputados y senadores comparten el filtrado por umbral y los porcentajes
+    departamentales. tiempos guarda el tiempo propio de cada etapa calculada, sin el de
+    las etapas de las que depende.
+    """
+    
+    def __init__(self, votos: np.ndarray, partidos: Sequence[str],
+                 umbral_minimo: float = UMBRAL_MINIMO_DEFAULT,
+                 porcentajes_por_depto: Optional[Dict[str, Dict[str, float]]] = None,
+                 compensatoria: bool = ASIGNACION_COMPENSATORIA,
+                 variacion_regional: Optional[VariacionRegional] = None,
+                 metodo_reparto: str = METODO_REPARTO_DEFAULT,
+                 departamentos: Optional[Sequence[str]] = None,
+                 senadores_por_departamento: int = SENADORES_POR_DEPARTAMENTO):
+        self.votos = np.atleast_2d(np.asarray(votos, dtype=float))
+        self.partidos = list(partidos)
+        self.umbral_minimo = umbral_minimo
+        self.porcentajes_por_depto = porcentajes_por_depto
+        self.compensatoria = compensatoria
+        self.variacion_regional = variacion_regional
+        self.metodo_reparto = metodo_reparto
+        self.departamentos = list(departamentos or DEPARTAMENTOS_BOLIVIA)
+        self.senadores_por_departamento = senadores_por_departamento
+        
+        self.tiempos: Dict[str, float] = {}
+        self._etapas: Dict[str, np.ndarray] = {}
+        self._tiempo_dependencias = 0.0
+    
+    @classmethod
+    def desde_prediccion(cls, prediccion_votos: Dict[str, float], umbral_minimo: float = UMBRAL_MINIMO_DEFAULT,
+                         porcentajes_por_depto: Optional[Dict[str, Dict[str, float]]] = None,
+                         **opciones) -> 'PipelineEscanos':
+        """
+        Crea el cálculo para una única predicción (una fila). Los partidos que solo
+        aparecen en los porcentajes observados se agregan con 0% nacional.
+        
+        Args:
+            prediccion_votos: Diccionario con la predicción de votos por partido
+            umbral_minimo: Umbral mínimo de votos para obtener escaños
+            porcentajes_por_depto: Porcentajes observados por departamento, si se conocen
+            **opciones: Resto de argumentos de PipelineEscanos
+        """
+        partidos, votos = _partidos_y_votos(prediccion_votos, porcentajes_por_depto)
+        return cls(votos, partidos, umbral_minimo, porcentajes_por_depto, **opciones)
+    
+    def _etapa(self, nombre: str, calcular) -> np.ndarray:
+        """Obtiene una etapa, calculándola (y midiendo su tiempo propio) solo la primera vez."""
+        if nombre in self._etapas:
+            return self._etapas[nombre]
+        
+        tiempo_externo, self._tiempo_dependencias = self._tiempo_dependencias, 0.0
+        inicio = time.perf_counter()
+        valor = calcular()
+        transcurrido = time.perf_counter() - inicio
+        
+        self.tiempos[nombre] = transcurrido - self._tiempo_dependencias
+        self._tiempo_dependencias = tiempo_externo + transcurrido
+        self._etapas[nombre] = valor
+        return valor
+    
+    @property
+    def mascara_validos(self) -> np.ndarray:
+        """Matriz simulaciones x partidos: partidos que superan el umbral mínimo."""
+        return self._etapa('mascara_validos', lambda: self.votos >= (self.umbral_minimo * 100))
+    
+    @property
+    def votos_normalizados(self) -> np.ndarray:
+        """Votos de los partidos válidos normalizados a proporciones (filas sin válidos en 0)."""
+        def calcular():
+            validos = np.where(self.mascara_validos, self.votos, 0.0)
+            totales = validos.sum(axis=1, keepdims=True)
+            return np.divide(validos, totales, out=np.zeros_like(validos), where=totales > 0)
+        return self._etapa('votos_normalizados', calcular)
+    
+    @property
+    def porcentajes_departamentales(self) -> np.ndarray:
+        """Tensor simulaciones x departamentos x partidos (ver porcentajes_departamentales_lote)."""
+        return self._etapa('porcentajes_departamentales', lambda: porcentajes_departamentales_lote(
+            self.votos, self.partidos, self.departamentos, self.porcentajes_por_depto, self.variacion_regional
+        ))
+    
+    @property
+    def circunscripciones(self) -> Circunscripciones:
+        """Circunscripciones de los departamentos del cálculo."""
+        return obtener_circunscripciones().de_departamentos(self.departamentos)
+    
+    @property
+    def porcentajes_circunscripciones(self) -> np.ndarray:
+        """Tensor simulaciones x circunscripciones x partidos (ver porcentajes_circunscripciones_lote)."""
+        return self._etapa('porcentajes_circunscripciones', lambda: porcentajes_circunscripciones_lote(
+            self.porcentajes_departamentales, self.partidos, self.departamentos, self.circunscripciones
+        ))
+    
+    @property
+    def uninominales_por_depto(self) -> np.ndarray:
+        """Tensor simulaciones x departamentos x partidos con los diputados uninominales."""
+        def calcular():
+            ganadores = ganadores_circunscripciones(self.porcentajes_circunscripciones)
+            indices = self.circunscripciones.indices_departamento(self.departamentos)
+            return contar_ganadores(ganadores, indices, len(self.departamentos), len(self.partidos))
+        return self._etapa('uninominales_por_depto', calcular)
+    
+    @property
+    def uninominales(self) -> np.ndarray:
+        """Matriz simulaciones x partidos con los diputados uninominales."""
+        return self._etapa('uninominales', lambda: self.uninominales_por_depto.sum(axis=1))
+    
+    @property
+    def plurinominales(self) -> np.ndarray:
+        """Matriz simulaciones x partidos con los diputados plurinominales (lista nacional)."""
+        def calcular():
+            normalizados = self.votos_normalizados
+            previos = self.uninominales if self.compensatoria else None
+            escanos = repartir_lote(normalizados, DIPUTADOS_PLURINOMINALES, self.metodo_reparto, previos)
+            # Las simulaciones sin partidos que superen el umbral no reciben escaños
+            escanos[normalizados.sum(axis=1) <= 0] = 0
+            return escanos
+        return self._etapa('plurinominales', calcular)
+    
+    @property
+    def total_diputados(self) -> np.ndarray:
+        """Matriz simulaciones x partidos con el total de diputados."""
+        return self._etapa('total_diputados', lambda: self.plurinominales + self.uninominales)
+    
+    @property
+    def senadores_por_depto(self) -> np.ndarray:
+        """
+        Tensor simulaciones x departamentos x partidos con los senadores: las filas
+        simulaciones x departamentos se aplanan en una única matriz para repartir_lote.
+        """
+        def calcular():
+            porcentajes = self.porcentajes_departamentales
+            num_simulaciones, num_departamentos, num_partidos = porcentajes.shape
+            escanos = repartir_lote(porcentajes.reshape(-1, num_partidos), self.senadores_por_departamento,
+                                    self.metodo_reparto)
+            escanos = escanos.reshape(num_simulaciones, num_departamentos, num_partidos)
+            # Los departamentos sin votos no reparten escaños
+            escanos[porcentajes.sum(axis=2) <= 0] = 0
+            return escanos
+        return self._etapa('senadores_por_depto', calcular)
+    
+    @property
+    def senadores(self) -> np.ndarray:
+        """Matriz simulaciones x partidos con el total de senadores."""
+        return self._etapa('senadores', lambda: self.senadores_por_depto.sum(axis=1))
+    
+    def detalle(self, fila: int = 0) -> Dict[str, Any]:
+        """
+        Obtiene el detalle de escaños de una simulación con la estructura de obtener_detalle_escanos.
+        
+        Args:
+            fila: Simulación de la que se obtiene el detalle
             
-            # Asegurar que no se exceda el número de escaños disponibles
-            escanos_disponibles = num_escanos - sum(escanos_departamento.values())
-            if escanos_disponibles > 0:
-                escanos_finales = min(escanos_asignados, escanos_disponibles)
-                if escanos_finales > 0:
-                    escanos_departamento[partido] = escanos_finales
+        Returns:
+            Dict con el detalle completo de escaños
+        """
+        return {
+            'diputados_plurinominales': _como_dict(self.plurinominales[fila], self.partidos),
+            'diputados_uninominales': _como_dict(self.uninominales[fila], self.partidos),
+            'diputados_uninominales_por_depto': _como_dict_por_depto(
+                self.uninominales_por_depto[fila], self.partidos, self.departamentos, CIRCUNSCRIPCIONES_UNINOMINALES
+            ),
+            'senadores': _como_dict(self.senadores[fila], self.partidos),
+            'senadores_por_depto': _como_dict_por_depto(self.senadores_por_depto[fila], self.partidos,
+                                                        self.departamentos),
+            'total_diputados': _como_dict(self.total_diputados[fila], self.partidos)
+        }
+
+
+def escanos_uninominales_lote(votos: np.ndarray, partidos: Sequence[str],
+                              porcentajes_por_depto: Optional[Dict[str, Dict[str, float]]] = None,
+                              variacion_regional: Optional[VariacionRegional] = None) -> np.ndarray:
+    """
+    Elige a los 70 diputados uninominales por mayoría simple en cada circunscripción
+    para una matriz de simulaciones.
+    
+    Los porcentajes nacionales se llevan a cada departamento y de ahí a cada
+    circunscripción (ver porcentajes_circunscripciones_lote); el ganador es el argmax
+    del tensor simulaciones x circunscripciones x partidos.
+    
+    Args:
+        votos: Matriz simulaciones x partidos con los porcentajes nacionales
+        partidos: Partidos en el orden de las columnas
+        porcentajes_por_depto: Porcentajes observados por departamento, si se conocen
+        variacion_regional: Ver porcentajes_departamentales_lote
         
-        # Si quedan escaños sin asignar, distribuirlos entre los partidos más fuertes
-        escanos_restantes = num_escanos - sum(escanos_departamento.values())
-        if escanos_restantes > 0:
-            # Dar prioridad a los partidos más fuertes
-            for partido, _ in partidos_ordenados:
-                if escanos_restantes <= 0:
-                    break
-                if partido not in escanos_departamento:
-                    escanos_departamento[partido] = 1
-                    escanos_restantes -= 1
-                elif escanos_departamento[partido] < 2:  # Máximo 2 escaños por partido en departamentos pequeños
-                    escanos_departamento[partido] += 1
-                    escanos_restantes -= 1
+    Returns:
+        np.ndarray: Tensor simulaciones x departamentos x partidos con los escaños ganados
+            (departamentos en el orden de CIRCUNSCRIPCIONES_UNINOMINALES)
+    """
+    return PipelineEscanos(votos, partidos, porcentajes_por_depto=porcentajes_por_depto,
+                           variacion_regional=variacion_regional,
+                           departamentos=list(CIRCUNSCRIPCIONES_UNINOMINALES)).uninominales_por_depto
+
+
+def simular_escanos_uninominales(prediccion_votos: Dict[str, float], 
+                                circunscripciones: Dict[str, int],
+                                porcentajes_por_depto: Optional[Dict[str, Dict[str, float]]] = None,
+                                variacion_regional: Optional[VariacionRegional] = None
+                                ) -> Dict[str, Dict[str, int]]:
+    """
+    Obtiene los escaños uninominales por departamento eligiendo por mayoría simple al
+    ganador de cada circunscripción (ver escanos_uninominales_lote). Solo se calculan
+    las circunscripciones de los departamentos indicados.
+    
+    Args:
+        prediccion_votos: Diccionario con la predicción de votos por partido
+        circunscripciones: Departamentos a calcular (con su número de escaños)
+        porcentajes_por_depto: Porcentajes observados por departamento (por ejemplo, del cómputo
+            de actas); si un departamento los tiene, se usan en lugar de la variación regional estimada
+        variacion_regional: Ver porcentajes_departamentales_lote
         
-        escanos_uninominales[departamento] = escanos_departamento
+    Returns:
+        Dict[str, Dict[str, int]]: Diccionario con escaños uninominales por departamento y partido
+    """
+    if not circunscripciones:
+        return {}
+    pipeline = PipelineEscanos.desde_prediccion(prediccion_votos, porcentajes_por_depto=porcentajes_por_depto,
+                                                variacion_regional=variacion_regional,
+                                                departamentos=list(circunscripciones))
+    return _como_dict_por_depto(pipeline.uninominales_por_depto[0], pipeline.partidos, pipeline.departamentos,
+                                circunscripciones)
+
+
+def senadores_departamentales_lote(votos: np.ndarray, partidos: Sequence[str],
+                                   porcentajes_por_depto: Optional[Dict[str, Dict[str, float]]] = None,
+                                   departamentos: Optional[Sequence[str]] = None,
+                                   variacion_regional: Optional[VariacionRegional] = None,
+                                   senadores_por_departamento: int = SENADORES_POR_DEPARTAMENTO,
+                                   metodo: str = METODO_REPARTO_DEFAULT) -> np.ndarray:
+    """
+    Reparte los senadores de cada departamento (por defecto, con D'Hondt) sobre el vector
+    de votos del departamento, para todas las simulaciones y departamentos en una sola
+    llamada (ver PipelineEscanos.senadores_por_depto).
     
-    return escanos_uninominales
+    Args:
+        votos: Matriz simulaciones x partidos con los porcentajes nacionales
+        partidos: Partidos en el orden de las columnas
+        porcentajes_por_depto: Porcentajes observados por departamento, si se conocen
+        departamentos: Departamentos a repartir (por defecto, DEPARTAMENTOS_BOLIVIA)
+        variacion_regional: Ver porcentajes_departamentales_lote
+        senadores_por_departamento: Escaños en juego en cada departamento
+        metodo: Método de reparto, uno de OPCIONES_METODO_REPARTO
+        
+    Returns:
+        np.ndarray: Tensor simulaciones x departamentos x partidos con los senadores
+    """
+    return PipelineEscanos(votos, partidos, porcentajes_por_depto=porcentajes_por_depto,
+                           variacion_regional=variacion_regional, metodo_reparto=metodo,
+                           departamentos=departamentos,
+                           senadores_por_departamento=senadores_por_departamento).senadores_por_depto
+
+
+def sumar_por_partido(por_depto: Dict[str, Dict[str, int]]) -> Dict[str, int]:
+    """Suma los escaños de todos los departamentos por partido."""
+    totales = defaultdict(int)
+    for depto_escanos in por_depto.values():
+        for partido, escanos in depto_escanos.items():
+            totales[partido] += escanos
+    return dict(totales)
 
 
 def calcular_escanos(prediccion_votos: Dict[str, float], umbral_minimo: float, 
-                    total_senadores: int, total_diputados: int) -> Tuple[Dict[str, int], Dict[str, int]]:
+                    total_senadores: int, total_diputados: int,
+                    compensatoria: bool = ASIGNACION_COMPENSATORIA,
+                    variacion_regional: Optional[VariacionRegional] = None,
+                    metodo_reparto: str = METODO_REPARTO_DEFAULT) -> Tuple[Dict[str, int], Dict[str, int]]:
     """
     Calcula la distribución de escaños para senadores y diputados
-    utilizando el método D'Hondt, considerando el umbral mínimo de votos.
+    utilizando el método de reparto (por defecto, D'Hondt), considerando el umbral mínimo
+    de votos (los senadores se reparten por departamento, sin umbral).
     
     Args:
         prediccion_votos: Diccionario con la predicción de votos por partido
         umbral_minimo: Umbral mínimo de votos para obtener escaños
-        total_senadores: Número total de senadores
+        total_senadores: Número total de senadores (repartidos por igual entre los departamentos)
         total_diputados: Número total de diputados
+        compensatoria: Si los plurinominales compensan los escaños uninominales
+        variacion_regional: Ver porcentajes_departamentales_lote
+        metodo_reparto: Método de reparto, uno de OPCIONES_METODO_REPARTO
         
     Returns:
         Tuple[Dict[str, int], Dict[str, int]]: (escaños_senadores, escaños_diputados)
     """
-    # Calcular escaños plurinominales (lista nacional)
-    diputados_plurinominales = calcular_escanos_plurinominales(
-        prediccion_votos, umbral_minimo, DIPUTADOS_PLURINOMINALES
-    )
-    
-    # Simular escaños uninominales
-    diputados_uninominales_por_depto = simular_escanos_uninominales(
-        prediccion_votos, CIRCUNSCRIPCIONES_UNINOMINALES
+    pipeline = PipelineEscanos.desde_prediccion(
+        prediccion_votos, umbral_minimo, compensatoria=compensatoria, variacion_regional=variacion_regional,
+        metodo_reparto=metodo_reparto, senadores_por_departamento=total_senadores // len(DEPARTAMENTOS_BOLIVIA)
     )
-    
-    # Sumar escaños uninominales totales por partido
-    diputados_uninominales = defaultdict(int)
-    for depto_escanos in diputados_uninominales_por_depto.values():
-        for partido, escanos in depto_escanos.items():
-            diputados_uninominales[partido] += escanos
-    
-    # Combinar escaños uninominales y plurinominales
-    diputados_totales = defaultdict(int)
-    for partido in set(diputados_plurinominales.keys()) | set(diputados_uninominales.keys()):
-        diputados_totales[partido] = (
-            diputados_plurinominales.get(partido, 0) + 
-            diputados_uninominales.get(partido, 0)
-        )
-    
-    # Calcular escaños para Senadores (método D'Hondt)
-    senadores = calcular_escanos_plurinominales(
-        prediccion_votos, umbral_minimo, total_senadores
-    )
-
-    return dict(senadores), dict(diputados_totales)
+    return (_como_dict(pipeline.senadores[0], pipeline.partidos),
+            _como_dict(pipeline.total_diputados[0], pipeline.partidos))
 
 
-def obtener_detalle_escanos(prediccion_votos: Dict[str, float], umbral_minimo: float) -> Dict[str, Any]:
+def obtener_detalle_escanos(prediccion_votos: Dict[str, float], umbral_minimo: float,
+                            porcentajes_por_depto: Optional[Dict[str, Dict[str, float]]] = None,
+                            compensatoria: bool = ASIGNACION_COMPENSATORIA,
+                            variacion_regional: Optional[VariacionRegional] = None,
+                            metodo_reparto: str = METODO_REPARTO_DEFAULT) -> Dict[str, Any]:
     """
-    Obtiene el detalle completo de la distribución de escaños.
+    Obtiene el detalle completo de la distribución de escaños (ver PipelineEscanos.detalle).
     
     Args:
         prediccion_votos: Diccionario con la predicción de votos por partido
         umbral_minimo: Umbral mínimo de votos para obtener escaños
+        porcentajes_por_depto: Porcentajes observados por departamento, si se conocen
+        compensatoria: Si los plurinominales compensan los escaños uninominales
+        variacion_regional: Ver porcentajes_departamentales_lote
+        metodo_reparto: Método de reparto de plurinominales y senadores (OPCIONES_METODO_REPARTO)
         
     Returns:
         Dict con el detalle completo de escaños
     """
-    # Calcular escaños plurinominales
-    diputados_plurinominales = calcular_escanos_plurinominales(
-        prediccion_votos, umbral_minimo, DIPUTADOS_PLURINOMINALES
-    )
+    return PipelineEscanos.desde_prediccion(
+        prediccion_votos, umbral_minimo, porcentajes_por_depto, compensatoria=compensatoria,
+        variacion_regional=variacion_regional, metodo_reparto=metodo_reparto
+    ).detalle()
+
+
+class HistogramaEscanos:
+    """
+    Acumula histogramas de escaños por partido y cámara a lo largo de las simulaciones.
+    La memoria usada depende solo del número de partidos y de escaños, no de las simulaciones.
+    """
     
-    # Simular escaños uninominales por departamento
-    diputados_uninominales_por_depto = simular_escanos_uninominales(
-        prediccion_votos, CIRCUNSCRIPCIONES_UNINOMINALES
-    )
+    def __init__(self, partidos: List[str], total_escanos: Dict[str, int]):
+        self.partidos = list(partidos)
+        self.total_escanos = dict(total_escanos)
+        self.num_simulaciones = 0
+        self.tiempos: Dict[str, float] = {}
+        self.conteos = {
+            camara: np.zeros((len(self.partidos), total + 1), dtype=np.int64)
+            for camara, total in self.total_escanos.items()
+        }
     
-    # Sumar escaños uninominales totales
-    diputados_uninominales = defaultdict(int)
-    for depto_escanos in diputados_uninominales_por_depto.values():
-        for partido, escanos in depto_escanos.items():
-            diputados_uninominales[partido] += escanos
+    def acumular(self, camara: str, escanos: np.ndarray) -> None:
+        """
+        Suma un bloque de resultados (simulaciones x partidos) al histograma de una cámara.
+        
+        Args:
+            camara: Nombre de la cámara
+            escanos: Matriz simulaciones x partidos con los escaños obtenidos
+        """
+        conteo = self.conteos[camara]
+        ancho = conteo.shape[1]
+        indices = np.clip(escanos, 0, ancho - 1) + np.arange(len(self.partidos)) * ancho
+        conteo += np.bincount(indices.ravel(), minlength=conteo.size).reshape(conteo.shape)
     
-    # Calcular senadores (lista nacional)
-    senadores = calcular_escanos_plurinominales(
-        prediccion_votos, umbral_minimo, len(DEPARTAMENTOS_BOLIVIA) * SENADORES_POR_DEPARTAMENTO
-    )
+    def sumar_tiempos(self, tiempos: Dict[str, float]) -> None:
+        """Suma los tiempos por etapa de un bloque (ver PipelineEscanos.tiempos)."""
+        for etapa, segundos in tiempos.items():
+            self.tiempos[etapa] = self.tiempos.get(etapa, 0.0) + segundos
     
-    # Simular senadores por departamento
-    senadores_por_depto = simular_senadores_por_departamento(prediccion_votos)
+    def combinar(self, otro: 'HistogramaEscanos') -> None:
+        """
+        Suma al histograma los conteos de otro con los mismos partidos y cámaras
+        (por ejemplo, el de otro proceso de trabajo). La suma de conteos enteros no
+        depende del orden, así que el resultado es idéntico al de un único histograma.
+        
+        Args:
+            otro: Histograma a sumar
+        """
+        if otro.partidos != self.partidos or otro.total_escanos != self.total_escanos:
+            raise ValueError("Solo se pueden combinar histogramas con los mismos partidos y cámaras.")
+        self.num_simulaciones += otro.num_simulaciones
+        for camara, conteo in otro.conteos.items():
+            self.conteos[camara] += conteo
+        self.sumar_tiempos(otro.tiempos)
     
-    return {
-        'diputados_plurinominales': dict(diputados_plurinominales),
-        'diputados_uninominales': dict(diputados_uninominales),
-        'diputados_uninominales_por_depto': diputados_uninominales_por_depto,
-        'senadores': dict(senadores),
-        'senadores_por_depto': senadores_por_depto,
-        'total_diputados': {
-            partido: diputados_plurinominales.get(partido, 0) + diputados_uninominales.get(partido, 0)
-            for partido in set(diputados_plurinominales.keys()) | set(diputados_uninominales.keys())
-        }
-    }
+    def percentiles(self, camara: str, cuantiles: Sequence[float]) -> np.ndarray:
+        """
+        Obtiene percentiles de escaños por partido a partir del histograma
+        (el menor número de escaños cuya frecuencia acumulada alcanza cada cuantil).
+        
+        Args:
+            camara: Nombre de la cámara
+            cuantiles: Cuantiles entre 0 y 1
+            
+        Returns:
+            np.ndarray: Matriz partidos x cuantiles con número de escaños
+        """
+        acumulada = np.cumsum(self.conteos[camara], axis=1) / max(self.num_simulaciones, 1)
+        cuantiles = np.asarray(cuantiles, dtype=float)
+        return (acumulada[:, :, None] < cuantiles[None, None, :] - 1e-12).sum(axis=1)
+    
+    def resumen(self) -> Dict[str, Any]:
+        """
+        Calcula los escaños esperados y las probabilidades de mayoría por partido y cámara.
+        
+        Returns:
+            Dict con el resumen de la distribución de escaños por cámara
+        """
+        resumen = {'num_simulaciones': self.num_simulaciones, 'tiempos_etapas': dict(self.tiempos)}
+        if self.num_simulaciones == 0:
+            return resumen
+        
+        for camara, conteo in self.conteos.items():
+            total = self.total_escanos[camara]
+            probabilidades = conteo / self.num_simulaciones
+            escanos_posibles = np.arange(total + 1)
+            
+            esperados = probabilidades @ escanos_posibles
+            prob_mayoria = probabilidades[:, escanos_posibles > total / 2].sum(axis=1)
+            prob_dos_tercios = probabilidades[:, escanos_posibles * 3 >= total * 2].sum(axis=1)
+            
+            resumen[camara] = {
+                'escanos_esperados': {p: float(v) for p, v in zip(self.partidos, esperados)},
+                'prob_mayoria': {p: float(v) for p, v in zip(self.partidos, prob_mayoria)},
+                'prob_dos_tercios': {p: float(v) for p, v in zip(self.partidos, prob_dos_tercios)},
+                'histograma': {p: conteo[i].tolist() for i, p in enumerate(self.partidos)}
+            }
+        
+        return resumen
+
+
+def obtener_distribucion_escanos(bloques_votos: Iterable[np.ndarray], partidos: List[str],
+                                 umbral_minimo: float,
+                                 porcentajes_por_depto: Optional[Dict[str, Dict[str, float]]] = None,
+                                 variacion_regional: Optional[VariacionRegional] = None,
+                                 metodo_reparto: str = METODO_REPARTO_DEFAULT) -> Dict[str, Any]:
+    """
+    Obtiene la distribución de escaños a lo largo de muchas simulaciones.
+    
+    Los bloques de votos se procesan uno a uno y solo se conservan los histogramas
+    por partido y cámara, por lo que la memoria no crece con el número de simulaciones.
+    
+    Args:
+        bloques_votos: Iterable de matrices simulaciones x partidos con porcentajes de votos
+        partidos: Nombres de los partidos en el orden de las columnas
+        umbral_minimo: Umbral mínimo de votos para obtener escaños
+        porcentajes_por_depto: Porcentajes observados por departamento, si se conocen
+        variacion_regional: Ver porcentajes_departamentales_lote
+        metodo_reparto: Método de reparto de plurinominales y senadores
+        
+    Returns:
+        Dict con escaños esperados, P(mayoría), P(2/3) e histogramas por cámara y partido
+    """
+    histograma = acumular_distribucion_escanos(bloques_votos, partidos, umbral_minimo, porcentajes_por_depto,
+                                               variacion_regional=variacion_regional, metodo_reparto=metodo_reparto)
+    return histograma.resumen()
+
+
+def acumular_distribucion_escanos(bloques_votos: Iterable[np.ndarray], partidos: List[str],
+                                  umbral_minimo: float,
+                                  porcentajes_por_depto: Optional[Dict[str, Dict[str, float]]] = None,
+                                  compensatoria: bool = ASIGNACION_COMPENSATORIA,
+                                  variacion_regional: Optional[VariacionRegional] = None,
+                                  metodo_reparto: str = METODO_REPARTO_DEFAULT) -> HistogramaEscanos:
+    """
+    Acumula los escaños de los bloques de votos en un histograma por partido y cámara
+    (ver obtener_distribucion_escanos). Los histogramas de distintos procesos pueden
+    sumarse con HistogramaEscanos.combinar.
+    
+    Returns:
+        HistogramaEscanos: Histograma con los conteos de los bloques
+    """
+    histograma = HistogramaEscanos(partidos, {
+        'diputados_plurinominales': DIPUTADOS_PLURINOMINALES,
+        'diputados_uninominales': DIPUTADOS_UNINOMINALES,
+        'total_diputados': TOTAL_DIPUTADOS,
+        'senadores': TOTAL_SENADORES
+    })
+    
+    for bloque in bloques_votos:
+        # Un solo cálculo por bloque: diputados y senadores comparten los porcentajes departamentales
+        pipeline = PipelineEscanos(bloque, partidos, umbral_minimo, porcentajes_por_depto, compensatoria,
+                                   variacion_regional, metodo_reparto)
+        
+        histograma.num_simulaciones += pipeline.votos.shape[0]
+        histograma.acumular('diputados_plurinominales', pipeline.plurinominales)
+        histograma.acumular('diputados_uninominales', pipeline.uninominales)
+        histograma.acumular('total_diputados', pipeline.total_diputados)
+        histograma.acumular('senadores', pipeline.senadores)
+        histograma.sumar_tiempos(pipeline.tiempos)
+    
+    return histograma
 
 
 def simular_segunda_vuelta(prediccion_2025: Dict[str, float], 
-                          candidatos_segunda_vuelta: List[str]) -> Dict[str, float]:
+                          candidatos_segunda_vuelta: List[str],
+                          transferencia: Optional[TransferenciaVotos] = None,
+                          abstencion: float = ABSTENCION_SEGUNDA_VUELTA_DEFAULT) -> Dict[str, float]:
     """
-    Simula los resultados de la segunda vuelta electoral.
+    Simula los resultados de la segunda vuelta electoral transfiriendo los votos de los
+    partidos eliminados con la matriz de transferencia (ver utils.segunda_vuelta_utils).
     
     Args:
         prediccion_2025: Predicción de votos de la primera vuelta
         candidatos_segunda_vuelta: Lista con los dos candidatos que pasan a segunda vuelta
+        transferencia: Matriz de transferencia de votos (None: reparto proporcional)
+        abstencion: Fracción que se abstiene de los partidos sin fila en la matriz
         
     Returns:
-        Dict[str, float]: Predicción de votos para la segunda vuelta
+        Dict[str, float]: Porcentaje de votos válidos de cada candidato en la segunda vuelta
     """
     if len(candidatos_segunda_vuelta) < 2:
         return {}
-        
-    # Redistribuir votos considerando solo los dos partidos principales
-    total_votos = sum(prediccion_2025.values())
-    votos_primer_lugar = prediccion_2025[candidatos_segunda_vuelta[0]]
-    votos_segundo_lugar = prediccion_2025[candidatos_segunda_vuelta[1]]
-    
-    # Calcular porcentaje de votos no asignados a estos dos partidos
-    otros_votos = total_votos - votos_primer_lugar - votos_segundo_lugar
-    
-    # Simular redistribución (70% al primero, 30% al segundo como ejemplo)
-    votos_primer_lugar += otros_votos * 0.7
-    votos_segundo_lugar += otros_votos * 0.3
-    
-    # Actualizar predicción para mostrar solo los dos candidatos
-    prediccion_segunda_vuelta = {
-        candidatos_segunda_vuelta[0]: votos_primer_lugar,
-        candidatos_segunda_vuelta[1]: votos_segundo_lugar
-    }
     
-    return prediccion_segunda_vuelta
+    finalistas = list(candidatos_segunda_vuelta[:2])
+    partidos, votos = _partidos_y_votos(prediccion_2025)
+    matriz, sin_datos = (transferencia or TransferenciaVotos([], [], np.zeros((0, 0)))).matriz(partidos, finalistas)
+    transferidos = transferir_votos_lote(votos, matriz, sin_datos, [partidos.index(f) for f in finalistas],
+                                         abstencion)[0]
+    
+    validos = transferidos[:2].sum()
+    if validos <= 0:
+        return {}
+    return {finalista: float(transferidos[k] * 100 / validos) for k, finalista in enumerate(finalistas)}
 
 
-def simular_senadores_por_departamento(prediccion_votos: Dict[str, float]) -> Dict[str, Dict[str, int]]:
+def simular_senadores_por_departamento(prediccion_votos: Dict[str, float],
+                                       porcentajes_por_depto: Optional[Dict[str, Dict[str, float]]] = None,
+                                       departamentos: Optional[List[str]] = None,
+                                       variacion_regional: Optional[VariacionRegional] = None,
+                                       senadores_por_departamento: int = SENADORES_POR_DEPARTAMENTO,
+                                       metodo: str = METODO_REPARTO_DEFAULT) -> Dict[str, Dict[str, int]]:
     """
-    Simula la distribución de senadores por departamento.
-    Cada departamento tiene 4 senadores que pueden ser de diferentes partidos.
+    Reparte los senadores de cada departamento (4 por departamento) sobre los porcentajes
+    del departamento (ver senadores_departamentales_lote).
     
     Args:
         prediccion_votos: Diccionario con la predicción de votos por partido
+        porcentajes_por_depto: Porcentajes observados por departamento, si se conocen
+        departamentos: Departamentos a simular (por defecto, todos)
+        variacion_regional: Ver porcentajes_departamentales_lote
+        senadores_por_departamento: Escaños en juego en cada departamento
+        metodo: Método de reparto, uno de OPCIONES_METODO_REPARTO
         
     Returns:
         Dict[str, Dict[str, int]]: Diccionario con senadores por departamento y partido
     """
-    senadores_por_depto = {}
-    
-    # Ordenar partidos por fuerza electoral
-    partidos_ordenados = sorted(prediccion_votos.items(), key=lambda x: x[1], reverse=True)
-    
-    for departamento in DEPARTAMENTOS_BOLIVIA:
-        senadores_departamento = {}
-        
-        # Distribuir 4 senadores por departamento
-        for i, (partido, porcentaje) in enumerate(partidos_ordenados):
-            if i >= 4:  # Máximo 4 partidos por departamento
-                break
-                
-            # Simular variación regional para senadores
-            variacion_regional = 1.0
-            
-            # Patrones regionales para senadores (similar a diputados pero más equilibrado)
-            if departamento in ['La Paz', 'Cochabamba'] and partido in ['MAS', 'ALIANZA UNIDAD']:
-                variacion_regional = 1.1
-            elif departamento in ['Santa Cruz', 'Tarija'] and partido in ['LIBRE', 'APB-SÚMATE']:
-                variacion_regional = 1.2
-            elif departamento in ['Oruro', 'Potosí'] and partido in ['MAS', 'ALIANZA POPULAR']:
-                variacion_regional = 1.05
-            
-            # Calcular senadores asignados
-            senadores_asignados = max(1, int((porcentaje / 100) * 4 * variacion_regional))
-            
-            # Asegurar que no se exceda el número de senadores disponibles
-            senadores_disponibles = 4 - sum(senadores_departamento.values())
-            if senadores_disponibles > 0:
-                senadores_finales = min(senadores_asignados, senadores_disponibles)
-                if senadores_finales > 0:
-                    senadores_departamento[partido] = senadores_finales
-        
-        # Si quedan senadores sin asignar, distribuirlos
-        senadores_restantes = 4 - sum(senadores_departamento.values())
-        if senadores_restantes > 0:
-            for partido, _ in partidos_ordenados:
-                if senadores_restantes <= 0:
-                    break
-                if partido not in senadores_departamento:
-                    senadores_departamento[partido] = 1
-                    senadores_restantes -= 1
-        
-        senadores_por_depto[departamento] = senadores_departamento
-    
-    return senadores_por_depto
\ No newline at end of file
+    pipeline = PipelineEscanos.desde_prediccion(prediccion_votos, porcentajes_por_depto=porcentajes_por_depto,
+                                                variacion_regional=variacion_regional, metodo_reparto=metodo,
+                                                departamentos=departamentos,
+                                                senadores_por_departamento=senadores_por_departamento)
+    return _como_dict_por_depto(pipeline.senadores_por_depto[0], pipeline.partidos, pipeline.departamentos)
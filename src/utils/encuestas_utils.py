@@ -0,0 +1,232 @@
+"""
+Agregación ponderada de encuestas: tamaño de muestra, antigüedad y efecto de la encuestadora
+"""
+import numpy as np
+from typing import Dict, List, Any, Optional, Sequence
+
+from config.settings import (VIDA_MEDIA_ENCUESTAS_DIAS, MUESTRA_REFERENCIA_ENCUESTAS,
+                             CONTRACCION_EFECTO_CASA)
+
+# Columnas de metadatos admitidas en los archivos de encuestas (no son partidos)
+COLUMNAS_METADATOS_ENCUESTA = {'Fecha': 'fecha', 'Muestra': 'muestra', 'Encuestadora': 'encuestadora'}
+
+
+def metadatos_como_arreglos(etiquetas: Sequence[str],
+                            metadatos: Optional[Dict[str, Dict[str, Any]]]) -> Dict[str, Any]:
+    """
+    Convierte los metadatos {encuesta: {'fecha', 'muestra', 'encuestadora'}} en arreglos
+    alineados con etiquetas. Los datos ausentes quedan como NaN / "".
+
+    Args:
+        etiquetas: Nombres de las encuestas en el orden de la matriz
+        metadatos: Metadatos por encuesta (puede ser None o estar incompleto)
+
+    Returns:
+        Dict con 'dias' (float, días desde 1970-01-01), 'muestras' (float) y 'encuestadoras' (List[str])
+    """
+    metadatos = metadatos or {}
+    dias = np.full(len(etiquetas), np.nan)
+    muestras = np.full(len(etiquetas), np.nan)
+    encuestadoras = []
+    for i, etiqueta in enumerate(etiquetas):
+        datos = metadatos.get(etiqueta, {})
+        if datos.get('fecha'):
+            dias[i] = np.datetime64(str(datos['fecha'])[:10], 'D').astype(np.int64)
+        if datos.get('muestra'):
+            muestras[i] = float(datos['muestra'])
+        encuestadoras.append(str(datos.get('encuestadora') or ""))
+    return {'dias': dias, 'muestras': muestras, 'encuestadoras': encuestadoras}
+
+
+def pesos_encuestas(antiguedad_dias: np.ndarray, muestras: np.ndarray,
+                    vida_media_dias: float = VIDA_MEDIA_ENCUESTAS_DIAS) -> np.ndarray:
+    """
+    Calcula el peso de cada encuesta: sqrt(muestra / MUESTRA_REFERENCIA_ENCUESTAS) * 0.5 ** (antigüedad / vida media).
+
+    Args:
+        antiguedad_dias: Días desde cada encuesta hasta la fecha de referencia (NaN: 0)
+        muestras: Tamaño de muestra de cada encuesta (NaN: muestra de referencia)
+        vida_media_dias: Días en que el peso de una encuesta se reduce a la mitad
+
+    Returns:
+        np.ndarray: Peso de cada encuesta
+    """
+    antiguedad = np.maximum(np.nan_to_num(antiguedad_dias, nan=0.0), 0.0)
+    muestras = np.where(np.isnan(muestras), MUESTRA_REFERENCIA_ENCUESTAS, muestras)
+    return 0.5 ** (antiguedad / vida_media_dias) * np.sqrt(muestras / MUESTRA_REFERENCIA_ENCUESTAS)
+
+
+def remuestrear_encuestas(matriz: np.ndarray, muestras: np.ndarray, pesos: np.ndarray,
+                          num_remuestreos: int, generador: np.random.Generator) -> np.ndarray:
+    """
+    Bootstrap de encuestas: en cada remuestreo se eligen encuestas con reposición y se
+    vuelven a sortear sus encuestados con una distribución multinomial según su muestra.
+
+    Cada paso es una sola llamada vectorizada: un multinomial para el número de veces que
+    se elige cada encuesta y un multinomial (remuestreos x encuestas) para los encuestados.
+
+    Args:
+        matriz: Porcentajes encuestas x partidos
+        muestras: Tamaño de muestra de cada encuesta (NaN: muestra de referencia)
+        pesos: Peso de cada encuesta en el promedio (ver pesos_encuestas)
+        num_remuestreos: Número de remuestreos
+        generador: Generador aleatorio
+
+    Returns:
+        np.ndarray: Promedio ponderado remuestreado, matriz remuestreos x partidos (en %)
+    """
+    num_encuestas = matriz.shape[0]
+    muestras = np.where(np.isnan(muestras), MUESTRA_REFERENCIA_ENCUESTAS, muestras).astype(np.int64)
+
+    totales = matriz.sum(axis=1, keepdims=True)
+    proporciones = np.divide(matriz, totales, out=np.zeros_like(matriz), where=totales > 0)
+
+    # Veces que se elige cada encuesta: remuestreos x encuestas
+    elegidas = generador.multinomial(num_encuestas, np.full(num_encuestas, 1.0 / num_encuestas),
+                                     size=num_remuestreos)
+    # Encuestados por partido: remuestreos x encuestas x partidos
+    encuestados = generador.multinomial(np.broadcast_to(muestras, (num_remuestreos, num_encuestas)),
+                                        proporciones)
+    porcentajes = encuestados / muestras[None, :, None] * 100
+
+    ponderacion = elegidas * pesos[None, :]
+    return np.einsum('re,rep->rp', ponderacion, porcentajes) / ponderacion.sum(axis=1, keepdims=True)
+
+
+class AgregadorEncuestas:
+    """
+    Promedio ponderado de encuestas, actualizable de forma incremental.
+
+    Cada encuesta pesa sqrt(muestra / MUESTRA_REFERENCIA_ENCUESTAS) * 0.5 ** (antigüedad / vida media).
+    Solo se guardan, por encuestadora, la suma ponderada de porcentajes, la suma de pesos
+    y el número de encuestas, así que agregar una encuesta cuesta O(partidos) y el
+    promedio O(encuestadoras x partidos), sin recorrer las encuestas anteriores.
+
+    Los pesos se guardan relativos a la fecha más reciente; cuando llega una encuesta más
+    nueva, todas las sumas se multiplican por el mismo factor de decaimiento (que no
+    cambia los promedios pero mantiene los pesos acotados).
+
+    El efecto de cada encuestadora es la diferencia entre su promedio y el promedio de
+    las encuestadoras (cada una cuenta una vez, así la que más publica no domina),
+    reducida por k / (k + CONTRACCION_EFECTO_CASA) (k = sus encuestas) para no corregir
+    de más a las que publicaron poco. Con una sola encuestadora el efecto es 0.
+    """
+
+    def __init__(self, num_partidos: int, vida_media_dias: float = VIDA_MEDIA_ENCUESTAS_DIAS,
+                 contraccion: float = CONTRACCION_EFECTO_CASA):
+        if vida_media_dias <= 0:
+            raise ValueError("La vida media de las encuestas debe ser mayor que cero.")
+        self.vida_media_dias = vida_media_dias
+        self.contraccion = contraccion
+
+        self.encuestadoras: List[str] = []
+        self._indice_encuestadora: Dict[str, int] = {}
+        self._sumas = np.zeros((0, num_partidos))
+        self._pesos = np.zeros(0)
+        self._conteos = np.zeros(0, dtype=np.int64)
+        self._dia_referencia = np.nan
+        self.num_encuestas = 0
+
+    @property
+    def num_partidos(self) -> int:
+        return self._sumas.shape[1]
+
+    def ampliar_partidos(self, num_partidos: int) -> None:
+        """Agrega columnas en cero para partidos nuevos."""
+        faltantes = num_partidos - self.num_partidos
+        if faltantes > 0:
+            self._sumas = np.hstack([self._sumas, np.zeros((self._sumas.shape[0], faltantes))])
+
+    def _codigos_encuestadoras(self, encuestadoras: Sequence[str]) -> np.ndarray:
+        nuevas = [e for e in dict.fromkeys(encuestadoras) if e not in self._indice_encuestadora]
+        for encuestadora in nuevas:
+            self._indice_encuestadora[encuestadora] = len(self.encuestadoras)
+            self.encuestadoras.append(encuestadora)
+        if nuevas:
+            self._sumas = np.vstack([self._sumas, np.zeros((len(nuevas), self.num_partidos))])
+            self._pesos = np.concatenate([self._pesos, np.zeros(len(nuevas))])
+            self._conteos = np.concatenate([self._conteos, np.zeros(len(nuevas), dtype=np.int64)])
+        return np.array([self._indice_encuestadora[e] for e in encuestadoras], dtype=np.int64)
+
+    def agregar_lote(self, matriz: np.ndarray, dias: Optional[np.ndarray] = None,
+                     muestras: Optional[np.ndarray] = None,
+                     encuestadoras: Optional[Sequence[str]] = None) -> None:
+        """
+        Agrega un lote de encuestas con operaciones vectorizadas.
+
+        Args:
+            matriz: Porcentajes encuestas x partidos (columnas según el registro de partidos)
+            dias: Fecha de cada encuesta en días desde 1970-01-01 (NaN: fecha de referencia)
+            muestras: Tamaño de muestra de cada encuesta (NaN: muestra de referencia)
+            encuestadoras: Encuestadora de cada encuesta ("" si no se conoce)
+        """
+        matriz = np.atleast_2d(np.asarray(matriz, dtype=float))
+        n = matriz.shape[0]
+        if n == 0:
+            return
+        dias = np.full(n, np.nan) if dias is None else np.asarray(dias, dtype=float)
+        muestras = np.full(n, np.nan) if muestras is None else np.asarray(muestras, dtype=float)
+        encuestadoras = [""] * n if encuestadoras is None else list(encuestadoras)
+
+        self.ampliar_partidos(matriz.shape[1])
+        if matriz.shape[1] < self.num_partidos:
+            matriz = np.hstack([matriz, np.zeros((n, self.num_partidos - matriz.shape[1]))])
+
+        # Mover la referencia a la encuesta más reciente, reescalando las sumas guardadas
+        if not np.all(np.isnan(dias)):
+            dia_maximo = np.nanmax(dias)
+            if np.isnan(self._dia_referencia):
+                self._dia_referencia = dia_maximo
+            elif dia_maximo > self._dia_referencia:
+                factor = 0.5 ** ((dia_maximo - self._dia_referencia) / self.vida_media_dias)
+                self._sumas *= factor
+                self._pesos *= factor
+                self._dia_referencia = dia_maximo
+
+        pesos = pesos_encuestas(self._dia_referencia - dias, muestras, self.vida_media_dias)
+
+        codigos = self._codigos_encuestadoras(encuestadoras)
+        np.add.at(self._sumas, codigos, matriz * pesos[:, None])
+        np.add.at(self._pesos, codigos, pesos)
+        np.add.at(self._conteos, codigos, 1)
+        self.num_encuestas += n
+
+    def agregar(self, valores: np.ndarray, dia: float = np.nan, muestra: float = np.nan,
+                encuestadora: str = "") -> None:
+        """Agrega una sola encuesta (ver agregar_lote)."""
+        self.agregar_lote(np.atleast_2d(valores), np.array([dia]), np.array([muestra]), [encuestadora])
+
+    def efectos_casa(self) -> np.ndarray:
+        """
+        Calcula el efecto (sesgo) de cada encuestadora por partido.
+
+        Returns:
+            np.ndarray: Matriz encuestadoras x partidos con el efecto en puntos porcentuales
+        """
+        activos = self._pesos > 0
+        efectos = np.zeros_like(self._sumas)
+        if activos.sum() < 2:
+            return efectos
+        promedios = self._sumas[activos] / self._pesos[activos, None]
+        general = promedios.mean(axis=0)
+        contraccion = self._conteos[activos] / (self._conteos[activos] + self.contraccion)
+        efectos[activos] = (promedios - general) * contraccion[:, None]
+        return efectos
+
+    def promedio(self, corregir_efecto_casa: bool = True) -> np.ndarray:
+        """
+        Obtiene el promedio ponderado por partido.
+
+        Args:
+            corregir_efecto_casa: Si se descuenta el efecto de cada encuestadora
+
+        Returns:
+            np.ndarray: Promedio ponderado por partido
+        """
+        total_pesos = self._pesos.sum()
+        if total_pesos <= 0:
+            return np.zeros(self.num_partidos)
+        sumas = self._sumas
+        if corregir_efecto_casa:
+            sumas = sumas - self.efectos_casa() * self._pesos[:, None]
+        return sumas.sum(axis=0) / total_pesos
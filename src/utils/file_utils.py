@@ -2,59 +2,202 @@
 Utilidades para manejo de archivos
 """
 import pandas as pd
+import numpy as np
 import os
-from typing import Dict, Any
-from tkinter import messagebox
+from dataclasses import dataclass
+from typing import Dict, Any, List, Optional
 
+from models.resultado_escanos import ResultadoEscanos
+from utils.encuestas_utils import COLUMNAS_METADATOS_ENCUESTA
 
-def cargar_encuestas_desde_archivo(file_path: str) -> Dict[str, Dict[str, float]]:
+# Diferencia máxima (en puntos porcentuales) aceptada entre la suma de una fila y 100%
+TOLERANCIA_SUMA_PORCENTAJES = 0.1
+
+
+@dataclass
+class ReporteValidacion:
     """
-    Carga datos de encuestas desde un archivo CSV o Excel.
+    Resultado de validar que cada fila de porcentajes sume 100%.
+    """
+    total_filas: int
+    filas_invalidas: np.ndarray
+    etiquetas_invalidas: List[str]
+    sumas_invalidas: np.ndarray
+    desviacion_media: float
+    desviacion_maxima: float
+    
+    @property
+    def es_valido(self) -> bool:
+        """Indica si todas las filas suman 100% dentro de la tolerancia."""
+        return len(self.filas_invalidas) == 0
+    
+    def resumen(self, descripcion_fila: str = "filas", max_ejemplos: int = 5) -> str:
+        """
+        Genera un único mensaje con el resumen de la validación.
+        
+        Args:
+            descripcion_fila: Nombre de las filas en el mensaje (por ejemplo, "encuestas")
+            max_ejemplos: Número máximo de filas inválidas a listar
+            
+        Returns:
+            str: Mensaje con el resumen (vacío si todas las filas son válidas)
+        """
+        if self.es_valido:
+            return ""
+        
+        ejemplos = ", ".join(
+            f"'{etiqueta}' ({suma:.1f}%)"
+            for etiqueta, suma in zip(self.etiquetas_invalidas[:max_ejemplos], self.sumas_invalidas[:max_ejemplos])
+        )
+        if len(self.filas_invalidas) > max_ejemplos:
+            ejemplos += f" y {len(self.filas_invalidas) - max_ejemplos} más"
+        
+        return (f"{len(self.filas_invalidas)} de {self.total_filas} {descripcion_fila} no suman exactamente 100%: "
+                f"{ejemplos}. Desviación media: {self.desviacion_media:.2f} puntos, "
+                f"máxima: {self.desviacion_maxima:.2f} puntos. Se utilizarán los valores tal cual.")
+
+
+@dataclass
+class TablaPorcentajes:
+    """
+    Tabla de porcentajes por partido leída desde un archivo (una fila por encuesta o año).
+    """
+    etiquetas: List[str]
+    partidos: List[str]
+    matriz: np.ndarray
+    reporte: ReporteValidacion
+    # Fecha, muestra y encuestadora por encuesta, si el archivo las incluye
+    metadatos: Optional[Dict[str, Dict[str, Any]]] = None
+    
+    def como_dict(self) -> Dict[str, Dict[str, float]]:
+        """
+        Obtiene la vista en diccionario {etiqueta: {partido: porcentaje}}.
+        
+        Returns:
+            Dict[str, Dict[str, float]]: Diccionario con los porcentajes por fila y partido
+        """
+        return {
+            etiqueta: dict(zip(self.partidos, fila))
+            for etiqueta, fila in zip(self.etiquetas, self.matriz.tolist())
+        }
+
+
+def validar_sumas(etiquetas: List[str], matriz: np.ndarray) -> ReporteValidacion:
+    """
+    Valida en una sola pasada que cada fila de la matriz sume 100%.
+    
+    Args:
+        etiquetas: Identificador de cada fila
+        matriz: Matriz filas x partidos con porcentajes
+        
+    Returns:
+        ReporteValidacion: Filas inválidas, sus sumas y estadísticas de desviación
+    """
+    sumas = matriz.sum(axis=1)
+    desviaciones = np.abs(sumas - 100)
+    filas_invalidas = np.flatnonzero(desviaciones > TOLERANCIA_SUMA_PORCENTAJES)
+    
+    return ReporteValidacion(
+        total_filas=len(sumas),
+        filas_invalidas=filas_invalidas,
+        etiquetas_invalidas=[etiquetas[i] for i in filas_invalidas],
+        sumas_invalidas=sumas[filas_invalidas],
+        desviacion_media=float(desviaciones.mean()) if len(sumas) else 0.0,
+        desviacion_maxima=float(desviaciones.max()) if len(sumas) else 0.0
+    )
+
+
+def _leer_archivo_tabular(file_path: str) -> pd.DataFrame:
+    """Lee un archivo CSV o Excel en un DataFrame."""
+    if file_path.lower().endswith('.csv'):
+        return pd.read_csv(file_path)
+    return pd.read_excel(file_path)
+
+
+def _construir_tabla(df: pd.DataFrame, etiquetas: pd.Series, columnas_id: List[str],
+                     mensaje_sin_partidos: str) -> TablaPorcentajes:
+    """
+    Convierte las columnas de partidos en una matriz densa con operaciones por columna.
+    
+    Args:
+        df: DataFrame leído del archivo
+        etiquetas: Identificador de cada fila (encuesta o año) ya convertido a texto
+        columnas_id: Columnas identificadoras y de metadatos, que se excluyen de los partidos
+        mensaje_sin_partidos: Mensaje de error si no hay columnas de partidos
+        
+    Returns:
+        TablaPorcentajes: Tabla con la matriz filas x partidos y su reporte de validación
+    """
+    partidos = [col for col in df.columns if col not in columnas_id]
+    if not partidos and len(df):
+        raise ValueError(mensaje_sin_partidos.format(etiquetas.iloc[0]))
+    
+    matriz = df[partidos].fillna(0.0).to_numpy(dtype=float)
+    etiquetas = etiquetas.tolist()
+    
+    return TablaPorcentajes(
+        etiquetas=etiquetas,
+        partidos=[str(p) for p in partidos],
+        matriz=matriz,
+        reporte=validar_sumas(etiquetas, matriz)
+    )
+
+
+def _leer_metadatos_encuestas(df: pd.DataFrame, etiquetas: List[str],
+                              columnas: List[str]) -> Dict[str, Dict[str, Any]]:
+    """
+    Lee las columnas de metadatos (Fecha, Muestra, Encuestadora) por columna.
+    Los valores faltantes o no interpretables quedan como None.
+    """
+    valores = {}
+    if 'Fecha' in columnas:
+        # Primero AAAA-MM-DD; el resto se interpreta con el día primero (DD/MM/AAAA)
+        fechas = pd.to_datetime(df['Fecha'], errors='coerce', format='ISO8601')
+        faltantes = fechas.isna() & df['Fecha'].notna()
+        if faltantes.any():
+            fechas[faltantes] = pd.to_datetime(df.loc[faltantes, 'Fecha'].astype(str), errors='coerce',
+                                               format='mixed', dayfirst=True)
+        valores['fecha'] = [None if pd.isna(f) else f.strftime('%Y-%m-%d') for f in fechas]
+    if 'Muestra' in columnas:
+        muestras = pd.to_numeric(df['Muestra'], errors='coerce')
+        valores['muestra'] = [None if pd.isna(m) else int(m) for m in muestras]
+    if 'Encuestadora' in columnas:
+        valores['encuestadora'] = [None if pd.isna(e) else str(e).strip() for e in df['Encuestadora']]
+    
+    return {
+        etiqueta: {clave: lista[i] for clave, lista in valores.items()}
+        for i, etiqueta in enumerate(etiquetas)
+    }
+
+
+def cargar_tabla_encuestas(file_path: str) -> TablaPorcentajes:
+    """
+    Carga datos de encuestas desde un archivo CSV o Excel como matriz encuestas x partidos.
+    Las columnas opcionales 'Fecha', 'Muestra' y 'Encuestadora' se leen como metadatos
+    (ver TablaPorcentajes.metadatos) y no se consideran partidos.
     
     Args:
         file_path: Ruta del archivo a cargar
         
     Returns:
-        Dict[str, Dict[str, float]]: Diccionario con los datos de encuestas
+        TablaPorcentajes: Tabla con las encuestas
         
     Raises:
         ValueError: Si el formato del archivo es incorrecto
         Exception: Si hay error al cargar el archivo
     """
     try:
-        if file_path.lower().endswith('.csv'):
-            df = pd.read_csv(file_path)
-        else:
-            df = pd.read_excel(file_path)
+        df = _leer_archivo_tabular(file_path)
 
         if 'Encuesta' not in df.columns:
             raise ValueError("El archivo debe contener una columna llamada 'Encuesta' para identificar las encuestas.")
 
-        encuestas_cargadas = {}
-        for idx, row in df.iterrows():
-            encuesta_nombre = str(row['Encuesta'])
-            partido_data = {}
-            
-            for col in df.columns:
-                if col != 'Encuesta':
-                    value = row[col]
-                    if pd.notna(value):
-                        partido_data[col] = float(value)
-                    else:
-                        partido_data[col] = 0.0
-            
-            if not partido_data:
-                raise ValueError(f"La encuesta '{encuesta_nombre}' no contiene datos de partidos.")
-
-            current_sum = sum(partido_data.values())
-            if abs(current_sum - 100) > 0.1:
-                messagebox.showwarning("Advertencia de Formato", 
-                                     f"Los porcentajes de la encuesta '{encuesta_nombre}' no suman exactamente 100%. "
-                                     f"Suma actual: {current_sum:.1f}%. Se utilizarán los valores tal cual.")
-            
-            encuestas_cargadas[encuesta_nombre] = partido_data
-
-        return encuestas_cargadas
+        columnas_metadatos = [col for col in COLUMNAS_METADATOS_ENCUESTA if col in df.columns]
+        tabla = _construir_tabla(df, df['Encuesta'].astype(str), ['Encuesta'] + columnas_metadatos,
+                                 "La encuesta '{}' no contiene datos de partidos.")
+        if columnas_metadatos:
+            tabla.metadatos = _leer_metadatos_encuestas(df, tabla.etiquetas, columnas_metadatos)
+        return tabla
         
     except ValueError as ve:
         raise ve
@@ -62,54 +205,29 @@ def cargar_encuestas_desde_archivo(file_path: str) -> Dict[str, Dict[str, float]
         raise Exception(f"No se pudo cargar el archivo: {e}")
 
 
-def cargar_historicos_desde_archivo(file_path: str) -> Dict[str, Dict[str, float]]:
+def cargar_tabla_historicos(file_path: str) -> TablaPorcentajes:
     """
-    Carga datos históricos desde un archivo CSV o Excel.
+    Carga datos históricos desde un archivo CSV o Excel como matriz años x partidos.
     
     Args:
         file_path: Ruta del archivo a cargar
         
     Returns:
-        Dict[str, Dict[str, float]]: Diccionario con los datos históricos
+        TablaPorcentajes: Tabla con los resultados históricos
         
     Raises:
         ValueError: Si el formato del archivo es incorrecto
         Exception: Si hay error al cargar el archivo
     """
     try:
-        if file_path.lower().endswith('.csv'):
-            df = pd.read_csv(file_path)
-        else:
-            df = pd.read_excel(file_path)
+        df = _leer_archivo_tabular(file_path)
 
         if 'Año' not in df.columns:
             raise ValueError("El archivo debe contener una columna llamada 'Año' para identificar el año de la elección.")
 
-        historicos_cargados = {}
-        for idx, row in df.iterrows():
-            año = str(int(float(row['Año'])))
-            partido_data = {}
-            
-            for col in df.columns:
-                if col != 'Año':
-                    value = row[col]
-                    if pd.notna(value):
-                        partido_data[col] = float(value)
-                    else:
-                        partido_data[col] = 0.0
-                        
-            if not partido_data:
-                raise ValueError(f"Los datos históricos del año '{año}' no contienen datos de partidos.")
-                
-            current_sum = sum(partido_data.values())
-            if abs(current_sum - 100) > 0.1:
-                messagebox.showwarning("Advertencia de Formato", 
-                                     f"Los porcentajes del año '{año}' no suman exactamente 100%. "
-                                     f"Suma actual: {current_sum:.1f}%. Se utilizarán los valores tal cual.")
-                                     
-            historicos_cargados[año] = partido_data
-
-        return historicos_cargados
+        años = df['Año'].astype(float).astype(int).astype(str)
+        return _construir_tabla(df, años, ['Año'],
+                                "Los datos históricos del año '{}' no contienen datos de partidos.")
         
     except ValueError as ve:
         raise ve
@@ -117,6 +235,42 @@ def cargar_historicos_desde_archivo(file_path: str) -> Dict[str, Dict[str, float
         raise Exception(f"No se pudo cargar el archivo: {e}")
 
 
+def cargar_encuestas_desde_archivo(file_path: str) -> Dict[str, Dict[str, float]]:
+    """
+    Carga datos de encuestas desde un archivo CSV o Excel.
+    Para obtener también el reporte de validación, usar cargar_tabla_encuestas.
+    
+    Args:
+        file_path: Ruta del archivo a cargar
+        
+    Returns:
+        Dict[str, Dict[str, float]]: Diccionario con los datos de encuestas
+        
+    Raises:
+        ValueError: Si el formato del archivo es incorrecto
+        Exception: Si hay error al cargar el archivo
+    """
+    return cargar_tabla_encuestas(file_path).como_dict()
+
+
+def cargar_historicos_desde_archivo(file_path: str) -> Dict[str, Dict[str, float]]:
+    """
+    Carga datos históricos desde un archivo CSV o Excel.
+    Para obtener también el reporte de validación, usar cargar_tabla_historicos.
+    
+    Args:
+        file_path: Ruta del archivo a cargar
+        
+    Returns:
+        Dict[str, Dict[str, float]]: Diccionario con los datos históricos
+        
+    Raises:
+        ValueError: Si el formato del archivo es incorrecto
+        Exception: Si hay error al cargar el archivo
+    """
+    return cargar_tabla_historicos(file_path).como_dict()
+
+
 def exportar_a_excel(file_path: str, datos_completos: Dict[str, Any]) -> None:
     """
     Exporta los datos de la predicción a un archivo Excel con información detallada de escaños.
@@ -166,56 +320,32 @@ def exportar_a_excel(file_path: str, datos_completos: Dict[str, Any]) -> None:
                                               columns=['Partido', 'Escaños Uninominales'])
                 df_uninominales.to_excel(writer, sheet_name='Diputados Uninominales', index=False)
 
-            # Diputados Uninominales por Departamento
-            diputados_uninominales_por_depto = datos_completos.get('diputados_uninominales_por_depto', {})
-            if diputados_uninominales_por_depto:
-                # Crear DataFrame para diputados uninominales por departamento
-                depto_data = []
-                for partido, deptos in diputados_uninominales_por_depto.items():
-                    for depto, escaños in deptos.items():
-                        depto_data.append([partido, depto, escaños])
+            # Diputados Uninominales por Departamento y Detalle de Escaños
+            resultado = datos_completos.get('resultado_escanos')
+            detalle_escanos = datos_completos.get('detalle_escanos')
+            if resultado is None and detalle_escanos:
+                resultado = ResultadoEscanos.desde_detalle(prediccion_votos, detalle_escanos)
+            if resultado is not None:
+                partidos = np.array(resultado.partidos, dtype=object)
                 
-                if depto_data:
-                    df_uninominales_depto = pd.DataFrame(depto_data, 
-                                                        columns=['Partido', 'Departamento', 'Escaños'])
+                filas_partido, columnas_depto = np.nonzero(resultado.uninominales)
+                if len(filas_partido):
+                    df_uninominales_depto = pd.DataFrame({
+                        'Partido': partidos[filas_partido],
+                        'Departamento': np.array(resultado.departamentos, dtype=object)[columnas_depto],
+                        'Escaños': resultado.uninominales[filas_partido, columnas_depto]
+                    })
                     df_uninominales_depto.to_excel(writer, sheet_name='Uninominales por Depto', index=False)
-
-            # Detalle de Escaños
-            detalle_escanos = datos_completos.get('detalle_escanos', {})
-            if detalle_escanos:
-                # Crear DataFrame para detalle de escaños
-                detalle_data = []
-                for partido, info in detalle_escanos.items():
-                    # Filtrar solo partidos reales
-                    if not isinstance(info, dict):
-                        continue
-                    if not (('senadores' in info) or ('diputados_plurinominales' in info) or ('diputados_uninominales' in info)):
-                        continue
-                    senadores = info.get('senadores', 0)
-                    diputados_plurinominales = info.get('diputados_plurinominales', 0)
-                    diputados_uninominales = info.get('diputados_uninominales', 0)
-                    total_diputados = diputados_plurinominales + diputados_uninominales
-                    total_escanos = senadores + total_diputados
-                    
-                    detalle_data.append([
-                        partido, 
-                        senadores, 
-                        diputados_plurinominales, 
-                        diputados_uninominales, 
-                        total_diputados, 
-                        total_escanos
-                    ])
-                if not detalle_data:
-                    detalle_data.append(["No hay datos de partidos", "-", "-", "-", "-", "-"])
-                detalle_columnas = [
-                    'Partido',
-                    'Senadores',
-                    'Diputados Plurinominales',
-                    'Diputados Uninominales',
-                    'Total Diputados',
-                    'Total Escaños'
-                ]
-                df_detalle = pd.DataFrame(detalle_data, columns=detalle_columnas)
+                
+                con_escanos = resultado.total_escanos > 0
+                df_detalle = pd.DataFrame({
+                    'Partido': partidos,
+                    'Senadores': resultado.senadores,
+                    'Diputados Plurinominales': resultado.plurinominales,
+                    'Diputados Uninominales': resultado.uninominales_totales,
+                    'Total Diputados': resultado.total_diputados,
+                    'Total Escaños': resultado.total_escanos
+                })[con_escanos]
                 df_detalle.to_excel(writer, sheet_name='Detalle Completo Escaños', index=False)
 
     except Exception as e:
@@ -0,0 +1,117 @@
+"""
+Utilidades para resumir la serie histórica completa de elecciones en un componente por partido
+"""
+import hashlib
+import numpy as np
+from collections import OrderedDict
+from typing import Tuple
+
+from config.settings import AÑO_ELECCION, VIDA_MEDIA_HISTORICA_DEFAULT
+
+# Ajustes ya calculados, indexados por (huella de los datos, método, año objetivo, vida media)
+_CACHE_AJUSTES: "OrderedDict[Tuple, np.ndarray]" = OrderedDict()
+_MAX_AJUSTES_EN_CACHE = 32
+
+
+def huella_historicos(años: np.ndarray, matriz: np.ndarray) -> str:
+    """
+    Calcula una huella del conjunto de datos históricos para indexar la caché de ajustes.
+
+    Args:
+        años: Años de la serie (en orden ascendente)
+        matriz: Porcentajes años x partidos
+
+    Returns:
+        str: Huella hexadecimal de los datos
+    """
+    h = hashlib.sha1()
+    h.update(np.ascontiguousarray(años, dtype=np.int64).tobytes())
+    h.update(np.asarray(matriz.shape, dtype=np.int64).tobytes())
+    h.update(np.ascontiguousarray(matriz, dtype=float).tobytes())
+    return h.hexdigest()
+
+
+def ajustar_componente_historico(años: np.ndarray, matriz: np.ndarray, metodo: str,
+                                 año_objetivo: int = AÑO_ELECCION,
+                                 vida_media: float = VIDA_MEDIA_HISTORICA_DEFAULT) -> np.ndarray:
+    """
+    Resume la serie histórica en un porcentaje por partido para el año objetivo.
+
+    Todos los partidos se ajustan a la vez con un único np.linalg.lstsq sobre la matriz
+    años x partidos; un partido ausente en un año cuenta como 0% en ese año.
+
+    - "Último año": porcentajes de la elección más reciente (comportamiento original).
+    - "Decaimiento exponencial": promedio ponderado de todos los años con pesos
+      0.5 ** ((año_objetivo - año) / vida_media).
+    - "Tendencia lineal": recta por partido (ponderada con los mismos pesos) evaluada
+      en el año objetivo; los valores negativos se recortan a 0.
+
+    Args:
+        años: Años de la serie (en orden ascendente)
+        matriz: Porcentajes años x partidos
+        metodo: Uno de OPCIONES_COMPONENTE_HISTORICO
+        año_objetivo: Año de la elección a predecir
+        vida_media: Años en los que el peso de una elección se reduce a la mitad
+
+    Returns:
+        np.ndarray: Componente histórico por partido (columnas de la matriz)
+
+    Raises:
+        ValueError: Si el método no es válido o no hay datos
+    """
+    if matriz.shape[0] == 0:
+        raise ValueError("No hay datos históricos disponibles.")
+
+    if metodo == "Último año":
+        return matriz[-1].copy()
+    if vida_media <= 0:
+        raise ValueError("La vida media del componente histórico debe ser mayor que cero.")
+
+    distancia = (año_objetivo - años).astype(float)
+    raiz_pesos = np.sqrt(0.5 ** (distancia / vida_media))[:, None]
+
+    if metodo == "Decaimiento exponencial":
+        diseño = np.ones((len(años), 1))
+    elif metodo == "Tendencia lineal":
+        if len(años) < 2:
+            return matriz[-1].copy()
+        # Año centrado en el objetivo: el intercepto es directamente la predicción
+        diseño = np.column_stack([np.ones(len(años)), -distancia])
+    else:
+        raise ValueError(f"Método de componente histórico no soportado: '{metodo}'.")
+
+    coeficientes, _, _, _ = np.linalg.lstsq(diseño * raiz_pesos, matriz * raiz_pesos, rcond=None)
+    return np.maximum(coeficientes[0], 0.0)
+
+
+def obtener_componente_historico(huella: str, años: np.ndarray, matriz: np.ndarray, metodo: str,
+                                 año_objetivo: int = AÑO_ELECCION,
+                                 vida_media: float = VIDA_MEDIA_HISTORICA_DEFAULT) -> np.ndarray:
+    """
+    Versión con caché de ajustar_componente_historico.
+
+    El ajuste solo depende de los datos y de (método, año objetivo, vida media), por lo que
+    las ejecuciones que cambian pesos, margen de error o umbral reutilizan el resultado.
+
+    Args:
+        huella: Huella de los datos (ver huella_historicos)
+        años: Años de la serie (en orden ascendente)
+        matriz: Porcentajes años x partidos
+        metodo: Uno de OPCIONES_COMPONENTE_HISTORICO
+        año_objetivo: Año de la elección a predecir
+        vida_media: Años en los que el peso de una elección se reduce a la mitad
+
+    Returns:
+        np.ndarray: Componente histórico por partido (de solo lectura)
+    """
+    clave = (huella, metodo, int(año_objetivo), float(vida_media))
+    if clave in _CACHE_AJUSTES:
+        _CACHE_AJUSTES.move_to_end(clave)
+        return _CACHE_AJUSTES[clave]
+
+    componente = ajustar_componente_historico(años, matriz, metodo, año_objetivo, vida_media)
+    componente.setflags(write=False)
+    _CACHE_AJUSTES[clave] = componente
+    if len(_CACHE_AJUSTES) > _MAX_AJUSTES_EN_CACHE:
+        _CACHE_AJUSTES.popitem(last=False)
+    return componente
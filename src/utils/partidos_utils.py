@@ -0,0 +1,110 @@
+"""
+Registro de partidos: nombres internados como ids enteros y reconciliación de alias entre años
+"""
+import unicodedata
+import numpy as np
+from typing import Dict, List, Iterable, Optional
+
+from config.settings import ALIAS_PARTIDOS
+
+
+def normalizar_nombre(nombre: str) -> str:
+    """
+    Normaliza un nombre de partido para compararlo (Unicode NFC, sin distinguir
+    mayúsculas/minúsculas y con espacios simples).
+
+    Args:
+        nombre: Nombre del partido
+
+    Returns:
+        str: Clave normalizada
+    """
+    return " ".join(unicodedata.normalize('NFC', str(nombre)).casefold().split())
+
+
+class RegistroPartidos:
+    """
+    Asigna un id entero denso a cada partido, resolviendo alias y variantes de escritura.
+
+    Los alias (por ejemplo 'MAS IPSP' -> 'MAS') se resuelven una sola vez al registrar
+    el nombre; a partir de ahí las etapas del modelo trabajan con ids.
+    """
+
+    def __init__(self, alias: Optional[Dict[str, str]] = None):
+        alias = ALIAS_PARTIDOS if alias is None else alias
+        self._alias = {normalizar_nombre(k): v for k, v in alias.items()}
+        self._ids: Dict[str, int] = {}
+        self.nombres: List[str] = []
+
+    def __len__(self) -> int:
+        return len(self.nombres)
+
+    def canonico(self, nombre: str) -> str:
+        """Obtiene el nombre canónico de un partido sin registrarlo."""
+        clave = normalizar_nombre(nombre)
+        if clave in self._alias:
+            return self._alias[clave]
+        if clave in self._ids:
+            return self.nombres[self._ids[clave]]
+        return nombre
+
+    def id(self, nombre: str) -> int:
+        """
+        Obtiene el id de un partido, registrándolo si es nuevo.
+
+        Args:
+            nombre: Nombre del partido (o uno de sus alias)
+
+        Returns:
+            int: Id del partido
+        """
+        clave = normalizar_nombre(self._alias.get(normalizar_nombre(nombre), nombre))
+        if clave not in self._ids:
+            self._ids[clave] = len(self.nombres)
+            self.nombres.append(self._alias.get(normalizar_nombre(nombre), nombre))
+        return self._ids[clave]
+
+    def ids(self, nombres: Iterable[str]) -> np.ndarray:
+        """Obtiene los ids de una secuencia de nombres."""
+        return np.array([self.id(n) for n in nombres], dtype=np.int64)
+
+    def nombre(self, id_partido: int) -> str:
+        """Obtiene el nombre canónico de un id."""
+        return self.nombres[id_partido]
+
+    def matriz(self, datos: Dict[str, Dict[str, float]]) -> np.ndarray:
+        """
+        Convierte {fila: {partido: valor}} en una matriz densa filas x ids.
+        Los valores de alias de un mismo partido en una fila se suman.
+
+        Args:
+            datos: Datos por fila (año o encuesta) y partido
+
+        Returns:
+            np.ndarray: Matriz filas x len(registro) (en el orden de datos)
+        """
+        filas = [(self.ids(valores.keys()), np.fromiter(valores.values(), dtype=float, count=len(valores)))
+                 for valores in datos.values()]
+        matriz = np.zeros((len(filas), len(self)), dtype=float)
+        for i, (ids, valores) in enumerate(filas):
+            np.add.at(matriz[i], ids, valores)
+        return matriz
+
+    def resolver(self, datos: Dict[str, Dict[str, float]]) -> Dict[str, Dict[str, float]]:
+        """
+        Reescribe {fila: {partido: valor}} con nombres canónicos.
+
+        Args:
+            datos: Datos por fila y partido con nombres tal como se cargaron
+
+        Returns:
+            Dict[str, Dict[str, float]]: Datos con nombres canónicos (alias sumados)
+        """
+        resueltos = {}
+        for fila, valores in datos.items():
+            canonicos = {}
+            for partido, valor in valores.items():
+                nombre = self.nombres[self.id(partido)]
+                canonicos[nombre] = canonicos.get(nombre, 0) + valor
+            resueltos[fila] = canonicos
+        return resueltos
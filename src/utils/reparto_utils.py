@@ -0,0 +1,220 @@
+"""
+Métodos de reparto proporcional de escaños: divisores (D'Hondt, Sainte-Laguë) y resto mayor (Hare-Niemeyer)
+"""
+import heapq
+from collections import defaultdict
+from typing import Callable, Dict, Optional
+
+import numpy as np
+
+from config.settings import METODO_REPARTO_DEFAULT
+
+# Divisor del siguiente escaño de un partido en función de los escaños que ya tiene (k = 0, 1, 2, ...)
+DIVISORES_METODOS: Dict[str, Callable[[np.ndarray], np.ndarray]] = {
+    "D'Hondt": lambda k: k + 1.0,
+    "Sainte-Laguë": lambda k: 2.0 * k + 1.0,
+    "Sainte-Laguë modificado": lambda k: np.where(k == 0, 1.4, 2.0 * k + 1.0),
+}
+METODO_RESTO_MAYOR = "Hare-Niemeyer"
+
+
+def divisores_metodo(metodo: str, num_divisores: int) -> np.ndarray:
+    """
+    Obtiene la sucesión de divisores de un método de divisores.
+
+    Args:
+        metodo: Una de las claves de DIVISORES_METODOS
+        num_divisores: Número de divisores (k = 0 .. num_divisores - 1)
+
+    Returns:
+        np.ndarray: Divisores en orden
+
+    Raises:
+        ValueError: Si el método no es un método de divisores
+    """
+    return np.asarray(_divisor(metodo)(np.arange(num_divisores, dtype=float)), dtype=float)
+
+
+def _divisor(metodo: str) -> Callable[[np.ndarray], np.ndarray]:
+    if metodo not in DIVISORES_METODOS:
+        raise ValueError(f"Método de divisores no soportado: '{metodo}'.")
+    return DIVISORES_METODOS[metodo]
+
+
+def repartir(votos_partidos: Dict[str, float], total_escanos: int, metodo: str = METODO_REPARTO_DEFAULT,
+             escanos_previos: Optional[Dict[str, int]] = None) -> Dict[str, int]:
+    """
+    Reparte escaños entre partidos con el método indicado.
+
+    Los métodos de divisores usan una cola de prioridad de cocientes; el resto mayor se
+    calcula con repartir_lote sobre una sola fila.
+
+    Args:
+        votos_partidos: Diccionario con los votos por partido
+        total_escanos: Número total de escaños a distribuir
+        metodo: Uno de OPCIONES_METODO_REPARTO
+        escanos_previos: Escaños que cada partido ya tiene (por ejemplo, uninominales en el
+            sistema compensatorio); la sucesión de divisores continúa desde ellos
+
+    Returns:
+        Dict[str, int]: Escaños asignados por partido (solo los partidos con escaños)
+    """
+    previos = escanos_previos or {}
+    if metodo == METODO_RESTO_MAYOR:
+        partidos = list(votos_partidos.keys())
+        escanos = repartir_lote(np.array([votos_partidos[p] for p in partidos], dtype=float), total_escanos,
+                                metodo, np.array([previos.get(p, 0) for p in partidos], dtype=float))[0]
+        return {partidos[j]: int(escanos[j]) for j in np.flatnonzero(escanos)}
+
+    divisor = _divisor(metodo)
+    escanos = defaultdict(int)
+
+    # Cola de prioridad (cociente negado, orden original, partido); el orden original
+    # desempata igual que el recorrido lineal por el diccionario
+    cocientes = [(-votos / float(divisor(previos.get(partido, 0))), orden, partido)
+                 for orden, (partido, votos) in enumerate(votos_partidos.items())]
+    heapq.heapify(cocientes)
+
+    for _ in range(total_escanos):
+        if not cocientes:
+            break
+
+        _, orden, ganador_escanio = cocientes[0]
+        escanos[ganador_escanio] += 1
+
+        escanos_actuales = escanos[ganador_escanio] + previos.get(ganador_escanio, 0)
+        votos_originales = votos_partidos[ganador_escanio]
+        heapq.heapreplace(cocientes, (-votos_originales / float(divisor(escanos_actuales)), orden, ganador_escanio))
+
+    return dict(escanos)
+
+
+def repartir_divisores_lote(votos: np.ndarray, total_escanos: int, metodo: str = "D'Hondt",
+                            max_elementos_bloque: int = 4000000,
+                            escanos_previos: Optional[np.ndarray] = None) -> np.ndarray:
+    """
+    Reparte escaños con un método de divisores sobre una matriz de simulaciones.
+
+    Para cada simulación se construye el tensor de cocientes votos/divisor y se toman
+    los total_escanos cocientes mayores; los empates se resuelven por orden de columna,
+    igual que en repartir. Las filas se procesan por bloques para
+    acotar la memoria usada por el tensor de cocientes.
+
+    Args:
+        votos: Matriz simulaciones x partidos con los votos de cada partido
+        total_escanos: Número total de escaños a distribuir en cada simulación
+        metodo: Una de las claves de DIVISORES_METODOS
+        max_elementos_bloque: Tamaño máximo del tensor de cocientes por bloque
+        escanos_previos: Matriz simulaciones x partidos con los escaños que cada partido ya
+            tiene; su sucesión de divisores continúa desde ellos
+
+    Returns:
+        np.ndarray: Matriz simulaciones x partidos con los escaños asignados
+    """
+    divisor = _divisor(metodo)
+    votos = np.atleast_2d(np.asarray(votos, dtype=float))
+    num_simulaciones, num_partidos = votos.shape
+    escanos = np.zeros((num_simulaciones, num_partidos), dtype=np.int64)
+
+    if num_partidos == 0 or total_escanos <= 0:
+        return escanos
+
+    pasos = np.arange(total_escanos, dtype=float)
+    divisores = np.asarray(divisor(pasos), dtype=float)
+    if escanos_previos is not None:
+        escanos_previos = np.broadcast_to(np.asarray(escanos_previos, dtype=float), votos.shape)
+    filas_bloque = max(1, max_elementos_bloque // (num_partidos * total_escanos))
+
+    for inicio in range(0, num_simulaciones, filas_bloque):
+        bloque = votos[inicio:inicio + filas_bloque]
+        filas = bloque.shape[0]
+
+        # Tensor de cocientes aplanado: la columna j corresponde al partido j // total_escanos
+        if escanos_previos is None:
+            cocientes = bloque[:, :, None] / divisores
+        else:
+            cocientes = bloque[:, :, None] / divisor(escanos_previos[inicio:inicio + filas, :, None] + pasos)
+        cocientes = cocientes.reshape(filas, -1)
+
+        # Se eligen los cocientes mayores que el total_escanos-ésimo y, entre los iguales a
+        # él, los primeros por columna: el mismo desempate que la cola de prioridad de repartir
+        limite = np.partition(cocientes, -total_escanos, axis=1)[:, -total_escanos, None]
+        iguales = cocientes == limite
+        faltantes = total_escanos - (cocientes > limite).sum(axis=1, keepdims=True)
+        elegidos = (cocientes > limite) | (iguales & (np.cumsum(iguales, axis=1) <= faltantes))
+        escanos[inicio:inicio + filas] = elegidos.reshape(filas, num_partidos, total_escanos).sum(axis=2)
+
+    return escanos
+
+
+def repartir_resto_mayor_lote(votos: np.ndarray, total_escanos: int,
+                              escanos_previos: Optional[np.ndarray] = None) -> np.ndarray:
+    """
+    Reparte escaños por resto mayor con cuota Hare (Hare-Niemeyer) sobre una matriz de
+    simulaciones: cada partido recibe la parte entera de su cuota y los escaños
+    restantes van a los mayores restos.
+
+    Con escanos_previos, la cuota de cada partido se calcula sobre el total de escaños
+    (previos más los que se reparten) y se le descuentan los que ya tiene; las cuotas
+    pendientes positivas se reescalan para sumar total_escanos.
+
+    Args:
+        votos: Matriz simulaciones x partidos con los votos de cada partido
+        total_escanos: Número total de escaños a distribuir en cada simulación
+        escanos_previos: Matriz simulaciones x partidos con los escaños que cada partido ya tiene
+
+    Returns:
+        np.ndarray: Matriz simulaciones x partidos con los escaños asignados
+    """
+    votos = np.atleast_2d(np.asarray(votos, dtype=float))
+    num_simulaciones, num_partidos = votos.shape
+    if num_partidos == 0 or total_escanos <= 0:
+        return np.zeros((num_simulaciones, num_partidos), dtype=np.int64)
+
+    totales = votos.sum(axis=1, keepdims=True)
+    proporciones = np.divide(votos, totales, out=np.zeros_like(votos), where=totales > 0)
+    if escanos_previos is None:
+        cuotas = proporciones * total_escanos
+    else:
+        previos = np.broadcast_to(np.asarray(escanos_previos, dtype=float), votos.shape)
+        pendientes = np.maximum(proporciones * (total_escanos + previos.sum(axis=1, keepdims=True)) - previos, 0.0)
+        suma_pendientes = pendientes.sum(axis=1, keepdims=True)
+        cuotas = np.divide(pendientes * total_escanos, suma_pendientes, out=np.zeros_like(pendientes),
+                           where=suma_pendientes > 0)
+
+    # Se redondean las cuotas para que los restos iguales salvo error de coma flotante
+    # empaten y se desempaten por columna
+    cuotas = np.round(cuotas, 9)
+    enteros = np.floor(cuotas)
+    restantes = np.where(cuotas.sum(axis=1) > 0, total_escanos - enteros.sum(axis=1), 0)
+
+    # Posición de cada partido en el orden de restos (desempate por orden de columna)
+    orden = np.argsort(-(cuotas - enteros), axis=1, kind='stable')
+    posiciones = np.empty_like(orden)
+    np.put_along_axis(posiciones, orden, np.arange(num_partidos)[None, :], axis=1)
+
+    return (enteros + (posiciones < restantes[:, None])).astype(np.int64)
+
+
+def repartir_lote(votos: np.ndarray, total_escanos: int, metodo: str = METODO_REPARTO_DEFAULT,
+                  escanos_previos: Optional[np.ndarray] = None,
+                  max_elementos_bloque: int = 4000000) -> np.ndarray:
+    """
+    Reparte escaños con el método indicado sobre una matriz de simulaciones.
+
+    Args:
+        votos: Matriz simulaciones x partidos con los votos de cada partido
+        total_escanos: Número total de escaños a distribuir en cada simulación
+        metodo: Uno de OPCIONES_METODO_REPARTO
+        escanos_previos: Matriz simulaciones x partidos con los escaños que cada partido ya tiene
+        max_elementos_bloque: Ver repartir_divisores_lote
+
+    Returns:
+        np.ndarray: Matriz simulaciones x partidos con los escaños asignados
+
+    Raises:
+        ValueError: Si el método no es soportado
+    """
+    if metodo == METODO_RESTO_MAYOR:
+        return repartir_resto_mayor_lote(votos, total_escanos, escanos_previos)
+    return repartir_divisores_lote(votos, total_escanos, metodo, max_elementos_bloque, escanos_previos)
@@ -0,0 +1,110 @@
+"""
+Modelos de ruido para simular la incertidumbre de la predicción de votos
+"""
+import numpy as np
+from typing import Optional
+
+
+def ruido_uniforme(proporciones: np.ndarray, margen_error: float, num_simulaciones: int,
+                   generador: np.random.Generator) -> np.ndarray:
+    """
+    Variación relativa uniforme e independiente por partido en ±margen_error (sin normalizar).
+
+    Args:
+        proporciones: Predicción base por partido
+        margen_error: Variación relativa máxima
+        num_simulaciones: Número de simulaciones
+        generador: Generador aleatorio
+
+    Returns:
+        np.ndarray: Matriz simulaciones x partidos (no negativa)
+    """
+    variacion = generador.uniform(-margen_error, margen_error, size=(num_simulaciones, proporciones.shape[0]))
+    return np.maximum(0, proporciones * (1 + variacion))
+
+
+def concentracion_dirichlet(proporciones: np.ndarray, margen_error: float) -> float:
+    """
+    Concentración de la Dirichlet cuyo partido mayor tiene la misma desviación relativa
+    que el ruido uniforme en ±margen_error (margen_error / sqrt(3)).
+
+    Para una Dirichlet de concentración a, Var(p_i) = p_i (1 - p_i) / (a + 1).
+
+    Args:
+        proporciones: Proporciones por partido (suman 1)
+        margen_error: Variación relativa máxima del modelo uniforme
+
+    Returns:
+        float: Concentración total a
+    """
+    p_max = float(proporciones.max())
+    if p_max >= 1 or margen_error <= 0:
+        return np.inf
+    return 3 * (1 - p_max) / (p_max * margen_error ** 2) - 1
+
+
+def ruido_dirichlet(proporciones: np.ndarray, margen_error: float, num_simulaciones: int,
+                    generador: np.random.Generator) -> np.ndarray:
+    """
+    Muestras Dirichlet centradas en la predicción base, que suman 1 por construcción.
+
+    Se generan como gammas normalizadas en una sola extracción simulaciones x partidos; los
+    partidos con 0% tienen parámetro 0 y se quedan en 0.
+
+    Args:
+        proporciones: Proporciones por partido (suman 1)
+        margen_error: Variación relativa máxima del modelo uniforme (ver concentracion_dirichlet)
+        num_simulaciones: Número de simulaciones
+        generador: Generador aleatorio
+
+    Returns:
+        np.ndarray: Matriz simulaciones x partidos con proporciones
+    """
+    concentracion = concentracion_dirichlet(proporciones, margen_error)
+    if not np.isfinite(concentracion):
+        return np.tile(proporciones, (num_simulaciones, 1))
+    gammas = generador.standard_gamma(proporciones * concentracion, size=(num_simulaciones, proporciones.shape[0]))
+    return gammas / gammas.sum(axis=1, keepdims=True)
+
+
+def ruido_logistico_normal(proporciones: np.ndarray, margen_error: float, num_simulaciones: int,
+                           generador: np.random.Generator,
+                           covarianza: Optional[np.ndarray] = None) -> np.ndarray:
+    """
+    Ruido normal multivariado sobre el logaritmo de las proporciones, seguido de softmax.
+
+    Permite correlacionar partidos (por ejemplo, transferencias entre dos alianzas) con
+    la matriz de covarianza. Los partidos con 0% se quedan en 0.
+
+    Args:
+        proporciones: Proporciones por partido (suman 1)
+        margen_error: Variación relativa máxima del modelo uniforme; sin covarianza se usa
+            una diagonal con desviación margen_error / sqrt(3)
+        num_simulaciones: Número de simulaciones
+        generador: Generador aleatorio
+        covarianza: Matriz partidos x partidos sobre el logaritmo de las proporciones
+
+    Returns:
+        np.ndarray: Matriz simulaciones x partidos con proporciones
+
+    Raises:
+        ValueError: Si la covarianza no tiene la forma partidos x partidos
+    """
+    num_partidos = proporciones.shape[0]
+    if covarianza is None:
+        covarianza = np.eye(num_partidos) * (margen_error ** 2 / 3)
+    covarianza = np.asarray(covarianza, dtype=float)
+    if covarianza.shape != (num_partidos, num_partidos):
+        raise ValueError(f"La covarianza debe ser de {num_partidos} x {num_partidos} (una fila por partido).")
+
+    positivos = proporciones > 0
+    logits = np.full(num_partidos, -np.inf)
+    logits[positivos] = np.log(proporciones[positivos])
+
+    perturbacion = generador.multivariate_normal(np.zeros(num_partidos), covarianza, size=num_simulaciones,
+                                                 method='cholesky' if np.all(np.linalg.eigvalsh(covarianza) > 0)
+                                                 else 'svd')
+    logits = logits + perturbacion
+    logits -= logits.max(axis=1, keepdims=True)
+    exponenciales = np.exp(logits)
+    return exponenciales / exponenciales.sum(axis=1, keepdims=True)
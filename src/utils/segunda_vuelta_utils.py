@@ -0,0 +1,246 @@
+"""
+Segunda vuelta: matriz de transferencia de votos de los partidos eliminados a los finalistas
+"""
+import numpy as np
+from dataclasses import dataclass
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+
+from config.settings import ABSTENCION_SEGUNDA_VUELTA_DEFAULT
+from utils.partidos_utils import RegistroPartidos
+
+
+@dataclass
+class TransferenciaVotos:
+    """
+    Fracción de los votantes de cada partido de primera vuelta (origenes) que vota por
+    cada partido en segunda vuelta (destinos). Lo que falta para 1 en una fila se
+    abstiene o vota blanco/nulo, igual que lo asignado a partidos que no son finalistas.
+    """
+    origenes: List[str]
+    destinos: List[str]
+    fracciones: np.ndarray
+
+    def matriz(self, partidos: Sequence[str], finalistas: Sequence[str]) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Obtiene la matriz partidos x 3 (primer finalista, segundo finalista, abstención)
+        para un par de finalistas. Los finalistas conservan a sus votantes.
+
+        Args:
+            partidos: Partidos en el orden de las filas
+            finalistas: Los dos partidos que pasan a segunda vuelta
+
+        Returns:
+            Tuple[np.ndarray, np.ndarray]: (matriz partidos x 3, máscara de los partidos sin
+                fila en la matriz, cuyas filas quedan en 0)
+        """
+        indice_origen = {p: i for i, p in enumerate(self.origenes)}
+        indice_destino = {p: j for j, p in enumerate(self.destinos)}
+        filas = np.array([indice_origen.get(p, -1) for p in partidos], dtype=np.int64)
+        columnas = np.array([indice_destino.get(f, -1) for f in finalistas], dtype=np.int64)
+
+        # Fila y columna extra de ceros para los que no están en la matriz (índice -1)
+        ampliada = np.zeros((len(self.origenes) + 1, len(self.destinos) + 1))
+        ampliada[:-1, :-1] = self.fracciones
+        a_finalistas = ampliada[np.ix_(filas, columnas)]
+
+        matriz = np.column_stack([a_finalistas, 1.0 - a_finalistas.sum(axis=1)])
+        sin_datos = filas < 0
+        matriz[sin_datos] = 0.0
+        for k, finalista in enumerate(finalistas):
+            es_finalista = np.array([p == finalista for p in partidos], dtype=bool)
+            matriz[es_finalista] = np.eye(3)[k]
+            sin_datos &= ~es_finalista
+        return matriz, sin_datos
+
+    def como_clave(self) -> list:
+        """Representación serializable para las claves de caché."""
+        return [self.origenes, self.destinos, self.fracciones.tolist()]
+
+
+def cargar_transferencia_votos(file_path: str) -> TransferenciaVotos:
+    """
+    Carga la matriz de transferencia desde un archivo CSV con la columna 'Partido'
+    (partido de primera vuelta) y una columna por partido de segunda vuelta con el
+    porcentaje de sus votantes que lo vota. Las celdas vacías valen 0, el resto de
+    cada fila es abstención y los nombres de partidos se resuelven con sus alias.
+
+    Args:
+        file_path: Ruta del archivo CSV
+
+    Returns:
+        TransferenciaVotos: Fracciones del archivo
+
+    Raises:
+        ValueError: Si falta la columna 'Partido', hay partidos repetidos, algún
+            porcentaje es negativo o una fila suma más de 100
+    """
+    import pandas as pd
+
+    df = pd.read_csv(file_path)
+    if 'Partido' not in df.columns:
+        raise ValueError("El archivo de transferencia de votos debe contener la columna: Partido.")
+
+    registro = RegistroPartidos()
+    origenes = [registro.canonico(str(p).strip()) for p in df['Partido']]
+    if len(set(origenes)) != len(origenes):
+        raise ValueError("El archivo de transferencia de votos tiene partidos repetidos.")
+
+    columnas = [col for col in df.columns if col != 'Partido']
+    porcentajes = df[columnas].apply(pd.to_numeric, errors='coerce').fillna(0.0).to_numpy(dtype=float)
+    porcentajes = porcentajes.reshape(len(origenes), len(columnas))
+    if np.any(porcentajes < 0):
+        raise ValueError("Los porcentajes de transferencia no pueden ser negativos.")
+    if np.any(porcentajes.sum(axis=1) > 100 + 1e-9):
+        raise ValueError("Los porcentajes de transferencia de un partido no pueden sumar más de 100.")
+
+    return TransferenciaVotos(
+        origenes=origenes,
+        destinos=[registro.canonico(str(p).strip()) for p in columnas],
+        fracciones=porcentajes / 100
+    )
+
+
+def muestrear_transferencias(matriz: np.ndarray, num_simulaciones: int, concentracion: float,
+                             generador: np.random.Generator) -> np.ndarray:
+    """
+    Muestras Dirichlet de cada fila de la matriz de transferencia, centradas en ella.
+
+    Args:
+        matriz: Matriz partidos x 3 (ver TransferenciaVotos.matriz)
+        num_simulaciones: Número de simulaciones
+        concentracion: Concentración de cada fila (mayor = menos incertidumbre)
+        generador: Generador aleatorio
+
+    Returns:
+        np.ndarray: Tensor simulaciones x partidos x 3 (las filas en 0 quedan en 0)
+    """
+    gammas = generador.standard_gamma(np.broadcast_to(matriz * concentracion,
+                                                      (num_simulaciones,) + matriz.shape))
+    totales = gammas.sum(axis=2, keepdims=True)
+    return np.divide(gammas, totales, out=np.zeros_like(gammas), where=totales > 0)
+
+
+def transferir_votos_lote(votos: np.ndarray, matriz: np.ndarray, sin_datos: np.ndarray,
+                          indices_finalistas: Sequence[int],
+                          abstencion: float = ABSTENCION_SEGUNDA_VUELTA_DEFAULT) -> np.ndarray:
+    """
+    Votos de segunda vuelta como producto de los votos de primera vuelta por la matriz
+    de transferencia: uno solo si la matriz es común, o un producto por lotes si hay
+    una matriz por simulación.
+
+    Los partidos sin fila en la matriz pierden la fracción abstencion y reparten el
+    resto en proporción a la votación de los finalistas en cada simulación.
+
+    Args:
+        votos: Matriz simulaciones x partidos con los porcentajes de primera vuelta
+        matriz: Matriz partidos x 3 o tensor simulaciones x partidos x 3
+        sin_datos: Máscara de los partidos sin fila en la matriz
+        indices_finalistas: Columnas de los dos finalistas
+        abstencion: Fracción que se abstiene de los partidos sin fila
+
+    Returns:
+        np.ndarray: Matriz simulaciones x 3 (primer finalista, segundo finalista,
+            abstención) en porcentaje de los votos de primera vuelta
+    """
+    votos = np.atleast_2d(np.asarray(votos, dtype=float))
+    if matriz.ndim == 2:
+        resultado = votos @ matriz
+    else:
+        resultado = np.matmul(votos[:, None, :], matriz)[:, 0, :]
+
+    votos_sin_datos = votos[:, sin_datos].sum(axis=1)
+    finalistas = votos[:, list(indices_finalistas)]
+    suma_finalistas = finalistas.sum(axis=1, keepdims=True)
+    reparto = np.divide(finalistas, suma_finalistas, out=np.full_like(finalistas, 0.5),
+                        where=suma_finalistas > 0)
+    resultado[:, :2] += votos_sin_datos[:, None] * (1 - abstencion) * reparto
+    resultado[:, 2] += votos_sin_datos * abstencion
+    return resultado
+
+
+def resumir_segunda_vuelta(transferidos: np.ndarray, finalistas: Sequence[str],
+                           percentiles: Sequence[float] = (5, 50, 95)) -> Dict[str, Any]:
+    """
+    Resume los votos transferidos de muchas simulaciones: P(victoria) de cada finalista
+    y bandas de su porcentaje de votos válidos y de la abstención.
+
+    Args:
+        transferidos: Matriz simulaciones x 3 (ver transferir_votos_lote)
+        finalistas: Los dos finalistas
+        percentiles: Percentiles de las bandas
+
+    Returns:
+        Dict con la probabilidad de victoria, la media y los percentiles por finalista
+    """
+    validos = transferidos[:, :2].sum(axis=1, keepdims=True)
+    porcentajes = np.divide(transferidos[:, :2] * 100, validos, out=np.full_like(transferidos[:, :2], 50.0),
+                            where=validos > 0)
+    abstencion = np.divide(transferidos[:, 2] * 100, transferidos.sum(axis=1),
+                           out=np.zeros(len(transferidos)), where=transferidos.sum(axis=1) > 0)
+    bandas = np.percentile(porcentajes, percentiles, axis=0)
+    bandas_abstencion = np.percentile(abstencion, percentiles)
+
+    # Un empate exacto cuenta como media victoria para cada finalista
+    diferencia = porcentajes[:, 0] - porcentajes[:, 1]
+    prob_primero = float(np.mean(diferencia > 0) + 0.5 * np.mean(diferencia == 0))
+
+    return {
+        'finalistas': list(finalistas),
+        'num_simulaciones': len(transferidos),
+        'prob_victoria': {finalistas[0]: prob_primero, finalistas[1]: 1.0 - prob_primero},
+        'media': {f: float(porcentajes[:, k].mean()) for k, f in enumerate(finalistas)},
+        'percentiles': {
+            f: {pc: float(bandas[i, k]) for i, pc in enumerate(percentiles)}
+            for k, f in enumerate(finalistas)
+        },
+        'abstencion': {
+            'media': float(abstencion.mean()),
+            'percentiles': {pc: float(bandas_abstencion[i]) for i, pc in enumerate(percentiles)}
+        }
+    }
+
+
+def simular_segunda_vuelta_lote(votos: np.ndarray, partidos: Sequence[str], finalistas: Sequence[str],
+                                transferencia: Optional[TransferenciaVotos] = None,
+                                abstencion: float = ABSTENCION_SEGUNDA_VUELTA_DEFAULT,
+                                concentracion: Optional[float] = None,
+                                generadores: Optional[Iterable[Tuple[np.random.Generator, int]]] = None,
+                                percentiles: Sequence[float] = (5, 50, 95)) -> Dict[str, Any]:
+    """
+    Simula la segunda vuelta sobre una matriz de simulaciones de primera vuelta.
+
+    Args:
+        votos: Matriz simulaciones x partidos con los porcentajes de primera vuelta
+        partidos: Partidos en el orden de las columnas
+        finalistas: Los dos partidos que pasan a segunda vuelta
+        transferencia: Matriz de transferencia (None: todos los partidos eliminados usan
+            abstencion y el reparto proporcional)
+        abstencion: Ver transferir_votos_lote
+        concentracion: Si se indica, cada simulación usa una matriz muestreada alrededor
+            de la de transferencia (ver muestrear_transferencias)
+        generadores: Pares (generador, número de filas) que cubren las simulaciones en
+            orden (por ejemplo, aleatorio_utils.generadores_por_unidad); por defecto, un
+            único generador sin semilla
+        percentiles: Percentiles de las bandas
+
+    Returns:
+        Dict con la probabilidad de victoria y las bandas (ver resumir_segunda_vuelta)
+
+    Raises:
+        ValueError: Si no hay dos finalistas distintos entre los partidos
+    """
+    partidos = list(partidos)
+    if len(finalistas) != 2 or finalistas[0] == finalistas[1] or any(f not in partidos for f in finalistas):
+        raise ValueError("La segunda vuelta requiere dos finalistas distintos entre los partidos.")
+
+    votos = np.atleast_2d(np.asarray(votos, dtype=float))
+    transferencia = transferencia or TransferenciaVotos([], [], np.zeros((0, 0)))
+    matriz, sin_datos = transferencia.matriz(partidos, finalistas)
+    if concentracion is not None:
+        generadores = generadores or [(np.random.default_rng(), votos.shape[0])]
+        matriz = np.concatenate([muestrear_transferencias(matriz, tamano, concentracion, generador)
+                                 for generador, tamano in generadores])
+
+    transferidos = transferir_votos_lote(votos, matriz, sin_datos,
+                                         [partidos.index(f) for f in finalistas], abstencion)
+    return resumir_segunda_vuelta(transferidos, finalistas, percentiles)
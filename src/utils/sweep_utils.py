@@ -0,0 +1,241 @@
+"""
+Utilidades para evaluar barridos de parámetros del modelo predictivo sin interfaz gráfica
+"""
+import csv
+import itertools
+import json
+import os
+import numpy as np
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, List, Any, Sequence, TextIO, Tuple, Optional
+
+from models.electoral_model import ModeloPredictivoElectoral
+from config.settings import COMPONENTE_HISTORICO_DEFAULT, MODELO_RUIDO_DEFAULT, METODO_REPARTO_DEFAULT
+from utils.aleatorio_utils import secuencia_hija
+from utils.variacion_regional_utils import VariacionRegional
+from utils.segunda_vuelta_utils import TransferenciaVotos
+
+
+COLUMNAS_RESULTADO = [
+    'escenario', 'peso_historico', 'peso_encuestas', 'margen_error', 'tendencia', 'umbral_minimo',
+    'componente_historico', 'modelo_ruido', 'metodo_reparto',
+    'partido', 'votos', 'senadores', 'diputados', 'diputados_plurinominales', 'diputados_uninominales',
+    'segunda_vuelta', 'finalista', 'votos_segunda_vuelta'
+]
+
+# Modelo y semilla raíz de cada proceso de trabajo; se crean una sola vez por proceso en _inicializar_worker
+_MODELO_WORKER: Optional[ModeloPredictivoElectoral] = None
+_SEMILLA_WORKER: Optional[int] = None
+
+
+def generar_grilla_parametros(peso_historico: Sequence[float], peso_encuestas: Sequence[float],
+                              margen_error: Sequence[float], tendencia: Sequence[str],
+                              umbral_minimo: Sequence[float],
+                              componente_historico: Sequence[str] = (COMPONENTE_HISTORICO_DEFAULT,),
+                              modelo_ruido: Sequence[str] = (MODELO_RUIDO_DEFAULT,),
+                              metodo_reparto: Sequence[str] = (METODO_REPARTO_DEFAULT,)
+                              ) -> List[Dict[str, Any]]:
+    """
+    Genera todas las combinaciones de parámetros del modelo.
+
+    Las combinaciones cuyos pesos suman cero se descartan, igual que en la interfaz.
+
+    Args:
+        peso_historico: Valores a evaluar para el peso de los datos históricos
+        peso_encuestas: Valores a evaluar para el peso de las encuestas
+        margen_error: Valores a evaluar para el margen de error
+        tendencia: Valores a evaluar para el ajuste de tendencia
+        umbral_minimo: Valores a evaluar para el umbral mínimo
+        componente_historico: Métodos a evaluar para el componente histórico
+        modelo_ruido: Modelos de ruido a evaluar
+        metodo_reparto: Métodos de reparto de escaños a evaluar
+
+    Returns:
+        List[Dict[str, Any]]: Lista de combinaciones de parámetros
+    """
+    grilla = []
+    for ph, pe, me, te, um, ch, mr, mt in itertools.product(peso_historico, peso_encuestas, margen_error,
+                                                            tendencia, umbral_minimo, componente_historico,
+                                                            modelo_ruido, metodo_reparto):
+        if ph + pe == 0:
+            continue
+        grilla.append({
+            'peso_historico': ph,
+            'peso_encuestas': pe,
+            'margen_error': me,
+            'tendencia': te,
+            'umbral_minimo': um,
+            'componente_historico': ch,
+            'modelo_ruido': mr,
+            'metodo_reparto': mt
+        })
+    return grilla
+
+
+def evaluar_escenario(modelo: ModeloPredictivoElectoral, escenario: int,
+                      parametros: Dict[str, Any], semilla: Optional[int] = None) -> List[Dict[str, Any]]:
+    """
+    Ejecuta el modelo con una combinación de parámetros y devuelve una fila por partido.
+
+    Con semilla, el escenario usa el flujo aleatorio hijo número escenario de esa semilla,
+    de modo que su resultado no depende de qué proceso lo evalúe ni en qué orden.
+
+    Args:
+        modelo: Modelo con los datos históricos y encuestas ya cargados
+        escenario: Identificador del escenario dentro del barrido
+        parametros: Combinación de parámetros a evaluar
+        semilla: Semilla raíz del barrido (None: resultados no reproducibles)
+
+    Returns:
+        List[Dict[str, Any]]: Filas del resultado en formato largo (escenario x partido)
+    """
+    modelo.configurar_parametros(
+        parametros['peso_historico'],
+        parametros['peso_encuestas'],
+        parametros['margen_error'],
+        parametros['tendencia'],
+        parametros['umbral_minimo'],
+        parametros.get('componente_historico'),
+        semilla=secuencia_hija(np.random.SeedSequence(semilla), escenario) if semilla is not None else None,
+        modelo_ruido=parametros.get('modelo_ruido'),
+        metodo_reparto=parametros.get('metodo_reparto')
+    )
+    modelo.ejecutar_prediccion()
+    segunda_vuelta = modelo.simular_segunda_vuelta()
+
+    filas = []
+    for partido, votos in modelo.prediccion_2025.items():
+        filas.append({
+            'escenario': escenario,
+            **parametros,
+            'partido': partido,
+            'votos': round(votos, 4),
+            'senadores': modelo.senadores_2025.get(partido, 0),
+            'diputados': modelo.diputados_2025.get(partido, 0),
+            'diputados_plurinominales': modelo.diputados_plurinominales_2025.get(partido, 0),
+            'diputados_uninominales': modelo.diputados_uninominales_2025.get(partido, 0),
+            'segunda_vuelta': modelo.segunda_vuelta,
+            'finalista': partido in modelo.candidatos_segunda_vuelta,
+            'votos_segunda_vuelta': round(segunda_vuelta[partido], 4) if partido in segunda_vuelta else None
+        })
+    return filas
+
+
+def _evaluar_lote(modelo: ModeloPredictivoElectoral, lote: List[Tuple[int, Dict[str, Any]]],
+                  semilla: Optional[int] = None) -> Tuple[List[Dict[str, Any]], List[Tuple[int, str]]]:
+    """
+    Evalúa un lote de escenarios con un mismo modelo.
+
+    Returns:
+        Tuple[List[Dict[str, Any]], List[Tuple[int, str]]]: (filas, errores por escenario)
+    """
+    filas = []
+    errores = []
+    for escenario, parametros in lote:
+        try:
+            filas.extend(evaluar_escenario(modelo, escenario, parametros, semilla))
+        except ValueError as ve:
+            errores.append((escenario, str(ve)))
+    return filas, errores
+
+
+def _inicializar_worker(datos_historicos: Dict[str, Dict[str, float]],
+                        encuestas_2025: Dict[str, Dict[str, float]], semilla: Optional[int] = None,
+                        metadatos_encuestas: Optional[Dict[str, Dict[str, Any]]] = None,
+                        variacion_regional: Optional[VariacionRegional] = None,
+                        transferencia_votos: Optional[TransferenciaVotos] = None) -> None:
+    """Carga los datos de solo lectura una vez por proceso de trabajo."""
+    global _MODELO_WORKER, _SEMILLA_WORKER
+    _SEMILLA_WORKER = semilla
+    _MODELO_WORKER = ModeloPredictivoElectoral()
+    _MODELO_WORKER.cargar_datos_historicos(datos_historicos)
+    _MODELO_WORKER.cargar_encuestas(encuestas_2025, metadatos_encuestas)
+    _MODELO_WORKER.cargar_variacion_regional(variacion_regional)
+    _MODELO_WORKER.cargar_transferencia_votos(transferencia_votos)
+
+
+def _evaluar_lote_worker(lote: List[Tuple[int, Dict[str, Any]]]) -> Tuple[List[Dict[str, Any]], List[Tuple[int, str]]]:
+    """Evalúa un lote de escenarios con el modelo del proceso de trabajo."""
+    return _evaluar_lote(_MODELO_WORKER, lote, _SEMILLA_WORKER)
+
+
+def ejecutar_barrido(datos_historicos: Dict[str, Dict[str, float]],
+                     encuestas_2025: Dict[str, Dict[str, float]],
+                     grilla: List[Dict[str, Any]], num_procesos: Optional[int] = None,
+                     tamano_lote: Optional[int] = None,
+                     semilla: Optional[int] = None,
+                     metadatos_encuestas: Optional[Dict[str, Dict[str, Any]]] = None,
+                     variacion_regional: Optional[VariacionRegional] = None,
+                     transferencia_votos: Optional[TransferenciaVotos] = None
+                     ) -> Tuple[List[Dict[str, Any]], List[Tuple[int, str]]]:
+    """
+    Evalúa una grilla de parámetros repartiéndola entre varios procesos.
+
+    Los datos históricos y las encuestas se envían una sola vez a cada proceso
+    (en su inicialización); cada tarea solo transporta un lote de combinaciones.
+
+    Args:
+        datos_historicos: Datos históricos de elecciones
+        encuestas_2025: Datos de encuestas
+        grilla: Combinaciones de parámetros (ver generar_grilla_parametros)
+        num_procesos: Número de procesos (por defecto, número de CPUs); 1 evalúa en el proceso actual
+        tamano_lote: Escenarios por tarea (por defecto, unas 4 tareas por proceso)
+        semilla: Semilla raíz; cada escenario usa su propio flujo hijo, así que el resultado
+            es el mismo con cualquier número de procesos o tamaño de lote
+        metadatos_encuestas: Fecha, muestra y encuestadora por encuesta, si se conocen
+        variacion_regional: Matriz de variación regional (por defecto, la del archivo de datos)
+        transferencia_votos: Matriz de transferencia de la segunda vuelta (por defecto, ninguna)
+
+    Returns:
+        Tuple[List[Dict[str, Any]], List[Tuple[int, str]]]: (filas en formato largo ordenadas
+        por escenario, errores por escenario)
+    """
+    num_procesos = num_procesos or os.cpu_count() or 1
+    escenarios = list(enumerate(grilla))
+
+    if num_procesos == 1 or len(escenarios) <= 1:
+        modelo = ModeloPredictivoElectoral()
+        modelo.cargar_datos_historicos(datos_historicos)
+        modelo.cargar_encuestas(encuestas_2025, metadatos_encuestas)
+        modelo.cargar_variacion_regional(variacion_regional)
+        modelo.cargar_transferencia_votos(transferencia_votos)
+        return _evaluar_lote(modelo, escenarios, semilla)
+
+    if tamano_lote is None:
+        tamano_lote = max(1, len(escenarios) // (num_procesos * 4))
+    lotes = [escenarios[i:i + tamano_lote] for i in range(0, len(escenarios), tamano_lote)]
+
+    filas = []
+    errores = []
+    with ProcessPoolExecutor(max_workers=num_procesos, initializer=_inicializar_worker,
+                             initargs=(datos_historicos, encuestas_2025, semilla, metadatos_encuestas,
+                                       variacion_regional, transferencia_votos)) as executor:
+        # map conserva el orden de los lotes, por lo que las filas quedan ordenadas por escenario
+        for filas_lote, errores_lote in executor.map(_evaluar_lote_worker, lotes):
+            filas.extend(filas_lote)
+            errores.extend(errores_lote)
+
+    return filas, errores
+
+
+def escribir_resultados(filas: List[Dict[str, Any]], salida: TextIO, formato: str = 'jsonl') -> None:
+    """
+    Escribe las filas de resultados en formato JSON Lines o CSV.
+
+    Args:
+        filas: Filas del resultado en formato largo
+        salida: Archivo de texto abierto donde escribir
+        formato: 'jsonl' o 'csv'
+
+    Raises:
+        ValueError: Si el formato no es soportado
+    """
+    if formato == 'jsonl':
+        for fila in filas:
+            salida.write(json.dumps(fila, ensure_ascii=False) + "\n")
+    elif formato == 'csv':
+        escritor = csv.DictWriter(salida, fieldnames=COLUMNAS_RESULTADO, extrasaction='ignore')
+        escritor.writeheader()
+        escritor.writerows(filas)
+    else:
+        raise ValueError(f"Formato de salida no soportado: '{formato}'. Use 'jsonl' o 'csv'.")
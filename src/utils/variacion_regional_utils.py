@@ -0,0 +1,138 @@
+"""
+Variación regional: matriz departamentos x partidos de fuerza relativa de cada partido en cada departamento
+"""
+import os
+import numpy as np
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Dict, List, Optional, Sequence
+
+from utils.partidos_utils import RegistroPartidos
+
+ARCHIVO_VARIACION_REGIONAL = os.path.join(os.path.dirname(__file__), '..', 'data', 'variacion_regional.csv')
+
+
+@dataclass
+class VariacionRegional:
+    """
+    Factores de fuerza regional: el porcentaje de un partido en un departamento es su
+    porcentaje nacional por el factor, normalizado sobre los partidos del departamento.
+    Los partidos o departamentos sin factor usan 1 (sin variación).
+    """
+    departamentos: List[str]
+    partidos: List[str]
+    factores: np.ndarray
+
+    def matriz(self, partidos: Sequence[str], departamentos: Sequence[str]) -> np.ndarray:
+        """
+        Reordena los factores según los departamentos y partidos de la simulación.
+
+        Args:
+            partidos: Partidos en el orden de las columnas
+            departamentos: Departamentos en el orden de las filas
+
+        Returns:
+            np.ndarray: Matriz departamentos x partidos con los factores
+        """
+        indice_depto = {d: i for i, d in enumerate(self.departamentos)}
+        indice_partido = {p: j for j, p in enumerate(self.partidos)}
+        filas = np.array([indice_depto.get(d, -1) for d in departamentos], dtype=np.int64)
+        columnas = np.array([indice_partido.get(p, -1) for p in partidos], dtype=np.int64)
+
+        # Columna y fila extra de unos para los que no están en la matriz (índice -1)
+        ampliada = np.ones((len(self.departamentos) + 1, len(self.partidos) + 1))
+        ampliada[:-1, :-1] = self.factores
+        return ampliada[np.ix_(filas, columnas)]
+
+    def como_clave(self) -> list:
+        """Representación serializable para las claves de caché."""
+        return [self.departamentos, self.partidos, self.factores.tolist()]
+
+
+def cargar_variacion_regional(file_path: str = ARCHIVO_VARIACION_REGIONAL) -> VariacionRegional:
+    """
+    Carga la matriz de variación regional desde un archivo CSV con la columna
+    'Departamento' y una columna por partido con su factor en ese departamento.
+    Las celdas vacías valen 1 y los nombres de partidos se resuelven con sus alias.
+
+    Args:
+        file_path: Ruta del archivo CSV
+
+    Returns:
+        VariacionRegional: Factores del archivo
+
+    Raises:
+        ValueError: Si falta la columna 'Departamento', hay departamentos repetidos
+            o algún factor es negativo
+    """
+    import pandas as pd
+
+    df = pd.read_csv(file_path)
+    if 'Departamento' not in df.columns:
+        raise ValueError("El archivo de variación regional debe contener la columna: Departamento.")
+
+    departamentos = df['Departamento'].astype(str).str.strip().tolist()
+    if len(set(departamentos)) != len(departamentos):
+        raise ValueError("El archivo de variación regional tiene departamentos repetidos.")
+
+    columnas = [col for col in df.columns if col != 'Departamento']
+    factores = df[columnas].apply(pd.to_numeric, errors='coerce').fillna(1.0).to_numpy(dtype=float)
+    if np.any(factores < 0):
+        raise ValueError("Los factores de variación regional no pueden ser negativos.")
+
+    registro = RegistroPartidos()
+    return VariacionRegional(
+        departamentos=departamentos,
+        partidos=[registro.canonico(str(p).strip()) for p in columnas],
+        factores=factores.reshape(len(departamentos), len(columnas))
+    )
+
+
+@lru_cache(maxsize=1)
+def obtener_variacion_regional() -> VariacionRegional:
+    """Obtiene la variación regional del archivo por defecto (se lee una sola vez)."""
+    return cargar_variacion_regional()
+
+
+def estimar_variacion_regional(porcentajes_por_depto: Dict[str, Dict[str, float]],
+                               porcentajes_nacionales: Optional[Dict[str, float]] = None,
+                               votos_validos_por_depto: Optional[Dict[str, float]] = None) -> VariacionRegional:
+    """
+    Estima la variación regional de una elección anterior como el cociente entre el
+    porcentaje de cada partido en el departamento y su porcentaje nacional.
+
+    Args:
+        porcentajes_por_depto: Porcentajes por departamento y partido
+        porcentajes_nacionales: Porcentajes nacionales por partido
+        votos_validos_por_depto: Votos válidos por departamento; sin porcentajes
+            nacionales, estos se calculan como el promedio de los departamentos
+            ponderado por sus votos válidos
+
+    Returns:
+        VariacionRegional: Factores estimados (1 donde el partido no tiene votos nacionales)
+
+    Raises:
+        ValueError: Si no se indican ni los porcentajes nacionales ni los votos válidos,
+            o si faltan los votos válidos de algún departamento o suman cero
+    """
+    registro = RegistroPartidos()
+    por_depto = registro.resolver(porcentajes_por_depto)
+    departamentos = list(por_depto.keys())
+    matriz = registro.matriz(por_depto)
+
+    if porcentajes_nacionales is not None:
+        nacionales = registro.matriz({'': porcentajes_nacionales})[0]
+        matriz = np.pad(matriz, ((0, 0), (0, len(nacionales) - matriz.shape[1])))
+    elif votos_validos_por_depto is not None:
+        faltantes = [depto for depto in departamentos if depto not in votos_validos_por_depto]
+        if faltantes:
+            raise ValueError(f"Faltan los votos válidos de los departamentos: {', '.join(faltantes)}.")
+        pesos = np.array([votos_validos_por_depto[depto] for depto in departamentos], dtype=float)
+        if pesos.sum() <= 0:
+            raise ValueError("Los votos válidos por departamento deben sumar más de cero.")
+        nacionales = np.average(matriz, axis=0, weights=pesos)
+    else:
+        raise ValueError("Se requieren los porcentajes nacionales o los votos válidos por departamento.")
+
+    factores = np.divide(matriz, nacionales, out=np.ones_like(matriz), where=nacionales > 0)
+    return VariacionRegional(departamentos=departamentos, partidos=list(registro.nombres), factores=factores)
@@ -7,9 +7,10 @@ from typing import Dict, Callable, Optional
 import tkinter as tk
 
 from utils.chart_utils import crear_grafico_historicos, crear_grafico_encuestas
-from utils.file_utils import cargar_encuestas_desde_archivo, cargar_historicos_desde_archivo
+from utils.file_utils import cargar_tabla_encuestas, cargar_tabla_historicos
+from utils.segunda_vuelta_utils import TransferenciaVotos, cargar_transferencia_votos
 from utils.logo_utils import logo_manager
-from config.settings import EXCEL_CSV_FILE_TYPES
+from config.settings import EXCEL_CSV_FILE_TYPES, CSV_FILE_TYPES
 from config.bolivian_theme import (
     BOLIVIA_RED, BOLIVIA_GREEN, BOLIVIA_YELLOW, BOLIVIA_BG_WARM,
     BOLIVIA_TEXT_DARK, BOLIVIA_DARK_GREEN, BOLIVIA_GOLD,
@@ -27,6 +28,8 @@ class DatosView:
         self.parent = parent
         self.datos_historicos = datos_historicos
         self.encuestas_2025 = encuestas_2025
+        self.metadatos_encuestas = {}
+        self.transferencia_votos: Optional[TransferenciaVotos] = None
         self.on_datos_actualizados = on_datos_actualizados
         
         # Widgets de la interfaz
@@ -121,6 +124,17 @@ class DatosView:
             hover_color=BOLIVIA_DARK_GREEN
         )
         cargar_historicos_btn.pack(side='left', padx=18)
+        cargar_transferencia_btn = ctk.CTkButton(
+            btn_frame, 
+            text="Cargar Transferencia de Votos (CSV)",
+            command=self.cargar_transferencia,
+            font=ctk.CTkFont(size=13, weight="bold"),
+            width=220,
+            height=38,
+            fg_color=BOLIVIA_GREEN,
+            hover_color=BOLIVIA_DARK_GREEN
+        )
+        cargar_transferencia_btn.pack(side='left', padx=18)
         self.actualizar_tablas_datos()
     
     def actualizar_tablas_datos(self):
@@ -263,8 +277,11 @@ class DatosView:
             return
         
         try:
-            encuestas_cargadas = cargar_encuestas_desde_archivo(file_path)
-            self.encuestas_2025 = encuestas_cargadas
+            tabla = cargar_tabla_encuestas(file_path)
+            if not tabla.reporte.es_valido:
+                messagebox.showwarning("Advertencia de Formato", tabla.reporte.resumen("encuestas"))
+            self.encuestas_2025 = tabla.como_dict()
+            self.metadatos_encuestas = tabla.metadatos or {}
             messagebox.showinfo("Éxito", f"Encuestas cargadas correctamente desde '{file_path}'.")
             self.actualizar_tablas_datos()
             if self.on_datos_actualizados:
@@ -282,8 +299,10 @@ class DatosView:
             return
         
         try:
-            historicos_cargados = cargar_historicos_desde_archivo(file_path)
-            self.datos_historicos = historicos_cargados
+            tabla = cargar_tabla_historicos(file_path)
+            if not tabla.reporte.es_valido:
+                messagebox.showwarning("Advertencia de Formato", tabla.reporte.resumen("años"))
+            self.datos_historicos = tabla.como_dict()
             messagebox.showinfo("Éxito", f"Datos históricos cargados correctamente desde '{file_path}'.")
             self.actualizar_tablas_datos()
             if self.on_datos_actualizados:
@@ -291,6 +310,23 @@ class DatosView:
         except Exception as e:
             messagebox.showerror("Error de Carga", str(e))
     
+    def cargar_transferencia(self):
+        """Permite al usuario cargar la matriz de transferencia de votos a la segunda vuelta."""
+        file_path = filedialog.askopenfilename(
+            title="Seleccionar archivo de transferencia de votos",
+            filetypes=CSV_FILE_TYPES
+        )
+        if not file_path:
+            return
+        
+        try:
+            self.transferencia_votos = cargar_transferencia_votos(file_path)
+            messagebox.showinfo("Éxito", f"Transferencia de votos cargada correctamente desde '{file_path}'.")
+            if self.on_datos_actualizados:
+                self.on_datos_actualizados()
+        except Exception as e:
+            messagebox.showerror("Error de Carga", str(e))
+    
     def actualizar_datos(self, datos_historicos: Dict, encuestas_2025: Dict):
         """Actualiza los datos mostrados en la vista."""
         self.datos_historicos = datos_historicos
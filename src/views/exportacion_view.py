@@ -31,6 +31,7 @@ class ExportacionView:
         self.diputados_uninominales: Dict = {}
         self.diputados_uninominales_por_depto: Dict = {}
         self.detalle_escanos: Dict = {}
+        self.resultado_escanos = None
         
         self.frame = None
         self.crear_vista()
@@ -120,7 +121,8 @@ class ExportacionView:
                 'diputados_plurinominales': self.diputados_plurinominales,
                 'diputados_uninominales': self.diputados_uninominales,
                 'diputados_uninominales_por_depto': self.diputados_uninominales_por_depto,
-                'detalle_escanos': self.detalle_escanos
+                'detalle_escanos': self.detalle_escanos,
+                'resultado_escanos': self.resultado_escanos
             }
             
             exportar_a_excel(file_path, datos_completos)
@@ -151,7 +153,8 @@ class ExportacionView:
                 'diputados_plurinominales': self.diputados_plurinominales,
                 'diputados_uninominales': self.diputados_uninominales,
                 'diputados_uninominales_por_depto': self.diputados_uninominales_por_depto,
-                'detalle_escanos': self.detalle_escanos
+                'detalle_escanos': self.detalle_escanos,
+                'resultado_escanos': self.resultado_escanos
             }
             
             generar_informe_pdf(file_path, datos_completos)
@@ -163,7 +166,8 @@ class ExportacionView:
                         diputados_plurinominales: Optional[Dict] = None, 
                         diputados_uninominales: Optional[Dict] = None,
                         diputados_uninominales_por_depto: Optional[Dict] = None, 
-                        detalle_escanos: Optional[Dict] = None):
+                        detalle_escanos: Optional[Dict] = None,
+                        resultado_escanos=None):
         """Actualiza los datos para exportación incluyendo información detallada de escaños."""
         self.prediccion_votos = prediccion_votos
         self.senadores = senadores
@@ -172,6 +176,7 @@ class ExportacionView:
         self.diputados_uninominales = diputados_uninominales or {}
         self.diputados_uninominales_por_depto = diputados_uninominales_por_depto or {}
         self.detalle_escanos = detalle_escanos or {}
+        self.resultado_escanos = resultado_escanos
     
     def obtener_frame(self):
         """Retorna el frame de la vista."""
@@ -3,11 +3,14 @@ Vista para la configuración del modelo predictivo
 """
 import customtkinter as ctk
 from tkinter import messagebox
-from typing import Callable
+from typing import Callable, Optional
 
 from config.settings import (PESO_HISTORICO_DEFAULT, PESO_ENCUESTAS_DEFAULT, 
                               MARGEN_ERROR_PREDICCION_DEFAULT, TENDENCIA_AJUSTE_DEFAULT, 
-                              UMBRAL_MINIMO_DEFAULT)
+                              UMBRAL_MINIMO_DEFAULT, COMPONENTE_HISTORICO_DEFAULT,
+                              OPCIONES_COMPONENTE_HISTORICO, MODELO_RUIDO_DEFAULT,
+                              OPCIONES_MODELO_RUIDO, METODO_REPARTO_DEFAULT,
+                              OPCIONES_METODO_REPARTO)
 from utils.logo_utils import logo_manager
 from config.bolivian_theme import (
     BOLIVIA_RED, BOLIVIA_GREEN, BOLIVIA_YELLOW, BOLIVIA_BG_WARM,
@@ -31,6 +34,11 @@ class ModeloView:
         self.margen_error_var = ctk.DoubleVar(value=MARGEN_ERROR_PREDICCION_DEFAULT * 100)
         self.tendencia_var = ctk.StringVar(value=TENDENCIA_AJUSTE_DEFAULT)
         self.umbral_minimo_var = ctk.DoubleVar(value=UMBRAL_MINIMO_DEFAULT * 100)
+        self.componente_historico_var = ctk.StringVar(value=COMPONENTE_HISTORICO_DEFAULT)
+        self.modelo_ruido_var = ctk.StringVar(value=MODELO_RUIDO_DEFAULT)
+        self.metodo_reparto_var = ctk.StringVar(value=METODO_REPARTO_DEFAULT)
+        # Vacía: margen de error aleatorio en cada ejecución (sin caché)
+        self.semilla_var = ctk.StringVar(value="")
         
         # Widgets
         self.frame = None
@@ -41,6 +49,12 @@ class ModeloView:
         self.margen_error_entry = None
         self.tendencia_combobox = None
         self.umbral_minimo_entry = None
+        self.componente_historico_combobox = None
+        self.modelo_ruido_combobox = None
+        self.metodo_reparto_combobox = None
+        self.semilla_entry = None
+        self.progreso_bar = None
+        self.progreso_label = None
         
         self.crear_vista()
     
@@ -127,6 +141,26 @@ class ModeloView:
         ctk.CTkLabel(frame_ajuste, text="Umbral mínimo de votos para escaños (%):", font=ctk.CTkFont(size=12), text_color=(BOLIVIA_TEXT_DARK, BOLIVIA_TEXT_DARK)).grid(row=3, column=0, sticky="w", padx=10, pady=6)
         self.umbral_minimo_entry = ctk.CTkEntry(frame_ajuste, textvariable=self.umbral_minimo_var, width=100, font=ctk.CTkFont(size=12), fg_color="white", text_color=BOLIVIA_TEXT_DARK)
         self.umbral_minimo_entry.grid(row=3, column=1, sticky="w", padx=10, pady=6)
+
+        # Componente histórico (serie completa de elecciones)
+        ctk.CTkLabel(frame_ajuste, text="Componente histórico:", font=ctk.CTkFont(size=12), text_color=(BOLIVIA_TEXT_DARK, BOLIVIA_TEXT_DARK)).grid(row=4, column=0, sticky="w", padx=10, pady=6)
+        self.componente_historico_combobox = ctk.CTkOptionMenu(frame_ajuste, values=OPCIONES_COMPONENTE_HISTORICO, variable=self.componente_historico_var, font=ctk.CTkFont(size=12), fg_color=BOLIVIA_GREEN, button_color=BOLIVIA_DARK_GREEN)
+        self.componente_historico_combobox.grid(row=4, column=1, sticky="w", padx=10, pady=6)
+
+        # Modelo de ruido del margen de error
+        ctk.CTkLabel(frame_ajuste, text="Distribución del margen de error:", font=ctk.CTkFont(size=12), text_color=(BOLIVIA_TEXT_DARK, BOLIVIA_TEXT_DARK)).grid(row=5, column=0, sticky="w", padx=10, pady=6)
+        self.modelo_ruido_combobox = ctk.CTkOptionMenu(frame_ajuste, values=OPCIONES_MODELO_RUIDO, variable=self.modelo_ruido_var, font=ctk.CTkFont(size=12), fg_color=BOLIVIA_GREEN, button_color=BOLIVIA_DARK_GREEN)
+        self.modelo_ruido_combobox.grid(row=5, column=1, sticky="w", padx=10, pady=6)
+
+        # Método de reparto proporcional de escaños
+        ctk.CTkLabel(frame_ajuste, text="Método de reparto:", font=ctk.CTkFont(size=12), text_color=(BOLIVIA_TEXT_DARK, BOLIVIA_TEXT_DARK)).grid(row=6, column=0, sticky="w", padx=10, pady=6)
+        self.metodo_reparto_combobox = ctk.CTkOptionMenu(frame_ajuste, values=OPCIONES_METODO_REPARTO, variable=self.metodo_reparto_var, font=ctk.CTkFont(size=12), fg_color=BOLIVIA_GREEN, button_color=BOLIVIA_DARK_GREEN)
+        self.metodo_reparto_combobox.grid(row=6, column=1, sticky="w", padx=10, pady=6)
+
+        # Semilla del margen de error (vacía: aleatoria)
+        ctk.CTkLabel(frame_ajuste, text="Semilla (vacía: aleatoria):", font=ctk.CTkFont(size=12), text_color=(BOLIVIA_TEXT_DARK, BOLIVIA_TEXT_DARK)).grid(row=7, column=0, sticky="w", padx=10, pady=6)
+        self.semilla_entry = ctk.CTkEntry(frame_ajuste, textvariable=self.semilla_var, width=100, font=ctk.CTkFont(size=12), fg_color="white", text_color=BOLIVIA_TEXT_DARK)
+        self.semilla_entry.grid(row=7, column=1, sticky="w", padx=10, pady=6)
         frame_ajuste.grid_columnconfigure(1, weight=1)
 
         # Botón para ejecutar predicción
@@ -140,7 +174,14 @@ class ModeloView:
             fg_color=BOLIVIA_RED,
             hover_color=BOLIVIA_DARK_GREEN
         )
-        ejecutar_btn.pack(pady=36)
+        ejecutar_btn.pack(pady=(36, 8))
+        
+        # Progreso de la predicción en segundo plano
+        self.progreso_bar = ctk.CTkProgressBar(contenedor, width=340, progress_color=BOLIVIA_GREEN)
+        self.progreso_bar.set(0)
+        self.progreso_bar.pack(pady=(0, 4))
+        self.progreso_label = ctk.CTkLabel(contenedor, text="", font=ctk.CTkFont(size=12), text_color=BOLIVIA_TEXT_DARK)
+        self.progreso_label.pack(pady=(0, 12))
     
     def _update_pesos(self, value):
         """Ajusta automáticamente el peso de la otra escala para que la suma sea 100%."""
@@ -153,19 +194,48 @@ class ModeloView:
         if self.on_ejecutar_prediccion:
             self.on_ejecutar_prediccion()
     
+    def mostrar_progreso(self, fraccion: float, mensaje: str):
+        """Muestra el progreso de la predicción en curso."""
+        self.progreso_bar.set(fraccion)
+        self.progreso_label.configure(text=mensaje)
+    
+    def obtener_semilla(self) -> Optional[int]:
+        """
+        Obtiene la semilla escrita en la vista.
+        
+        Returns:
+            Optional[int]: Semilla, o None si el campo está vacío (resultado aleatorio)
+            
+        Raises:
+            ValueError: Si el texto no es un entero no negativo
+        """
+        texto = self.semilla_var.get().strip()
+        if not texto:
+            return None
+        if not texto.isdigit():
+            raise ValueError("La semilla debe ser un número entero no negativo o quedar vacía.")
+        return int(texto)
+    
     def obtener_parametros(self):
         """
         Obtiene los parámetros configurados en la vista.
         
         Returns:
             dict: Diccionario con los parámetros del modelo
+            
+        Raises:
+            ValueError: Si la semilla no es válida (ver obtener_semilla)
         """
         return {
             'peso_historico': self.peso_hist_var.get() / 100,
             'peso_encuestas': self.peso_enc_var.get() / 100,
             'margen_error': self.margen_error_var.get() / 100,
             'tendencia': self.tendencia_var.get(),
-            'umbral_minimo': self.umbral_minimo_var.get() / 100
+            'umbral_minimo': self.umbral_minimo_var.get() / 100,
+            'componente_historico': self.componente_historico_var.get(),
+            'modelo_ruido': self.modelo_ruido_var.get(),
+            'metodo_reparto': self.metodo_reparto_var.get(),
+            'semilla': self.obtener_semilla()
         }
     
     def obtener_frame(self):